@@ -16,15 +16,47 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
     
-    # Initialize database
+    # Initialize database with the selected connection pool profile
+    from app.pool import engine_options
+    from app.sqlite_wal import READER_BIND, wal_enabled, reader_bind, install_pragmas
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**engine_options(app.config),
+                                               **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+    # The sqlite profile adds a query-only reader engine next to the writer
+    sqlite_wal = wal_enabled(app.config)
+    if sqlite_wal:
+        app.config['SQLALCHEMY_BINDS'] = {READER_BIND: reader_bind(app.config),
+                                          **app.config.get('SQLALCHEMY_BINDS', {})}
     db.init_app(app)
     
+    # Schema changes are applied by `flask --app app db upgrade`; boot only checks the version
     with app.app_context():
-        db.create_all()
+        if sqlite_wal:
+            install_pragmas(app, db)
+        from app.migrations import check_schema
+        check_schema(app)
     
-    # Register blueprints
-    from app.routes import main_bp, auth_bp, applicant_bp, admin_bp, media_bp, roster_bp
-    from app.api import api_bp
+    # Registers the commit hook that stamps subunit/user changes for other workers
+    from app import refdata
+    
+    # Registers the delete hooks that leave tombstones for the change feed
+    from app import changes
+    
+    # Before the response cache, so cached responses skip the budget check with the view
+    from app.query_budget import init_query_budgets
+    init_query_budgets(app, db)
+    
+    from app.cache import init_response_cache
+    init_response_cache(app)
+    
+    from app.profiling import init_profiling
+    init_profiling(app, db)
+    
+    if app.config.get('METRICS_ENABLED'):
+        from app.metrics import init_metrics
+        init_metrics(app, db)
+    
+    # Register blueprints (their view modules load on first use)
+    from app.routes import main_bp, auth_bp, applicant_bp, admin_bp, media_bp, roster_bp, api_bp, api_v2_bp
     
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
@@ -33,5 +65,9 @@ def create_app(config_name=None):
     app.register_blueprint(media_bp)
     app.register_blueprint(roster_bp)
     app.register_blueprint(api_bp)
+    app.register_blueprint(api_v2_bp)
+    
+    from app.cli import register_commands
+    register_commands(app)
     
     return app
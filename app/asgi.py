@@ -0,0 +1,238 @@
+"""
+ASGI adapter for the Flask app: request bodies are received and files are sent on the event loop,
+so a slow client holds a coroutine instead of a worker. Views still run unchanged in a thread pool.
+"""
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from werkzeug.wsgi import FileWrapper
+
+
+class FileStream(FileWrapper):
+    """wsgi.file_wrapper: marks a send_file() body so the adapter streams it from the event loop"""
+
+
+class _Response:
+    """Status line and headers captured from start_response, plus anything passed to write()"""
+
+    def __init__(self):
+        self.status = None
+        self.headers = None
+        self.written = []
+        self.started = False
+
+    def start_response(self, status, headers, exc_info=None):
+        if exc_info and self.status is not None:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = int(status.split(' ', 1)[0])
+        self.headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+        return self.written.append
+
+    def start_message(self):
+        self.started = True
+        return {'type': 'http.response.start', 'status': self.status, 'headers': self.headers}
+
+
+def _body(chunk=b'', more=False):
+    return {'type': 'http.response.body', 'body': chunk, 'more_body': more}
+
+
+async def _plain_response(send, status, text):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'text/plain; charset=utf-8'),
+                            (b'content-length', str(len(text)).encode())]})
+    await send(_body(text.encode()))
+
+
+class AsgiAdapter:
+    """Serve a Flask (WSGI) app over ASGI.
+
+    The request body is read on the event loop into a spooled temporary file
+    before the view runs, and send_file() bodies are read in blocks off the
+    loop and written to the client as it accepts them. Other responses are
+    collected in the view thread and sent from the loop, unless they are
+    larger than ASGI_RESPONSE_BUFFER (e.g. streamed CSV exports), which the
+    thread then sends itself.
+    """
+
+    def __init__(self, flask_app):
+        config = flask_app.config
+        self.wsgi_app = flask_app
+        self.max_body = config.get('MAX_CONTENT_LENGTH')
+        self.spool_size = config.get('ASGI_SPOOL_SIZE', 1024 * 1024)
+        self.chunk_size = config.get('ASGI_CHUNK_SIZE', 256 * 1024)
+        self.buffer_size = config.get('ASGI_RESPONSE_BUFFER', 1024 * 1024)
+        self.executor = ThreadPoolExecutor(max_workers=config.get('ASGI_THREADS', 8),
+                                           thread_name_prefix='asgi-view')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f'unsupported ASGI scope type {scope["type"]!r}')
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        declared = dict(scope['headers']).get(b'content-length')
+        if self.max_body and declared and declared.isdigit() and int(declared) > self.max_body:
+            await _plain_response(send, 413, 'Request body too large')
+            return
+
+        with SpooledTemporaryFile(max_size=self.spool_size) as body:
+            received = await self._receive_body(receive, body)
+            if received is None:
+                return
+            if self.max_body and received > self.max_body:
+                await _plain_response(send, 413, 'Request body too large')
+                return
+            body.seek(0)
+
+            disconnected = asyncio.Event()
+            watcher = asyncio.ensure_future(self._watch_disconnect(receive, disconnected))
+            try:
+                await self._respond(scope, body, received, send, disconnected)
+            finally:
+                watcher.cancel()
+
+    async def _receive_body(self, receive, body):
+        """Spool the request body; returns its size, or None if the client went away"""
+        loop = asyncio.get_running_loop()
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if self.max_body and size > self.max_body:
+                return size
+            if chunk:
+                if size > self.spool_size:
+                    # Past the in-memory limit the spool is a real file
+                    await loop.run_in_executor(None, body.write, chunk)
+                else:
+                    body.write(chunk)
+            if not message.get('more_body'):
+                return size
+
+    async def _watch_disconnect(self, receive, disconnected):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                return
+
+    async def _respond(self, scope, body, size, send, disconnected):
+        loop = asyncio.get_running_loop()
+        response = _Response()
+        environ = self._environ(scope, body, size)
+        try:
+            result = await loop.run_in_executor(self.executor, self._run_view, environ, response, send, loop)
+        except Exception:
+            if response.started:
+                raise
+            await _plain_response(send, 500, 'Internal Server Error')
+            return
+
+        if isinstance(result, FileStream):
+            await send(response.start_message())
+            await self._send_file(result, send, disconnected)
+        elif result is not None:
+            await send(response.start_message())
+            for chunk in result:
+                await send(_body(chunk, more=True))
+            await send(_body())
+
+    def _run_view(self, environ, response, send, loop):
+        """In a pool thread: run the app and return its body chunks, or the FileStream to send"""
+        iterable = self.wsgi_app(environ, response.start_response)
+        if isinstance(iterable, FileStream):
+            return iterable
+
+        chunks, size = list(response.written), 0
+        streaming = False
+        try:
+            for chunk in iterable:
+                if streaming:
+                    self._send_from_thread(loop, send, _body(chunk, more=True))
+                    continue
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > self.buffer_size:
+                    # Too big to hold: send from this thread as the app produces it
+                    streaming = True
+                    self._send_from_thread(loop, send, response.start_message())
+                    for pending in chunks:
+                        self._send_from_thread(loop, send, _body(pending, more=True))
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+
+        if streaming:
+            self._send_from_thread(loop, send, _body())
+            return None
+        return chunks
+
+    def _send_from_thread(self, loop, send, message):
+        asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+    async def _send_file(self, stream, send, disconnected):
+        loop = asyncio.get_running_loop()
+        try:
+            while not disconnected.is_set():
+                chunk = await loop.run_in_executor(None, stream.file.read, self.chunk_size)
+                if not chunk:
+                    break
+                await send(_body(chunk, more=True))
+        finally:
+            stream.close()
+        await send(_body())
+
+    def _environ(self, scope, body, size):
+        """WSGI environ for an ASGI http scope whose body of size bytes is spooled in body"""
+        root_path = scope.get('root_path', '')
+        path = scope['path']
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        server = scope.get('server') or ('localhost', 80)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+            'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope['query_string'].decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+            'wsgi.file_wrapper': FileStream,
+        }
+        if scope.get('client'):
+            environ['REMOTE_ADDR'] = scope['client'][0]
+        for name, value in scope['headers']:
+            name = name.decode('latin-1').upper().replace('-', '_')
+            if name not in ('CONTENT_LENGTH', 'CONTENT_TYPE'):
+                name = f'HTTP_{name}'
+            value = value.decode('latin-1')
+            environ[name] = f'{environ[name]},{value}' if name in environ else value
+        # The whole body is spooled, so its length is known even for a chunked upload
+        environ['CONTENT_LENGTH'] = str(size)
+        environ.pop('HTTP_TRANSFER_ENCODING', None)
+        return environ
@@ -0,0 +1,176 @@
+"""
+Response cache for public pages and read APIs, with ETags and tag invalidation
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from flask import current_app, has_app_context, request, session, make_response
+from app.events import on_commit
+
+
+CachedResponse = namedtuple('CachedResponse', ['body', 'status', 'content_type', 'etag'])
+
+
+class MemoryBackend:
+    """Per-process LRU of responses"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, tags, entry = item
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, ttl, tags):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, frozenset(tags), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tags):
+        tags = set(tags)
+        with self._lock:
+            for key in [key for key, (_, entry_tags, _) in self._entries.items() if entry_tags & tags]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """Responses in a SQLite file shared by every worker on the host"""
+
+    def __init__(self, path, max_entries=512):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS response_cache ('
+                'key TEXT PRIMARY KEY, tags TEXT NOT NULL, expires REAL NOT NULL, '
+                'status INTEGER NOT NULL, content_type TEXT, etag TEXT NOT NULL, body BLOB NOT NULL)'
+            )
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT body, status, content_type, etag FROM response_cache WHERE key = ? AND expires >= ?',
+            (key, time.time())
+        ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def set(self, key, entry, ttl, tags):
+        connection = self._connect()
+        connection.execute(
+            'INSERT OR REPLACE INTO response_cache (key, tags, expires, status, content_type, etag, body) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (key, ',' + ','.join(sorted(tags)) + ',', time.time() + ttl,
+             entry.status, entry.content_type, entry.etag, entry.body)
+        )
+        connection.execute(
+            'DELETE FROM response_cache WHERE key IN '
+            '(SELECT key FROM response_cache ORDER BY expires DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def invalidate(self, tags):
+        connection = self._connect()
+        for tag in tags:
+            connection.execute('DELETE FROM response_cache WHERE tags LIKE ?', (f'%,{tag},%',))
+
+    def clear(self):
+        self._connect().execute('DELETE FROM response_cache')
+
+
+def init_response_cache(app):
+    """Create the backend selected by RESPONSE_CACHE_BACKEND (memory, sqlite or none)"""
+    backend = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+    max_entries = app.config.get('RESPONSE_CACHE_SIZE', 512)
+
+    if backend == 'sqlite':
+        path = app.config.get('RESPONSE_CACHE_PATH') or os.path.join(app.instance_path, 'response_cache.db')
+        app.extensions['response_cache'] = SQLiteBackend(path, max_entries)
+    elif backend == 'memory':
+        app.extensions['response_cache'] = MemoryBackend(max_entries)
+    else:
+        app.extensions['response_cache'] = None
+
+
+def _backend():
+    return current_app.extensions.get('response_cache')
+
+
+def _is_anonymous():
+    return not (session.get('user_id') or session.get('applicant_id') or session.get('_flashes'))
+
+
+def _cache_key():
+    args = '&'.join(f'{name}={value}' for name, value in sorted(request.args.items(multi=True)))
+    return f'{request.endpoint}?{args}'
+
+
+def cached_response(*tags, ttl=None, max_age=0, anonymous_only=True):
+    """Cache a GET view's 200 responses until ttl expires or a commit writes to one of tags.
+
+    Responses carry an ETag so clients revalidate with a 304. Pages whose layout
+    depends on who is signed in are only cached for anonymous visitors.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            backend = _backend()
+            if backend is None or request.method != 'GET' or (anonymous_only and not _is_anonymous()):
+                return view(*args, **kwargs)
+
+            key = _cache_key()
+            entry = backend.get(key)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                body = response.get_data()
+                entry = CachedResponse(body, response.status_code, response.content_type,
+                                       hashlib.sha1(body).hexdigest())
+                backend.set(key, entry, ttl or current_app.config.get('RESPONSE_CACHE_TTL', 60), tags)
+
+            response = current_app.response_class(entry.body, status=entry.status, content_type=entry.content_type)
+            response.set_etag(entry.etag)
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+@on_commit('announcements', 'subunits', 'applicants', 'duty_rosters')
+def invalidate_responses(changed_tables):
+    """Drop cached responses tagged with any table the commit wrote to"""
+    if has_app_context():
+        backend = _backend()
+        if backend is not None:
+            backend.invalidate(changed_tables)
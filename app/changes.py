@@ -0,0 +1,179 @@
+"""
+Change feed over the tables that carry updated_at, with tombstones for deleted rows
+"""
+import base64
+import binascii
+import heapq
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import event, select, insert, update, delete, tuple_, func
+from sqlalchemy.orm import Session
+from app.models import db, Applicant, TrialPhase, ApplicantAccount, RosterTemplate, DutyRoster, Tombstone
+
+# Tables in the feed; rows changed in the same instant are listed in this order
+FEED_MODELS = [Applicant, TrialPhase, ApplicantAccount, RosterTemplate, DutyRoster]
+FEED_TABLES = {model.__tablename__: model for model in FEED_MODELS}
+TABLE_ORDER = {name: position for position, name in enumerate([*FEED_TABLES, 'tombstones'])}
+
+# Never sent to clients
+PRIVATE_COLUMNS = {'password'}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Position in the feed: the change time, then table and id to order changes made in the same instant
+Position = namedtuple('Position', ['at', 'table', 'id'])
+ChangePage = namedtuple('ChangePage', ['changes', 'next_cursor', 'has_more'])
+
+
+class CursorExpired(Exception):
+    """The cursor was issued before the oldest tombstones kept, so deletes since then may be missing"""
+
+
+def install_change_feed(connection):
+    """Create the tombstone table and updated_at indexes, and date rows that have no updated_at"""
+    Tombstone.__table__.create(connection, checkfirst=True)
+    for model in FEED_MODELS:
+        for index in model.__table__.indexes:
+            index.create(connection, checkfirst=True)
+        connection.execute(
+            update(model).where(model.updated_at == None)
+            .values(updated_at=func.coalesce(model.created_at, datetime.utcnow()))
+        )
+
+
+def _tombstone_rows(table_name, ids):
+    now = datetime.utcnow()
+    return [{'table_name': table_name, 'row_id': row_id, 'deleted_at': now} for row_id in ids]
+
+
+def _record_delete(mapper, connection, target):
+    connection.execute(insert(Tombstone), _tombstone_rows(mapper.local_table.name, [target.id]))
+
+
+for _model in FEED_MODELS:
+    event.listen(_model, 'after_delete', _record_delete)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _record_bulk_delete(orm_execute_state):
+    """delete() statements skip after_delete, so look up the rows they will remove first"""
+    if not orm_execute_state.is_delete:
+        return
+    table = orm_execute_state.statement.table
+    if getattr(table, 'name', None) not in FEED_TABLES:
+        return
+
+    # The statement's own bind, so the lookup runs in the writing transaction
+    connection = orm_execute_state.session.connection(bind_arguments={'clause': orm_execute_state.statement})
+    lookup = select(table.c.id)
+    if orm_execute_state.statement.whereclause is not None:
+        lookup = lookup.where(orm_execute_state.statement.whereclause)
+    ids = connection.execute(lookup).scalars().all()
+    if ids:
+        connection.execute(insert(Tombstone), _tombstone_rows(table.name, ids))
+
+
+def encode_cursor(position, issued):
+    """Opaque cursor pointing after position, stamped with the time it was handed out"""
+    raw = f'{position.at.isoformat()}|{position.table}|{position.id}|{issued.isoformat()}'
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor):
+    """(position, issued) of a cursor"""
+    try:
+        at, table, row_id, issued = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().split('|')
+        position = Position(datetime.fromisoformat(at), table, int(row_id))
+        issued = datetime.fromisoformat(issued)
+    except (ValueError, binascii.Error):
+        raise ValueError('invalid cursor')
+    if table not in TABLE_ORDER:
+        raise ValueError('invalid cursor')
+    return position, issued
+
+
+def _after(position, table, timestamp, row_id):
+    """Rows of table that come after position in feed order, as an index range on (timestamp, id)"""
+    order, cursor_order = TABLE_ORDER[table], TABLE_ORDER[position.table]
+    if order < cursor_order:
+        return timestamp > position.at
+    if order > cursor_order:
+        return timestamp >= position.at
+    return tuple_(timestamp, row_id) > tuple_(position.at, position.id)
+
+
+def _table_changes(model, position, horizon, limit):
+    columns = [column for column in model.__table__.columns if column.name not in PRIVATE_COLUMNS]
+    rows = db.session.execute(
+        select(*columns)
+        .where(model.updated_at <= horizon,
+               *([_after(position, model.__tablename__, model.updated_at, model.id)] if position else []))
+        .order_by(model.updated_at, model.id)
+        .limit(limit)
+    ).all()
+
+    for row in rows:
+        data = dict(row._mapping)
+        # Only a row created after the cursor is certainly new to the client. An older row may never have
+        # reached it (created_at and updated_at are stamped separately, and rows change between pages),
+        # so without a version history those are upserts
+        created = data.get('created_at')
+        op = 'insert' if position is None or (created is not None and created > position.at) else 'upsert'
+        key = Position(row.updated_at, model.__tablename__, row.id)
+        yield (key.at, TABLE_ORDER[key.table], key.id), key, {
+            'op': op, 'type': model.__tablename__, 'id': row.id, 'at': row.updated_at, 'data': data,
+        }
+
+
+def _deletes(position, horizon, limit):
+    rows = db.session.execute(
+        select(Tombstone.id, Tombstone.table_name, Tombstone.row_id, Tombstone.deleted_at)
+        .where(Tombstone.deleted_at <= horizon,
+               *([_after(position, 'tombstones', Tombstone.deleted_at, Tombstone.id)] if position else []))
+        .order_by(Tombstone.deleted_at, Tombstone.id)
+        .limit(limit)
+    ).all()
+
+    for row in rows:
+        key = Position(row.deleted_at, 'tombstones', row.id)
+        yield (key.at, TABLE_ORDER[key.table], key.id), key, {
+            'op': 'delete', 'type': row.table_name, 'id': row.row_id, 'at': row.deleted_at,
+        }
+
+
+def read_changes(cursor=None, limit=DEFAULT_PAGE_SIZE, settle_seconds=5, retention_days=90):
+    """Changes after cursor in commit order, oldest first; raises ValueError or CursorExpired.
+
+    Each table is read as one range scan of its (updated_at, id) index, so a page
+    costs the same whatever the table sizes. Changes from the last settle_seconds
+    are held back so that transactions still committing with an earlier
+    updated_at are not skipped. A client that polls at least every
+    retention_days sees every delete before its tombstone is pruned.
+    """
+    position, issued = decode_cursor(cursor) if cursor else (None, None)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    now = datetime.utcnow()
+    if issued is not None and issued < now - timedelta(days=retention_days):
+        raise CursorExpired(f'cursor is more than {retention_days} days old and deletes since then may have '
+                            'been pruned; sync again from the start')
+
+    horizon = now - timedelta(seconds=settle_seconds)
+    sources = [_table_changes(model, position, horizon, limit + 1) for model in FEED_MODELS]
+    sources.append(_deletes(position, horizon, limit + 1))
+    merged = list(heapq.merge(*(list(source) for source in sources), key=lambda item: item[0]))
+
+    page = merged[:limit]
+    if page:
+        position = page[-1][1]
+    # Re-stamped on every call, so a client polling a quiet feed keeps a live cursor
+    next_cursor = encode_cursor(position, now) if position else None
+    return ChangePage([change for _, _, change in page], next_cursor, len(merged) > limit)
+
+
+def prune_tombstones(days):
+    """Delete tombstones older than days; returns how many were removed"""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    result = db.session.execute(delete(Tombstone).where(Tombstone.deleted_at < cutoff))
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,141 @@
+"""
+Flask CLI commands (run with `flask --app app <command>`)
+"""
+import json
+import click
+
+
+@click.command('import-applicants')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+              help='Input format (default: from the file extension).')
+@click.option('--batch-size', default=500, show_default=True, help='Rows per transaction.')
+@click.option('--checkpoint', 'checkpoint_path', default=None,
+              help='Progress file used to resume (default: PATH.checkpoint).')
+@click.option('--restart', is_flag=True, help='Ignore any checkpoint and start from the first row.')
+@click.option('--rejects', 'rejects_path', default=None, help='Write invalid rows to this JSONL file.')
+def import_applicants_command(path, fmt, batch_size, checkpoint_path, restart, rejects_path):
+    """Stream applicants (with skills and trial phases) from a CSV or JSONL file."""
+    from app.importer import import_applicants
+
+    rejects = open(rejects_path, 'a', encoding='utf-8') if rejects_path else None
+
+    def on_reject(line_number, record, reason):
+        if rejects:
+            rejects.write(json.dumps({'line': line_number, 'error': reason, 'record': record}, default=str) + '\n')
+        else:
+            click.echo(f'line {line_number}: {reason}', err=True)
+
+    def on_progress(stats):
+        click.echo(f'{stats.read} rows read, {stats.inserted} inserted ({stats.rows_per_second:.0f} rows/s)')
+
+    try:
+        stats = import_applicants(path, fmt=fmt, batch_size=batch_size, checkpoint_path=checkpoint_path,
+                                  resume=not restart, on_reject=on_reject, on_progress=on_progress)
+    finally:
+        if rejects:
+            rejects.close()
+
+    if stats.skipped:
+        click.echo(f'Resumed after {stats.skipped} already imported rows')
+    click.echo(f'Done: {stats.inserted} inserted, {stats.duplicates} duplicates, {stats.invalid} invalid '
+               f'in {stats.read} rows ({stats.rows_per_second:.0f} rows/s)')
+
+
+@click.command('generate-data')
+@click.option('--applicants', default=1000, show_default=True,
+              help='Applicants (each with an account and trial phases).')
+@click.option('--skill-assessments', default=5000, show_default=True,
+              help='Skill ratings spread across the new applicants.')
+@click.option('--media', default=500, show_default=True, help='Media library rows.')
+@click.option('--rosters', default=2000, show_default=True, help='Duty roster rows.')
+@click.option('--announcements', default=50, show_default=True, help='Announcements.')
+@click.option('--events', default=50, show_default=True, help='Events.')
+@click.option('--seed', default=42, show_default=True,
+              help='Random seed; the same seed on the same database repeats a run.')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows per insert transaction.')
+@click.option('--as-of', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Date the history is generated back from (default: today).')
+@click.option('--history-days', default=730, show_default=True, help='Days of application and upload history.')
+@click.option('--password', default='member123', show_default=True, help='Password for every generated account.')
+@click.option('--file-pool', default=50, show_default=True, help='Dummy files per media type shared by the media rows.')
+@click.option('--file-size', default=64, show_default=True, help='Typical dummy file size in KiB.')
+def generate_data_command(applicants, skill_assessments, media, rosters, announcements, events, seed, batch_size,
+                          as_of, history_days, password, file_pool, file_size):
+    """Append a seeded synthetic dataset for capacity testing (existing rows are kept)."""
+    from app.synthetic import generate_dataset
+
+    def on_progress(stats):
+        counts = ', '.join(f'{count} {table}' for table, count in stats.rows.items())
+        click.echo(f'{counts} ({stats.rows_per_second:.0f} rows/s)')
+
+    stats = generate_dataset(applicants=applicants, skill_assessments=skill_assessments, media=media,
+                             rosters=rosters, announcements=announcements, events=events, seed=seed,
+                             batch_size=batch_size, as_of=as_of.date() if as_of else None,
+                             history_days=history_days, password=password, file_pool=max(file_pool, 1),
+                             file_size=file_size * 1024, on_progress=on_progress)
+    click.echo(f'Done: {stats.total} rows in {len(stats.rows)} tables ({stats.rows_per_second:.0f} rows/s)')
+
+
+@click.command('prune-tombstones')
+@click.option('--days', type=int, default=None,
+              help='Keep tombstones this many days (default: TOMBSTONE_RETENTION_DAYS).')
+def prune_tombstones_command(days):
+    """Delete change feed tombstones older than the retention period."""
+    from flask import current_app
+    from app.changes import prune_tombstones
+
+    days = days if days is not None else current_app.config.get('TOMBSTONE_RETENTION_DAYS', 90)
+    click.echo(f'Removed {prune_tombstones(days)} tombstones older than {days} days')
+
+
+@click.command('retry-uploads')
+@click.option('--discard', is_flag=True, help='Delete the staged files instead of finalizing them.')
+def retry_uploads_command(discard):
+    """Finalize application uploads whose background finalization failed."""
+    from app.submissions import retry_failed_uploads
+
+    done, failed = retry_failed_uploads(discard=discard)
+    click.echo(f'{"Discarded" if discard else "Finalized"} {done} submission(s), {failed} failed')
+
+
+@click.group('db')
+def db_command():
+    """Schema version and migrations."""
+
+
+@db_command.command('upgrade')
+@click.option('--to', 'target', type=int, default=None, help='Stop at this version (default: latest).')
+def db_upgrade_command(target):
+    """Apply pending schema migrations."""
+    from app.models import db
+    from app.migrations import upgrade_schema
+    
+    def on_apply(number, description):
+        click.echo(f'Applied {number}: {description}')
+    
+    version = upgrade_schema(db.engine, target=target, on_apply=on_apply)
+    click.echo(f'Schema at version {version}')
+
+
+@db_command.command('status')
+def db_status_command():
+    """Show the applied schema version and pending migrations."""
+    from app.models import db
+    from app.migrations import current_version, pending_migrations, LATEST_VERSION
+    
+    with db.engine.connect() as connection:
+        version = current_version(connection)
+    
+    click.echo(f'Schema at version {version} (latest {LATEST_VERSION})')
+    for number, description, _ in pending_migrations(version):
+        click.echo(f'  pending {number}: {description}')
+
+
+def register_commands(app):
+    """Attach the CLI commands to the application"""
+    app.cli.add_command(import_applicants_command)
+    app.cli.add_command(generate_data_command)
+    app.cli.add_command(prune_tombstones_command)
+    app.cli.add_command(retry_uploads_command)
+    app.cli.add_command(db_command)
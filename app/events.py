@@ -0,0 +1,74 @@
+"""
+Commit-time notifications of which tables a session transaction wrote to
+"""
+import logging
+from collections import defaultdict
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, Session, object_session
+
+logger = logging.getLogger(__name__)
+
+_listeners = defaultdict(list)
+
+
+def on_commit(*tables):
+    """Decorator: call func(changed_tables) after a commit that wrote to any of tables"""
+    def decorator(func):
+        for table in tables:
+            _listeners[table].append(func)
+        return func
+    return decorator
+
+
+def notify_changed(*tables):
+    """Fire listeners for writes made outside the ORM session (e.g. Core bulk loads)"""
+    _dispatch(set(tables))
+
+
+def _dispatch(changed):
+    callbacks = []
+    for table in changed:
+        for callback in _listeners.get(table, ()):
+            if callback not in callbacks:
+                callbacks.append(callback)
+
+    for callback in callbacks:
+        try:
+            callback(changed)
+        except Exception:
+            logger.exception('Commit listener %s failed', callback.__name__)
+
+
+def _mark(session, table_name):
+    if session is not None:
+        session.info.setdefault('changed_tables', set()).add(table_name)
+
+
+def _track_object(mapper, connection, target):
+    _mark(object_session(target), mapper.local_table.name)
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Mapper, _event_name, _track_object)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_statement(orm_execute_state):
+    """Bulk insert/update/delete statements bypass the per-object mapper events"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None and getattr(table, 'name', None):
+            _mark(orm_execute_state.session, table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _fire_listeners(session):
+    changed = session.info.pop('changed_tables', None)
+    if changed:
+        _dispatch(changed)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_changes(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop('changed_tables', None)
@@ -0,0 +1,258 @@
+"""
+Streaming bulk applicant import from CSV or JSONL
+"""
+import csv
+import json
+import os
+import re
+import time
+from datetime import datetime
+from sqlalchemy import insert, select, func
+from app.events import notify_changed
+from app.models import (db, Applicant, SkillAssessment, TrialPhase, ApplicantAccount,
+                        APPLICANT_STATUSES, TRIAL_PHASES, PHASE_STATUSES)
+from app.security import hash_password
+
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+TEXT_FIELDS = ['full_name', 'email', 'phone', 'occupation', 'professional_background',
+               'availability', 'primary_interest', 'assigned_role']
+
+
+class ImportRowError(ValueError):
+    """A record that failed validation"""
+
+
+def iter_records(path, fmt=None):
+    """Stream (line_number, record) pairs from a CSV or JSONL file"""
+    fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, _csv_to_record(record)
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        yield line_number, json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield line_number, ImportRowError(f'invalid JSON: {e.msg}')
+
+
+def _csv_to_record(row):
+    """Fold skill_* and phase_* CSV columns into nested skills/trial_phases"""
+    record = {'skills': {}, 'trial_phases': {}, 'social_media': {}}
+    for key, value in row.items():
+        if key is None or value is None or value == '':
+            continue
+        if key.startswith('skill_'):
+            record['skills'][key.replace('skill_', '')] = value
+        elif key.startswith('phase_'):
+            record['trial_phases'][key.replace('phase_', '')] = value
+        elif key in ('facebook', 'instagram'):
+            record['social_media'][key] = value
+        else:
+            record[key] = value
+    return record
+
+
+def ensure_email_index(connection):
+    """Index lower(email) so the import's duplicate check doesn't scan every applicant"""
+    # An expression index isn't reflected by checkfirst, so it is created here rather than on the model
+    connection.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_applicants_email_lower ON applicants (lower(email))')
+
+
+def validate_record(record):
+    """Normalize a raw record into applicant values, skill ratings and phase statuses"""
+    if isinstance(record, ImportRowError):
+        raise record
+    if not isinstance(record, dict):
+        raise ImportRowError('record must be an object')
+
+    values = {field: str(record.get(field) or '').strip() or None for field in TEXT_FIELDS}
+
+    for field in ('full_name', 'email', 'primary_interest'):
+        if not values[field]:
+            raise ImportRowError(f'missing {field}')
+
+    if not EMAIL_PATTERN.match(values['email']):
+        raise ImportRowError(f"invalid email {values['email']!r}")
+
+    values['status'] = str(record.get('status') or 'pending').strip().lower()
+    if values['status'] not in APPLICANT_STATUSES:
+        raise ImportRowError(f"invalid status {values['status']!r}")
+
+    values['date_of_birth'] = None
+    if record.get('date_of_birth'):
+        try:
+            values['date_of_birth'] = datetime.strptime(str(record['date_of_birth']).strip(), '%Y-%m-%d').date()
+        except ValueError:
+            raise ImportRowError(f"invalid date_of_birth {record['date_of_birth']!r}")
+
+    social_media = record.get('social_media') or {}
+    values['social_media'] = {
+        'facebook': social_media.get('facebook', ''),
+        'instagram': social_media.get('instagram', ''),
+    }
+
+    skills = {}
+    for skill_name, rating in (record.get('skills') or {}).items():
+        try:
+            rating = int(rating)
+        except (TypeError, ValueError):
+            raise ImportRowError(f'invalid rating for skill {skill_name!r}')
+        if not 1 <= rating <= 5:
+            raise ImportRowError(f'rating for skill {skill_name!r} must be 1-5')
+        skills[skill_name.strip()] = rating
+
+    phases = {phase: 'pending' for phase in TRIAL_PHASES}
+    for phase, status in (record.get('trial_phases') or {}).items():
+        status = str(status).strip().lower()
+        if phase not in phases:
+            raise ImportRowError(f'unknown trial phase {phase!r}')
+        if status not in PHASE_STATUSES:
+            raise ImportRowError(f'invalid status {status!r} for trial phase {phase!r}')
+        phases[phase] = status
+
+    password_hash = record.get('password_hash')
+    if not password_hash and record.get('password'):
+        password_hash = hash_password(str(record['password']))
+
+    return values, skills, phases, password_hash
+
+
+def read_checkpoint(path):
+    """Return the last committed line number recorded in a checkpoint file"""
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def write_checkpoint(path, line_number):
+    """Atomically record the last committed line number"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(str(line_number))
+    os.replace(tmp_path, path)
+
+
+class ImportStats:
+    """Running counters for an import"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.read = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.skipped = 0
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.perf_counter() - self.started
+        return self.read / elapsed if elapsed else 0.0
+
+
+def _insert_chunk(chunk):
+    """Insert one validated chunk with batched Core statements in a single transaction"""
+    emails = [values['email'].lower() for _, values, _, _, _ in chunk]
+    now = datetime.utcnow()
+
+    with db.engine.begin() as connection:
+        # Emails are stored as typed, so an address already registered in another case is still a duplicate
+        existing = set(connection.execute(
+            select(func.lower(Applicant.email)).where(func.lower(Applicant.email).in_(emails))
+        ).scalars())
+
+        fresh = [item for item in chunk if item[1]['email'].lower() not in existing]
+        if not fresh:
+            return 0, len(chunk)
+
+        applicant_rows = [dict(values, created_at=now, updated_at=now) for _, values, _, _, _ in fresh]
+        ids = dict(connection.execute(
+            insert(Applicant.__table__).returning(Applicant.__table__.c.email, Applicant.__table__.c.id),
+            applicant_rows
+        ).all())
+
+        skill_rows = []
+        phase_rows = []
+        account_rows = []
+        for _, values, skills, phases, password_hash in fresh:
+            applicant_id = ids[values['email']]
+            skill_rows += [
+                {'applicant_id': applicant_id, 'skill_name': name, 'rating': rating, 'self_assessed': True}
+                for name, rating in skills.items()
+            ]
+            phase_rows += [
+                {'applicant_id': applicant_id, 'phase_type': phase, 'status': status,
+                 'created_at': now, 'updated_at': now}
+                for phase, status in phases.items()
+            ]
+            if password_hash:
+                account_rows.append({'applicant_id': applicant_id, 'password': password_hash, 'is_active': True,
+                                     'created_at': now, 'updated_at': now})
+
+        if skill_rows:
+            connection.execute(insert(SkillAssessment.__table__), skill_rows)
+        connection.execute(insert(TrialPhase.__table__), phase_rows)
+        if account_rows:
+            connection.execute(insert(ApplicantAccount.__table__), account_rows)
+
+    notify_changed('applicants', 'skill_assessments', 'trial_phases', 'applicant_accounts')
+    return len(fresh), len(chunk) - len(fresh)
+
+
+def import_applicants(path, fmt=None, batch_size=500, checkpoint_path=None, resume=True,
+                      on_reject=None, on_progress=None):
+    """Import applicants from path in chunked transactions; returns ImportStats"""
+    stats = ImportStats()
+    checkpoint_path = checkpoint_path or f'{path}.checkpoint'
+    resume_after = read_checkpoint(checkpoint_path) if resume else 0
+
+    seen = set()
+    chunk = []
+    last_line = resume_after
+
+    def flush():
+        inserted, duplicates = _insert_chunk(chunk)
+        stats.inserted += inserted
+        stats.duplicates += duplicates
+        write_checkpoint(checkpoint_path, last_line)
+        chunk.clear()
+        if on_progress:
+            on_progress(stats)
+
+    for line_number, record in iter_records(path, fmt):
+        if line_number <= resume_after:
+            stats.skipped += 1
+            continue
+
+        stats.read += 1
+        last_line = line_number
+
+        try:
+            values, skills, phases, password_hash = validate_record(record)
+        except ImportRowError as e:
+            stats.invalid += 1
+            if on_reject:
+                on_reject(line_number, record, str(e))
+            continue
+
+        if values['email'].lower() in seen:
+            stats.duplicates += 1
+            continue
+        seen.add(values['email'].lower())
+
+        chunk.append((line_number, values, skills, phases, password_hash))
+        if len(chunk) >= batch_size:
+            flush()
+
+    if chunk or last_line > resume_after:
+        flush()
+
+    return stats
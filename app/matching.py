@@ -0,0 +1,149 @@
+"""
+Vectorized skill matching of applicants against subunit skill lists
+"""
+import threading
+import time
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+from app.events import on_commit
+from app.models import db, SkillAssessment, Subunit
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def normalize_skill(name):
+    """Case- and whitespace-insensitive skill key"""
+    return ' '.join(str(name).lower().split())
+
+
+class SkillMatrix:
+    """Applicant-by-skill rating matrix scored against every subunit at once"""
+
+    def __init__(self, applicant_ids, ratings, subunits, requirements):
+        self.applicant_ids = applicant_ids      # sorted int64, one per matrix row
+        self.ratings = ratings                  # float32 (applicants x skills), rating / 5
+        self.subunits = subunits                # [(id, name)] one per requirement row
+        self.requirements = requirements        # float32 (subunits x skills), rows sum to 1
+        self.built_at = time.monotonic()
+        # Mean rating over each subunit's required skills, 0-100
+        self.scores = (ratings @ requirements.T) * 100 if len(subunits) else np.zeros((len(applicant_ids), 0), np.float32)
+
+    @classmethod
+    def build(cls):
+        """Load subunit skill lists and all skill ratings into dense arrays"""
+        subunits = db.session.execute(select(Subunit.id, Subunit.name, Subunit.skills).order_by(Subunit.id)).all()
+
+        skill_columns = {}
+        for _, _, skills in subunits:
+            for skill in skills or []:
+                skill_columns.setdefault(normalize_skill(skill), len(skill_columns))
+
+        requirements = np.zeros((len(subunits), len(skill_columns)), dtype=np.float32)
+        for row, (_, _, skills) in enumerate(subunits):
+            columns = sorted({skill_columns[normalize_skill(skill)] for skill in skills or []})
+            if columns:
+                requirements[row, columns] = 1.0 / len(columns)
+
+        rows = db.session.execute(
+            select(SkillAssessment.applicant_id, SkillAssessment.skill_name, SkillAssessment.rating)
+            .where(SkillAssessment.rating != None)
+        ).all()
+
+        # Resolve each distinct raw skill name once; skills no subunit asks for are dropped
+        column_of = {}
+        for _, skill_name, _ in rows:
+            if skill_name not in column_of:
+                column_of[skill_name] = skill_columns.get(normalize_skill(skill_name), -1)
+
+        count = len(rows)
+        applicant_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=count)
+        columns = np.fromiter((column_of[r[1]] for r in rows), dtype=np.int64, count=count)
+        values = np.fromiter((r[2] for r in rows), dtype=np.float32, count=count)
+
+        unique_ids, row_index = np.unique(applicant_ids, return_inverse=True)
+        ratings = np.zeros((len(unique_ids), len(skill_columns)), dtype=np.float32)
+        keep = columns >= 0
+        ratings[row_index[keep], columns[keep]] = np.clip(values[keep], 0, 5) / 5.0
+
+        return cls(unique_ids, ratings, [(s[0], s[1]) for s in subunits], requirements)
+
+    def rows_for(self, applicant_ids):
+        """Matrix rows for applicant_ids (-1 where an applicant has no ratings)"""
+        applicant_ids = np.asarray(applicant_ids, dtype=np.int64)
+        if not len(self.applicant_ids):
+            return np.full(len(applicant_ids), -1, dtype=np.int64)
+        positions = np.searchsorted(self.applicant_ids, applicant_ids)
+        positions = np.minimum(positions, len(self.applicant_ids) - 1)
+        return np.where(self.applicant_ids[positions] == applicant_ids, positions, -1)
+
+    def scores_for(self, applicant_ids):
+        """Score matrix (len(applicant_ids) x subunits); unrated applicants score 0"""
+        rows = self.rows_for(applicant_ids)
+        scores = np.zeros((len(rows), len(self.subunits)), dtype=np.float32)
+        rated = rows >= 0
+        scores[rated] = self.scores[rows[rated]]
+        return scores
+
+
+def get_skill_matrix():
+    """Return the cached matrix, rebuilding it after skill changes or when it expires"""
+    global _matrix
+    ttl = current_app.config.get('MATCHING_CACHE_TTL', 300)
+
+    matrix = _matrix
+    if matrix is not None and time.monotonic() - matrix.built_at < ttl:
+        return matrix
+
+    with _matrix_lock:
+        if _matrix is None or time.monotonic() - _matrix.built_at >= ttl:
+            _matrix = SkillMatrix.build()
+        return _matrix
+
+
+@on_commit('skill_assessments', 'subunits')
+def invalidate_skill_matrix(changed_tables=None):
+    """Drop the cached matrix so the next request rebuilds it"""
+    global _matrix
+    _matrix = None
+
+
+def recommend_subunits(applicant_id, limit=3):
+    """Best matching subunits for one applicant as [{'subunit_id', 'name', 'score'}]"""
+    matrix = get_skill_matrix()
+    scores = matrix.scores_for([applicant_id])[0]
+    order = np.argsort(-scores, kind='stable')[:limit]
+    return [
+        {'subunit_id': matrix.subunits[i][0], 'name': matrix.subunits[i][1], 'score': round(float(scores[i]), 1)}
+        for i in order if scores[i] > 0
+    ]
+
+
+def suggest_placements(applicant_ids, choices=2, offset=0, limit=None):
+    """Rank applicants by their best subunit score in one batch.
+
+    Returns (total, page) where page holds (applicant_id, [(subunit_id, name, score)])
+    for the requested slice of the ranking, best matches first.
+    """
+    matrix = get_skill_matrix()
+    if not len(applicant_ids) or not matrix.subunits:
+        return 0, []
+
+    applicant_ids = np.asarray(applicant_ids, dtype=np.int64)
+    scores = matrix.scores_for(applicant_ids)
+
+    choices = min(choices, len(matrix.subunits))
+    top = np.argsort(-scores, axis=1, kind='stable')[:, :choices]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores[:, 0], kind='stable')
+    page = order[offset:offset + limit if limit else None]
+
+    return len(applicant_ids), [
+        (int(applicant_ids[i]), [
+            (matrix.subunits[j][0], matrix.subunits[j][1], round(float(top_scores[i, k]), 1))
+            for k, j in enumerate(top[i]) if top_scores[i, k] > 0
+        ])
+        for i in page
+    ]
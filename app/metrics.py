@@ -0,0 +1,140 @@
+"""
+Prometheus metrics: request latency, uploads, roster generation and pool usage
+
+Each gunicorn worker keeps its own values. When PROMETHEUS_MULTIPROC_DIR is
+set (before the workers start) prometheus_client writes them to files in
+that directory and /metrics aggregates every worker's files on scrape.
+"""
+import os
+import threading
+import time
+from flask import g, request
+from prometheus_client import (CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+                               CONTENT_TYPE_LATEST, generate_latest, multiprocess)
+
+# Requests whose body is an upload; their size and duration are tracked separately
+UPLOAD_ENDPOINTS = {
+    'media.upload_media': 'media',
+    'applicant.submit_application': 'application',
+}
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency',
+    ['blueprint', 'endpoint', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter('http_requests_total', 'Requests served', ['blueprint', 'endpoint', 'method', 'status'])
+IN_FLIGHT = Gauge('http_requests_in_flight', 'Requests being served', multiprocess_mode='livesum')
+
+UPLOAD_BYTES = Counter('upload_bytes_total', 'Bytes received by upload endpoints', ['kind'])
+UPLOAD_LATENCY = Histogram(
+    'upload_duration_seconds', 'Time to receive and store an upload', ['kind'],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+ROSTER_ROWS = Counter('roster_rows_generated_total', 'Duty roster rows created by roster generation')
+
+POOL_SIZE = Gauge('db_pool_size', 'Configured pool size', ['engine'], multiprocess_mode='livesum')
+POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Connections in use', ['engine'], multiprocess_mode='livesum')
+POOL_OVERFLOW = Gauge('db_pool_overflow', 'Overflow connections open', ['engine'], multiprocess_mode='livesum')
+POOL_CHECKOUTS = Counter('db_pool_checkouts_total', 'Connection checkouts', ['engine'])
+POOL_TIMEOUTS = Counter('db_pool_timeouts_total', 'Checkouts that timed out', ['engine'])
+POOL_WAIT = Counter('db_pool_wait_seconds_total', 'Time spent waiting for a connection', ['engine'])
+
+# Seconds between pool samples taken at the end of a request
+POOL_SAMPLE_INTERVAL = 1.0
+
+
+class _PoolSampler:
+    """Copies pool_status() into the pool gauges, turning cumulative stats into counter increments"""
+
+    def __init__(self, engines):
+        self._engines = engines
+        self._lock = threading.Lock()
+        self._last_sample = 0.0
+        self._seen = {}
+
+    def sample(self, force=False):
+        from app.pool import pool_status
+
+        now = time.monotonic()
+        if not force and now - self._last_sample < POOL_SAMPLE_INTERVAL:
+            return
+        with self._lock:
+            self._last_sample = now
+            for name, engine in self._engines.items():
+                status = pool_status(engine)
+                if 'size' in status:
+                    POOL_SIZE.labels(name).set(status['size'])
+                    POOL_CHECKED_OUT.labels(name).set(status['checked_out'])
+                    POOL_OVERFLOW.labels(name).set(status['overflow'])
+                if 'checkouts' in status:
+                    current = (status['checkouts'], status['timeouts'], status['wait_ms_total'] / 1000)
+                    previous = self._seen.get(name, (0, 0, 0.0))
+                    POOL_CHECKOUTS.labels(name).inc(current[0] - previous[0])
+                    POOL_TIMEOUTS.labels(name).inc(current[1] - previous[1])
+                    POOL_WAIT.labels(name).inc(max(current[2] - previous[2], 0))
+                    self._seen[name] = current
+
+
+def multiprocess_enabled():
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+def record_roster_rows(count):
+    """Count duty roster rows created by a generation run"""
+    ROSTER_ROWS.inc(count)
+
+
+def init_metrics(app, db):
+    """Record request metrics for /metrics"""
+    with app.app_context():
+        engines = {'writer' if key is None else key: engine for key, engine in db.engines.items()}
+    sampler = _PoolSampler(engines)
+    app.extensions['metrics_pool_sampler'] = sampler
+
+    @app.before_request
+    def _start_metrics():
+        g.metrics_started = time.perf_counter()
+        g.metrics_in_flight = True
+        IN_FLIGHT.inc()
+
+    @app.after_request
+    def _record_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'unmatched'
+        blueprint = request.blueprint or ''
+
+        REQUEST_LATENCY.labels(blueprint, endpoint, request.method).observe(elapsed)
+        REQUESTS.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+
+        kind = UPLOAD_ENDPOINTS.get(endpoint)
+        if kind and request.method == 'POST':
+            UPLOAD_BYTES.labels(kind).inc(request.content_length or 0)
+            UPLOAD_LATENCY.labels(kind).observe(elapsed)
+
+        sampler.sample()
+        return response
+
+    @app.teardown_request
+    def _finish_metrics(exc):
+        # Runs for failed requests too, so the in-flight gauge can't drift upwards
+        if g.pop('metrics_in_flight', False):
+            IN_FLIGHT.dec()
+
+
+def render_metrics(app):
+    """(body, content type) in Prometheus text format for every worker"""
+    sampler = app.extensions.get('metrics_pool_sampler')
+    if sampler is not None:
+        sampler.sample(force=True)
+
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,96 @@
+"""
+Versioned schema migrations, applied in order and recorded in schema_version
+"""
+from datetime import datetime
+from sqlalchemy import select, update, insert, exc
+from werkzeug.utils import import_string
+from app.models import db, SchemaVersion
+
+
+def _create_tables(connection):
+    """Create any missing tables (and their indexes) from the models"""
+    db.metadata.create_all(connection)
+
+
+def _create_indexes(connection):
+    """Create model indexes missing from tables that already existed"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+# (version, description, migrate(connection) or its import path). Append new steps at the
+# end; each must be safe to run against a database that already has the change, since
+# databases created before versioning existed are brought up to date by replaying every
+# step. Import paths keep the boot-time version check from loading those modules.
+MIGRATIONS = [
+    (1, 'Create tables', _create_tables),
+    (2, 'Unique (applicant_id, skill_name) index on skill_assessments', 'app.skills:ensure_skill_unique_index'),
+    (3, 'Trial phase report index', 'app.reports:ensure_report_indexes'),
+    (4, 'Reference data version stamps', 'app.refdata:ensure_refdata_versions'),
+    (5, 'Applicant full-text search index', 'app.search:install_search_index'),
+    (6, 'Indexes for filtered and sorted columns', _create_indexes),
+    (7, 'Event start date index for the v2 API', _create_indexes),
+    (8, 'Change feed tombstones and updated_at indexes', 'app.changes:install_change_feed'),
+    (9, 'Filter indexes ordered like the v2 API cursors', 'app.resources:install_cursor_indexes'),
+    (10, 'Case-insensitive applicant email index for imports', 'app.importer:ensure_email_index'),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(connection):
+    """Applied schema version (0 for a new or unversioned database)"""
+    try:
+        return connection.execute(select(SchemaVersion.version).where(SchemaVersion.id == 1)).scalar() or 0
+    except exc.DBAPIError:
+        connection.rollback()
+        return 0
+
+
+def pending_migrations(version):
+    """Migrations newer than version"""
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+
+def _stamp(connection, version):
+    values = {'version': version, 'applied_at': datetime.utcnow()}
+    result = connection.execute(update(SchemaVersion).where(SchemaVersion.id == 1).values(**values))
+    if not result.rowcount:
+        connection.execute(insert(SchemaVersion).values(id=1, **values))
+
+
+def upgrade_schema(engine, target=None, on_apply=None):
+    """Apply pending migrations up to target, each in its own transaction; returns the new version"""
+    with engine.connect() as connection:
+        version = current_version(connection)
+
+    for number, description, migrate in pending_migrations(version):
+        if target is not None and number > target:
+            break
+        if isinstance(migrate, str):
+            migrate = import_string(migrate)
+        with engine.begin() as connection:
+            migrate(connection)
+            _stamp(connection, number)
+        version = number
+        if on_apply:
+            on_apply(number, description)
+
+    return version
+
+
+def check_schema(app):
+    """Boot-time check: a single SELECT when the schema is current, otherwise upgrade or warn"""
+    with db.engine.connect() as connection:
+        version = current_version(connection)
+
+    if version >= LATEST_VERSION:
+        return version
+
+    if app.config.get('SCHEMA_AUTO_UPGRADE'):
+        return upgrade_schema(db.engine)
+
+    app.logger.warning('Database schema is at version %s but the code expects %s; '
+                       'run `flask --app app db upgrade`', version, LATEST_VERSION)
+    return version
@@ -4,8 +4,14 @@ SQLAlchemy database models for Media Unit Management
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from enum import Enum
+from app.sqlite_wal import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Allowed values for the string status columns
+APPLICANT_STATUSES = ['pending', 'approved', 'rejected', 'completed']
+TRIAL_PHASES = ['portfolio_review', 'shadow_service', 'practical_test']
+PHASE_STATUSES = ['pending', 'completed', 'pass', 'fail']
 
 
 class User(db.Model):
@@ -26,6 +32,9 @@ class User(db.Model):
 class ApplicantAccount(db.Model):
     """Applicant login account"""
     __tablename__ = 'applicant_accounts'
+    __table_args__ = (
+        db.Index('ix_applicant_accounts_updated_at', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     applicant_id = db.Column(db.Integer, db.ForeignKey('applicants.id'), nullable=False, unique=True)
@@ -35,7 +44,7 @@ class ApplicantAccount(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    applicant = db.relationship('Applicant', backref='account', uselist=False)
+    applicant = db.relationship('Applicant', backref=db.backref('account', uselist=False))
     
     def __repr__(self):
         return f'<ApplicantAccount {self.applicant_id}>'
@@ -60,6 +69,14 @@ class Subunit(db.Model):
 class Applicant(db.Model):
     """Membership applicant"""
     __tablename__ = 'applicants'
+    __table_args__ = (
+        db.Index('ix_applicants_status_created', 'status', 'created_at'),
+        db.Index('ix_applicants_created_at', 'created_at'),
+        db.Index('ix_applicants_subunit_status', 'assigned_subunit_id', 'status'),
+        db.Index('ix_applicants_subunit_created', 'assigned_subunit_id', 'created_at'),
+        db.Index('ix_applicants_role_created', 'assigned_role', 'created_at'),
+        db.Index('ix_applicants_updated_at', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(120), nullable=False)
@@ -94,6 +111,9 @@ class Applicant(db.Model):
 class SkillAssessment(db.Model):
     """Skill assessment for applicants (1-5 scale)"""
     __tablename__ = 'skill_assessments'
+    __table_args__ = (
+        db.Index('uq_skill_assessment_applicant_skill', 'applicant_id', 'skill_name', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     applicant_id = db.Column(db.Integer, db.ForeignKey('applicants.id'), nullable=False)
@@ -108,6 +128,11 @@ class SkillAssessment(db.Model):
 class TrialPhase(db.Model):
     """Track trial phases for applicants"""
     __tablename__ = 'trial_phases'
+    __table_args__ = (
+        db.Index('ix_trial_phases_applicant_phase_status', 'applicant_id', 'phase_type', 'status'),
+        db.Index('ix_trial_phases_phase_status_applicant', 'phase_type', 'status', 'applicant_id'),
+        db.Index('ix_trial_phases_updated_at', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     applicant_id = db.Column(db.Integer, db.ForeignKey('applicants.id'), nullable=False)
@@ -127,6 +152,9 @@ class TrialPhase(db.Model):
 class Portfolio(db.Model):
     """Portfolio files uploaded by applicants"""
     __tablename__ = 'portfolios'
+    __table_args__ = (
+        db.Index('ix_portfolios_applicant_id', 'applicant_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     applicant_id = db.Column(db.Integer, db.ForeignKey('applicants.id'), nullable=False)
@@ -145,6 +173,9 @@ class Portfolio(db.Model):
 class ApplicantPicture(db.Model):
     """Pictures uploaded by applicants for profile and portfolio"""
     __tablename__ = 'applicant_pictures'
+    __table_args__ = (
+        db.Index('ix_applicant_pictures_applicant_id', 'applicant_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     applicant_id = db.Column(db.Integer, db.ForeignKey('applicants.id'), nullable=False)
@@ -163,6 +194,12 @@ class ApplicantPicture(db.Model):
 class Media(db.Model):
     """Media library for organized storage"""
     __tablename__ = 'media'
+    __table_args__ = (
+        db.Index('ix_media_type_subunit_uploaded', 'media_type', 'subunit_id', 'uploaded_at'),
+        db.Index('ix_media_type_uploaded', 'media_type', 'uploaded_at'),
+        db.Index('ix_media_subunit_uploaded', 'subunit_id', 'uploaded_at'),
+        db.Index('ix_media_uploaded_at', 'uploaded_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -187,6 +224,9 @@ class Media(db.Model):
 class Event(db.Model):
     """Events like rehearsals and services"""
     __tablename__ = 'events'
+    __table_args__ = (
+        db.Index('ix_events_start_date', 'start_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -205,6 +245,10 @@ class Event(db.Model):
 class Announcement(db.Model):
     """Announcements for unit members"""
     __tablename__ = 'announcements'
+    __table_args__ = (
+        db.Index('ix_announcements_created_at', 'created_at'),
+        db.Index('ix_announcements_expires_at', 'expires_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -222,6 +266,9 @@ class Announcement(db.Model):
 class RosterTemplate(db.Model):
     """Duty roster templates configured by admin"""
     __tablename__ = 'roster_templates'
+    __table_args__ = (
+        db.Index('ix_roster_templates_updated_at', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)  # e.g., "Sunday Service", "Mid-week"
@@ -256,6 +303,12 @@ class RosterTemplate(db.Model):
 class DutyRoster(db.Model):
     """Generated duty roster entries"""
     __tablename__ = 'duty_rosters'
+    __table_args__ = (
+        db.Index('ix_duty_rosters_date_time', 'duty_date', 'start_time'),
+        db.Index('ix_duty_rosters_subunit_date', 'subunit', 'duty_date', 'start_time'),
+        db.Index('ix_duty_rosters_template_date', 'template_id', 'duty_date', 'start_time'),
+        db.Index('ix_duty_rosters_updated_at', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     template_id = db.Column(db.Integer, db.ForeignKey('roster_templates.id'), nullable=False)
@@ -283,3 +336,42 @@ class DutyRoster(db.Model):
     
     def __repr__(self):
         return f'<DutyRoster {self.assigned_to} - {self.duty_date}>'
+
+
+class Tombstone(db.Model):
+    """A deleted row, kept so change feed clients can drop their copy"""
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        db.Index('ix_tombstones_deleted_at', 'deleted_at', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)  # e.g. 'duty_rosters'
+    row_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Tombstone {self.table_name} {self.row_id}>'
+
+
+class RefDataVersion(db.Model):
+    """Change counter for reference tables cached in every worker"""
+    __tablename__ = 'refdata_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)  # Table name, e.g. 'subunits'
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<RefDataVersion {self.name}: {self.version}>'
+
+
+class SchemaVersion(db.Model):
+    """Single-row record of the last applied schema migration"""
+    __tablename__ = 'schema_version'
+    
+    id = db.Column(db.Integer, primary_key=True)  # Always 1
+    version = db.Column(db.Integer, nullable=False, default=0)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SchemaVersion {self.version}>'
@@ -0,0 +1,122 @@
+"""
+Named connection pool profiles and pool metrics
+"""
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, NullPool
+
+
+POOL_PROFILES = ['default', 'gunicorn', 'serverless', 'pgbouncer', 'sqlite']
+
+
+class PoolStats:
+    """Checkout counters for one pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - started)
+        return connection
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the DB_POOL_PROFILE in config"""
+    profile = config.get('DB_POOL_PROFILE', 'default')
+    if profile not in POOL_PROFILES:
+        raise ValueError(f'Unknown DB_POOL_PROFILE {profile!r}; expected one of {", ".join(POOL_PROFILES)}')
+
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if profile == 'sqlite' and url.get_backend_name() != 'sqlite':
+        raise ValueError('DB_POOL_PROFILE sqlite needs a sqlite:/// SQLALCHEMY_DATABASE_URI')
+    if profile == 'default' or (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')):
+        return {}
+
+    if profile == 'serverless':
+        # Each invocation may be the last one for this process; don't keep connections around
+        return {'poolclass': NullPool, 'pool_pre_ping': True}
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config.get('DB_POOL_SIZE', 5),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': True,
+        'pool_use_lifo': True,
+    }
+
+    if profile == 'sqlite':
+        # One long-lived writer connection; the reader bind gets DB_POOL_SIZE
+        # (app.sqlite_wal). Local files don't go stale, so no ping or recycle.
+        options.update({
+            'pool_size': 1,
+            'pool_recycle': -1,
+            'pool_pre_ping': False,
+            'connect_args': {'timeout': config.get('SQLITE_BUSY_TIMEOUT', 5000) / 1000},
+        })
+
+    if profile == 'pgbouncer':
+        # Transaction pooling hands each transaction a different server connection, so
+        # server-side prepared statements can't be reused. psycopg2 never prepares;
+        # psycopg 3 has to be told not to.
+        if url.get_driver_name() == 'psycopg':
+            options['connect_args'] = {'prepare_threshold': None}
+
+    return options
+
+
+def pool_status(engine):
+    """Current pool occupancy and checkout wait metrics"""
+    pool = engine.pool
+    status = {'pool': type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+        })
+
+    stats = getattr(pool, 'stats', None)
+    if stats is not None:
+        status.update({
+            'checkouts': stats.checkouts,
+            'timeouts': stats.timeouts,
+            'wait_ms_total': round(stats.wait_total * 1000, 3),
+            'wait_ms_avg': round(stats.wait_total * 1000 / stats.checkouts, 3) if stats.checkouts else 0.0,
+            'wait_ms_max': round(stats.wait_max * 1000, 3),
+        })
+
+    return status
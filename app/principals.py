@@ -0,0 +1,66 @@
+"""
+Resolve the signed-in admin or applicant once per request into flask.g
+"""
+import threading
+import time
+from collections import namedtuple
+from flask import g, session, current_app
+from sqlalchemy import select
+from app.events import on_commit
+from app.models import db, User, Applicant
+
+
+AdminPrincipal = namedtuple('AdminPrincipal', ['id', 'username', 'role'])
+
+ADMIN_CACHE_SIZE = 256
+
+_admins = {}
+_admins_lock = threading.Lock()
+
+
+def _lookup_admin(user_id):
+    """Admin principal for user_id from the process cache, loading it on a miss"""
+    ttl = current_app.config.get('AUTH_CACHE_TTL', 60)
+    now = time.monotonic()
+
+    entry = _admins.get(user_id)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+
+    row = db.session.execute(select(User.id, User.username, User.role).where(User.id == user_id)).first()
+    principal = AdminPrincipal(*row) if row else None
+
+    with _admins_lock:
+        if len(_admins) >= ADMIN_CACHE_SIZE:
+            _admins.clear()
+        _admins[user_id] = (now, principal)
+    return principal
+
+
+def current_admin():
+    """The signed-in staff user as an AdminPrincipal, or None"""
+    if 'admin' not in g:
+        user_id = session.get('user_id')
+        principal = None
+        if user_id is not None:
+            if current_app.config.get('AUTH_TRUST_SESSION_ROLE'):
+                # The session cookie is signed, so the role written at login can be trusted as-is
+                principal = AdminPrincipal(user_id, session.get('username'), session.get('role'))
+            else:
+                principal = _lookup_admin(user_id)
+        g.admin = principal
+    return g.admin
+
+
+def current_applicant():
+    """The signed-in applicant, loaded at most once per request, or None"""
+    if 'applicant' not in g:
+        applicant_id = session.get('applicant_id')
+        g.applicant = db.session.get(Applicant, applicant_id) if applicant_id is not None else None
+    return g.applicant
+
+
+@on_commit('users')
+def invalidate_admins(changed_tables):
+    """Role changes and deletions take effect on the next request"""
+    _admins.clear()
@@ -0,0 +1,167 @@
+"""
+Per-request SQL profiling, Server-Timing headers and a sampled slow-request log
+"""
+import heapq
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque, defaultdict
+from flask import g, request, has_request_context
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Characters of each statement kept for the slow log and /admin/perf
+STATEMENT_PREVIEW = 300
+
+
+class RequestProfile:
+    """SQL counters for the request being served"""
+
+    __slots__ = ('started', 'queries', 'sql_time', 'slowest', 'keep')
+
+    def __init__(self, keep):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.slowest = []
+        self.keep = keep
+
+    def record(self, statement, elapsed):
+        self.queries += 1
+        self.sql_time += elapsed
+        entry = (elapsed, statement)
+        if len(self.slowest) < self.keep:
+            heapq.heappush(self.slowest, entry)
+        elif elapsed > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def top_statements(self):
+        return [{'ms': round(elapsed * 1000, 3), 'sql': ' '.join(statement.split())[:STATEMENT_PREVIEW]}
+                for elapsed, statement in sorted(self.slowest, reverse=True)]
+
+
+class PerfStats:
+    """Recent request timings per endpoint and the latest slow requests, for this process"""
+
+    def __init__(self, window, slow_kept=50):
+        self._lock = threading.Lock()
+        self._window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self._window))
+        self.slow = deque(maxlen=slow_kept)
+
+    def add(self, endpoint, total_ms, sql_ms, queries):
+        with self._lock:
+            self._samples[endpoint].append((total_ms, sql_ms, queries))
+
+    def add_slow(self, entry):
+        with self._lock:
+            self.slow.appendleft(entry)
+
+    def summary(self):
+        """Per-endpoint request count and latency percentiles, slowest p95 first"""
+        with self._lock:
+            samples = {endpoint: list(values) for endpoint, values in self._samples.items()}
+
+        rows = []
+        for endpoint, values in samples.items():
+            totals = sorted(value[0] for value in values)
+            rows.append({
+                'endpoint': endpoint,
+                'requests': len(values),
+                'p50_ms': _percentile(totals, 50),
+                'p95_ms': _percentile(totals, 95),
+                'p99_ms': _percentile(totals, 99),
+                'sql_ms_avg': round(sum(value[1] for value in values) / len(values), 3),
+                'queries_avg': round(sum(value[2] for value in values) / len(values), 1),
+            })
+        return sorted(rows, key=lambda row: -row['p95_ms'])
+
+
+def _percentile(ordered, percent):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('profile_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['profile_started'].pop()
+    if has_request_context():
+        profile = g.get('sql_profile')
+        if profile is not None:
+            profile.record(statement, time.perf_counter() - started)
+
+
+def _handle_error(context):
+    # The statement failed, so after_cursor_execute won't pop its start time
+    if context.connection is not None and context.connection.info.get('profile_started'):
+        context.connection.info['profile_started'].pop()
+
+
+def init_profiling(app, db):
+    """Time every statement and request when SQL_PROFILING is on; otherwise nothing is installed"""
+    if not app.config.get('SQL_PROFILING'):
+        return
+
+    stats = PerfStats(app.config.get('PERF_WINDOW', 500))
+    app.extensions['perf_stats'] = stats
+    keep = app.config.get('PERF_SLOWEST_STATEMENTS', 3)
+    slow_ms = app.config.get('PERF_SLOW_REQUEST_MS', 500)
+    sample_rate = app.config.get('PERF_SLOW_SAMPLE_RATE', 1.0)
+
+    if app.config.get('PERF_SLOW_LOG'):
+        # The logger is shared by every app made in this process, so attach each file once
+        path = os.path.abspath(app.config['PERF_SLOW_LOG'])
+        if not any(getattr(handler, 'baseFilename', None) == path for handler in logger.handlers):
+            handler = logging.FileHandler(path)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(engine, 'handle_error', _handle_error)
+
+    @app.before_request
+    def _start_profile():
+        g.sql_profile = RequestProfile(keep)
+
+    @app.after_request
+    def _finish_profile(response):
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return response
+
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        sql_ms = profile.sql_time * 1000
+        response.headers.add('Server-Timing', f'db;dur={sql_ms:.3f};desc="{profile.queries} queries"')
+        response.headers.add('Server-Timing', f'app;dur={total_ms:.3f}')
+
+        endpoint = request.endpoint or 'unmatched'
+        stats.add(endpoint, total_ms, sql_ms, profile.queries)
+
+        if total_ms >= slow_ms and random.random() < sample_rate:
+            entry = {
+                'at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'endpoint': endpoint,
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'status': response.status_code,
+                'total_ms': round(total_ms, 3),
+                'sql_ms': round(sql_ms, 3),
+                'queries': profile.queries,
+                'slowest': profile.top_statements(),
+            }
+            stats.add_slow(entry)
+            logger.warning(json.dumps(entry))
+
+        return response
@@ -0,0 +1,152 @@
+"""
+Per-endpoint query budgets: a view decorator, and a context manager for tests
+"""
+import functools
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+# Distinct statements listed when a budget is exceeded
+STATEMENTS_REPORTED = 10
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request or block ran more SQL statements than its budget"""
+
+
+class QueryLog:
+    """Statements run so far, counted by text so repeats (N+1 loads) stand out"""
+
+    __slots__ = ('count', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.statements = Counter()
+
+    def record(self, statement):
+        self.count += 1
+        self.statements[statement] += 1
+
+    def describe(self, label, budget):
+        lines = [f'{label} ran {self.count} queries (budget {budget})']
+        for statement, times in self.statements.most_common(STATEMENTS_REPORTED):
+            lines.append(f'  {times}x {" ".join(statement.split())[:300]}')
+        return '\n'.join(lines)
+
+
+def query_budget(max_queries, per_chunk=0):
+    """View decorator: the request may run at most max_queries statements, whatever the data size.
+
+    Statements run while a streamed body is sent count too, and are checked
+    once it has been sent; such a view may run per_chunk more for each chunk.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            g.query_budget = max_queries
+            g.query_budget_per_chunk = per_chunk
+            return view(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+def extend_query_budget(extra):
+    """Allow the current request extra statements, once per batch of a view that works in fixed-size batches"""
+    if has_request_context() and g.get('query_budget') is not None:
+        g.query_budget += extra
+
+
+def view_budget(view_func):
+    """Budget declared on a view (importing lazy views), or None"""
+    view_func = getattr(view_func, 'view', view_func)
+    return getattr(view_func, 'query_budget', None)
+
+
+def _record_request_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        log = g.get('query_log')
+        if log is not None:
+            log.record(statement)
+
+
+@contextmanager
+def count_queries():
+    """Collect the statements run inside the block (needs an app context); yields a QueryLog"""
+    log = QueryLog()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        log.record(statement)
+
+    engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield log
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', record)
+
+
+@contextmanager
+def assert_max_queries(limit, label='block'):
+    """Test helper: raise QueryBudgetExceeded if the block runs more than limit statements"""
+    with count_queries() as log:
+        yield log
+    if log.count > limit:
+        raise QueryBudgetExceeded(log.describe(label, limit))
+
+
+def init_query_budgets(app, db):
+    """Check each request against its view's budget: raise in tests, log a warning otherwise"""
+    mode = app.config.get('QUERY_BUDGET_MODE', 'warn')
+    if mode == 'off':
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _record_request_query)
+
+    @app.before_request
+    def _start_query_log():
+        g.query_log = QueryLog()
+
+    def enforce(log, budget, label):
+        if log.count <= budget:
+            return
+        message = log.describe(label, budget)
+        if mode == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    def counted_stream(body, log, budget, per_chunk, label):
+        chunks = 0
+        try:
+            for chunk in body:
+                chunks += 1
+                yield chunk
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+        enforce(log, budget + per_chunk * chunks, label)
+
+    @app.after_request
+    def _check_query_budget(response):
+        log = g.get('query_log')
+        budget = g.get('query_budget')
+        if log is None or budget is None:
+            return response
+
+        label = f'{request.method} {request.path} ({request.endpoint})'
+        # A generator body runs its statements after this hook (send_file bodies run none)
+        if response.is_streamed and not response.direct_passthrough:
+            response.response = counted_stream(response.response, log, budget,
+                                               g.get('query_budget_per_chunk', 0), label)
+            return response
+        enforce(log, budget, label)
+        return response
@@ -0,0 +1,107 @@
+"""
+Immutable per-process snapshots of subunits and staff users
+"""
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+from flask import g, current_app
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.orm import Session
+from app.events import on_commit
+from app.models import db, Subunit, User, RefDataVersion
+
+
+REFDATA_TABLES = ('subunits', 'users')
+
+SubunitRef = namedtuple('SubunitRef', ['id', 'name', 'description', 'skills'])
+UserRef = namedtuple('UserRef', ['id', 'username', 'role'])
+
+_snapshot = None
+_checked_at = 0.0
+_snapshot_lock = threading.Lock()
+
+
+class RefData:
+    """Subunits and users as they were at one set of table versions"""
+
+    def __init__(self, versions, subunits, users):
+        self.versions = versions
+        self.subunits = tuple(subunits)
+        self.users = tuple(users)
+        self._subunits_by_id = MappingProxyType({subunit.id: subunit for subunit in self.subunits})
+        self._users_by_id = MappingProxyType({user.id: user for user in self.users})
+
+    @classmethod
+    def load(cls, versions):
+        subunits = db.session.execute(
+            select(Subunit.id, Subunit.name, Subunit.description, Subunit.skills).order_by(Subunit.id)
+        ).all()
+        users = db.session.execute(select(User.id, User.username, User.role).order_by(User.id)).all()
+        return cls(
+            versions,
+            [SubunitRef(id, name, description, tuple(skills or ())) for id, name, description, skills in subunits],
+            [UserRef(*user) for user in users],
+        )
+
+    def subunit(self, subunit_id):
+        """SubunitRef for subunit_id, or None"""
+        return self._subunits_by_id.get(subunit_id)
+
+    def user(self, user_id):
+        """UserRef for user_id, or None"""
+        return self._users_by_id.get(user_id)
+
+
+def _current_versions():
+    rows = db.session.execute(select(RefDataVersion.name, RefDataVersion.version)).all()
+    return tuple(sorted(rows))
+
+
+def get_refdata():
+    """The current snapshot, checking the shared version stamps at most every REFDATA_CHECK_INTERVAL seconds"""
+    global _snapshot, _checked_at
+    if 'refdata' in g:
+        return g.refdata
+
+    interval = current_app.config.get('REFDATA_CHECK_INTERVAL', 2)
+    snapshot = _snapshot
+    if snapshot is None or time.monotonic() - _checked_at >= interval:
+        with _snapshot_lock:
+            if _snapshot is None or time.monotonic() - _checked_at >= interval:
+                versions = _current_versions()
+                if _snapshot is None or _snapshot.versions != versions:
+                    _snapshot = RefData.load(versions)
+                _checked_at = time.monotonic()
+            snapshot = _snapshot
+
+    g.refdata = snapshot
+    return snapshot
+
+
+def ensure_refdata_versions(connection):
+    """Seed a version row for every cached table"""
+    existing = set(connection.execute(select(RefDataVersion.name)).scalars())
+    missing = [{'name': table, 'version': 0} for table in REFDATA_TABLES if table not in existing]
+    if missing:
+        connection.execute(insert(RefDataVersion.__table__), missing)
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_versions(session):
+    """Advance the stamps in the same transaction as the write so other workers reload"""
+    session.flush()
+    changed = session.info.get('changed_tables', set()).intersection(REFDATA_TABLES)
+    for table in sorted(changed):
+        result = session.execute(
+            update(RefDataVersion).where(RefDataVersion.name == table).values(version=RefDataVersion.version + 1)
+        )
+        if not result.rowcount:
+            session.execute(insert(RefDataVersion), [{'name': table, 'version': 1}])
+
+
+@on_commit(*REFDATA_TABLES)
+def invalidate_refdata(changed_tables):
+    """Reload on this worker's next request"""
+    global _snapshot
+    _snapshot = None
@@ -0,0 +1,119 @@
+"""
+Admin reports computed in SQL as lightweight row projections
+"""
+from collections import namedtuple
+from sqlalchemy import select, func, and_
+from app.models import db, Applicant, TrialPhase, APPLICANT_STATUSES
+
+
+REPORT_TYPES = ['summary', 'ready_for_team', 'needs_training', 'assigned_roles']
+
+REPORT_COLUMNS = [
+    Applicant.id,
+    Applicant.full_name,
+    Applicant.email,
+    Applicant.primary_interest,
+    Applicant.status,
+    Applicant.assigned_role,
+]
+
+ReportRow = namedtuple('ReportRow', ['id', 'full_name', 'email', 'primary_interest', 'status',
+                                     'assigned_role', 'latest_phase_type', 'latest_phase_status'])
+ReportPage = namedtuple('ReportPage', ['rows', 'has_newer', 'has_older'])
+
+
+def ensure_report_indexes(connection):
+    """Create the trial phase lookup indexes on databases created before they existed"""
+    for index in TrialPhase.__table__.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def _has_phase(phase_type, status):
+    """IN (subquery) test so applicants with several matching phases appear once"""
+    # Driven from the (phase_type, status, applicant_id) index instead of probing every applicant
+    return Applicant.id.in_(
+        select(TrialPhase.applicant_id).where(TrialPhase.phase_type == phase_type, TrialPhase.status == status)
+    )
+
+
+def report_filter(report_type):
+    """WHERE clause selecting the applicants of a report type"""
+    if report_type == 'ready_for_team':
+        return and_(Applicant.status == 'approved', _has_phase('practical_test', 'pass'))
+    if report_type == 'needs_training':
+        return _has_phase('practical_test', 'pending')
+    if report_type == 'assigned_roles':
+        return Applicant.assigned_role != None
+    return None
+
+
+def _filtered(statement, report_type):
+    criterion = report_filter(report_type)
+    return statement.where(criterion) if criterion is not None else statement
+
+
+def report_summary(report_type):
+    """Total and per-status counts for a report in one GROUP BY (cached by app.stats.report_stats)"""
+    rows = db.session.execute(
+        _filtered(select(Applicant.status, func.count(Applicant.id)), report_type).group_by(Applicant.status)
+    ).all()
+    by_status = dict.fromkeys(APPLICANT_STATUSES, 0)
+    for status, count in rows:
+        by_status[status or 'pending'] = by_status.get(status or 'pending', 0) + count
+    return sum(by_status.values()), by_status
+
+
+def latest_phases(applicant_ids):
+    """Latest trial phase of each applicant as {applicant_id: (phase_type, status)}"""
+    if not applicant_ids:
+        return {}
+
+    ranked = select(
+        TrialPhase.applicant_id,
+        TrialPhase.phase_type,
+        TrialPhase.status,
+        func.row_number().over(partition_by=TrialPhase.applicant_id, order_by=TrialPhase.id.desc()).label('position'),
+    ).where(TrialPhase.applicant_id.in_(applicant_ids)).subquery()
+
+    rows = db.session.execute(
+        select(ranked.c.applicant_id, ranked.c.phase_type, ranked.c.status).where(ranked.c.position == 1)
+    ).all()
+    return {applicant_id: (phase_type, status) for applicant_id, phase_type, status in rows}
+
+
+def _with_phases(rows):
+    phases = latest_phases([row.id for row in rows])
+    return [ReportRow(*row, *phases.get(row.id, (None, None))) for row in rows]
+
+
+def report_page(report_type, after=None, before=None, per_page=50):
+    """One page of report rows, newest applicants first, keyset-paginated on the applicant id.
+
+    after gives the page following the applicant with that id, before the page
+    preceding it, so every page is one index range read however deep it is.
+    """
+    statement = _filtered(select(*REPORT_COLUMNS), report_type)
+    if before is not None:
+        rows = db.session.execute(
+            statement.where(Applicant.id > before).order_by(Applicant.id).limit(per_page + 1)
+        ).all()
+        return ReportPage(_with_phases(rows[:per_page][::-1]), has_newer=len(rows) > per_page, has_older=True)
+
+    if after is not None:
+        statement = statement.where(Applicant.id < after)
+    rows = db.session.execute(statement.order_by(Applicant.id.desc()).limit(per_page + 1)).all()
+    return ReportPage(_with_phases(rows[:per_page]), has_newer=after is not None, has_older=len(rows) > per_page)
+
+
+def iter_report_rows(report_type, batch_size=1000):
+    """Yield every report row in keyset-paginated batches"""
+    last_id = None
+    while True:
+        statement = _filtered(select(*REPORT_COLUMNS), report_type)
+        if last_id is not None:
+            statement = statement.where(Applicant.id < last_id)
+        rows = db.session.execute(statement.order_by(Applicant.id.desc()).limit(batch_size)).all()
+        if not rows:
+            return
+        yield from _with_phases(rows)
+        last_id = rows[-1].id
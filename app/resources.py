@@ -0,0 +1,233 @@
+"""
+Read-only collections served by /api/v2: field projection, indexed filters and keyset cursors
+"""
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import date, datetime
+from sqlalchemy import select, update, or_, tuple_, func
+from app.models import db, Applicant, Media, DutyRoster, Event, Announcement
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Query string arguments that are not filters
+PAGE_ARGUMENTS = {'fields', 'cursor', 'limit'}
+
+Page = namedtuple('Page', ['rows', 'next_cursor'])
+
+
+class Resource:
+    """A model listed newest first, exposing fields and filtering on indexed columns only.
+
+    Rows are ordered by the sort columns, then id. Every filter has an index
+    that ends in the sort columns, so a filtered page is read in index order.
+    """
+
+    def __init__(self, model, fields, default_fields, filters, sort):
+        self.model = model
+        self.columns = {name: getattr(model, name) for name in fields}
+        self.default_fields = default_fields
+        self.filters = filters
+        self.order = [getattr(model, name) for name in sort] + [model.id]
+
+
+def _equals(column, convert=str):
+    return lambda value: column == convert(value)
+
+
+def _since(column, convert):
+    return lambda value: column >= convert(value)
+
+
+def _until(column, convert):
+    return lambda value: column <= convert(value)
+
+
+def _flag(value):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f'expected true or false, got {value!r}')
+
+
+def _announcement_active(value):
+    now = datetime.utcnow()
+    live = or_(Announcement.expires_at == None, Announcement.expires_at > now)
+    return live if _flag(value) else Announcement.expires_at <= now
+
+
+RESOURCES = {
+    'applicants': Resource(
+        Applicant,
+        ['id', 'full_name', 'email', 'phone', 'date_of_birth', 'occupation', 'social_media',
+         'professional_background', 'availability', 'primary_interest', 'status', 'assigned_subunit_id',
+         'assigned_role', 'assigned_mentor_id', 'created_at', 'updated_at'],
+        ['id', 'full_name', 'status', 'assigned_subunit_id', 'assigned_role'],
+        {
+            'status': _equals(Applicant.status),
+            'subunit': _equals(Applicant.assigned_subunit_id, int),
+            'role': _equals(Applicant.assigned_role),
+            'since': _since(Applicant.created_at, datetime.fromisoformat),
+            'until': _until(Applicant.created_at, datetime.fromisoformat),
+        },
+        ['created_at'],
+    ),
+    'media': Resource(
+        Media,
+        ['id', 'title', 'description', 'media_type', 'subunit_id', 'event_name', 'event_date',
+         'filename', 'file_size', 'uploaded_by', 'uploaded_at'],
+        ['id', 'title', 'media_type', 'subunit_id', 'uploaded_at'],
+        {
+            'type': _equals(Media.media_type),
+            'subunit': _equals(Media.subunit_id, int),
+            'since': _since(Media.uploaded_at, datetime.fromisoformat),
+            'until': _until(Media.uploaded_at, datetime.fromisoformat),
+        },
+        ['uploaded_at'],
+    ),
+    'rosters': Resource(
+        DutyRoster,
+        ['id', 'template_id', 'duty_date', 'start_time', 'end_time', 'assigned_to', 'subunit', 'role',
+         'status', 'notes', 'confirmed_by', 'confirmed_at', 'created_at', 'updated_at'],
+        ['id', 'duty_date', 'start_time', 'end_time', 'assigned_to', 'subunit', 'role', 'status'],
+        {
+            'template': _equals(DutyRoster.template_id, int),
+            'subunit': _equals(DutyRoster.subunit),
+            'since': _since(DutyRoster.duty_date, date.fromisoformat),
+            'until': _until(DutyRoster.duty_date, date.fromisoformat),
+        },
+        ['duty_date', 'start_time'],
+    ),
+    'events': Resource(
+        Event,
+        ['id', 'title', 'description', 'event_type', 'start_date', 'end_date', 'location', 'created_at'],
+        ['id', 'title', 'event_type', 'start_date', 'end_date', 'location'],
+        {
+            'since': _since(Event.start_date, datetime.fromisoformat),
+            'until': _until(Event.start_date, datetime.fromisoformat),
+        },
+        ['start_date'],
+    ),
+    'announcements': Resource(
+        Announcement,
+        ['id', 'title', 'content', 'author', 'priority', 'created_at', 'expires_at'],
+        ['id', 'title', 'content', 'priority', 'created_at', 'expires_at'],
+        {
+            'active': _announcement_active,
+            'since': _since(Announcement.created_at, datetime.fromisoformat),
+            'until': _until(Announcement.created_at, datetime.fromisoformat),
+        },
+        ['created_at'],
+    ),
+}
+
+
+def install_cursor_indexes(connection):
+    """Create the filter indexes the cursors walk, and fill NULL sort columns the keyset comparison would skip"""
+    # Superseded by ix_applicants_role_created
+    connection.exec_driver_sql('DROP INDEX IF EXISTS ix_applicants_assigned_role')
+    for resource in RESOURCES.values():
+        for index in resource.model.__table__.indexes:
+            index.create(connection, checkfirst=True)
+
+    now = datetime.utcnow()
+    for model, name, value in [(Applicant, 'created_at', func.coalesce(Applicant.updated_at, now)),
+                               (Media, 'uploaded_at', now), (Announcement, 'created_at', now),
+                               (DutyRoster, 'start_time', '')]:
+        connection.execute(update(model).where(getattr(model, name) == None).values({name: value}))
+
+
+def encode_cursor(values):
+    """Opaque cursor pointing after the row with these sort column values and id"""
+    raw = json.dumps(values, separators=(',', ':'), default=_json_default)
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b'=').decode()
+
+
+def decode_cursor(resource, cursor):
+    """Sort column values and id of a cursor, typed like the columns"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(resource.order):
+            raise ValueError
+        return [_parse(column, value) for column, value in zip(resource.order, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError('invalid cursor')
+
+
+def _parse(column, value):
+    python_type = column.type.python_type
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type in (date, datetime):
+        return python_type.fromisoformat(value)
+    raise ValueError
+
+
+def _fields(resource, value):
+    if not value:
+        return resource.default_fields
+    requested = dict.fromkeys(name.strip() for name in value.split(','))
+    fields = ['id'] + [name for name in requested if name and name != 'id']
+    unknown = [name for name in fields if name not in resource.columns]
+    if unknown:
+        raise ValueError(f'unknown field(s): {", ".join(unknown)}')
+    return fields
+
+
+def _limit(value):
+    if not value:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def read_page(resource, args):
+    """One page of a resource for the query string args; raises ValueError for a bad argument.
+
+    Only the requested columns are selected, and the page is a keyset walk down
+    the filter's index on (sort columns, id), so each request costs one SELECT
+    whatever page it asks for.
+    """
+    fields = _fields(resource, args.get('fields'))
+    limit = _limit(args.get('limit'))
+
+    criteria = []
+    for name, value in args.items(multi=True):
+        if name in PAGE_ARGUMENTS:
+            continue
+        if name not in resource.filters:
+            raise ValueError(f'unknown filter: {name}')
+        try:
+            criteria.append(resource.filters[name](value))
+        except ValueError:
+            raise ValueError(f'invalid value for {name}: {value!r}')
+
+    if args.get('cursor'):
+        criteria.append(tuple_(*resource.order) < tuple_(*decode_cursor(resource, args['cursor'])))
+
+    # Sort columns are read for the cursor even when not requested
+    keys = [column.label(f'_key{position}') for position, column in enumerate(resource.order)]
+    statement = select(*(resource.columns[name].label(name) for name in fields), *keys).where(*criteria)
+    rows = db.session.execute(
+        statement.order_by(*(column.desc() for column in resource.order)).limit(limit + 1)
+    ).all()
+
+    next_cursor = encode_cursor(list(rows[limit - 1][len(fields):])) if len(rows) > limit else None
+    return Page([dict(zip(fields, row)) for row in rows[:limit]], next_cursor)
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def dump_json(payload):
+    """Compact UTF-8 JSON: no whitespace, no key sorting, no escaping of non-ASCII text"""
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=_json_default).encode('utf-8')
@@ -0,0 +1,117 @@
+"""
+Blueprints and their URL rules.
+
+View functions live in one module per blueprint and are imported on the first
+request that reaches them (see LazyView), so a cold process serving the JSON API
+never loads the roster or media stacks.
+"""
+from flask import Blueprint
+from werkzeug.utils import import_string, cached_property
+
+
+class LazyView:
+    """View function imported from its dotted path on first call"""
+    
+    def __init__(self, import_name):
+        self.__module__, self.__name__ = import_name.rsplit('.', 1)
+        self.import_name = import_name
+    
+    @cached_property
+    def view(self):
+        return import_string(self.import_name)
+    
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+
+def lazy_rule(blueprint, module, rule, view_name, **options):
+    """Route rule to app.routes.<module>.<view_name>, keeping view_name as the endpoint"""
+    blueprint.add_url_rule(rule, endpoint=view_name,
+                           view_func=LazyView(f'app.routes.{module}.{view_name}'), **options)
+
+
+# Create blueprints
+main_bp = Blueprint('main', __name__)
+auth_bp = Blueprint('auth', __name__)
+applicant_bp = Blueprint('applicant', __name__, url_prefix='/apply')
+admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
+media_bp = Blueprint('media', __name__, url_prefix='/media')
+roster_bp = Blueprint('roster', __name__, url_prefix='/roster')
+api_bp = Blueprint('api', __name__, url_prefix='/api')
+api_v2_bp = Blueprint('api_v2', __name__, url_prefix='/api/v2')
+
+
+# ==================== MAIN ROUTES ====================
+
+lazy_rule(main_bp, 'main', '/', 'index')
+lazy_rule(main_bp, 'main', '/about', 'about')
+lazy_rule(main_bp, 'main', '/api/members-count', 'members_count')
+lazy_rule(main_bp, 'main', '/metrics', 'metrics')
+
+# ==================== AUTH ROUTES ====================
+
+lazy_rule(auth_bp, 'auth', '/login', 'login', methods=['GET', 'POST'])
+lazy_rule(auth_bp, 'auth', '/logout', 'logout')
+lazy_rule(auth_bp, 'auth', '/applicant-login', 'applicant_login', methods=['GET', 'POST'])
+lazy_rule(auth_bp, 'auth', '/applicant-logout', 'applicant_logout')
+
+# ==================== APPLICANT ROUTES ====================
+
+lazy_rule(applicant_bp, 'applicant', '/', 'application_form')
+lazy_rule(applicant_bp, 'applicant', '/submit', 'submit_application', methods=['POST'])
+lazy_rule(applicant_bp, 'applicant', '/success/<int:applicant_id>', 'application_success')
+lazy_rule(applicant_bp, 'applicant', '/dashboard', 'applicant_dashboard')
+lazy_rule(applicant_bp, 'applicant', '/update-profile', 'update_profile', methods=['GET', 'POST'])
+
+# ==================== ADMIN ROUTES ====================
+
+lazy_rule(admin_bp, 'admin', '/dashboard', 'dashboard')
+lazy_rule(admin_bp, 'admin', '/applicants', 'applicants_list')
+lazy_rule(admin_bp, 'admin', '/applicant/<int:applicant_id>', 'view_applicant')
+lazy_rule(admin_bp, 'admin', '/placements', 'placements')
+lazy_rule(admin_bp, 'admin', '/applicant/<int:applicant_id>/update', 'update_applicant', methods=['POST'])
+lazy_rule(admin_bp, 'admin', '/applicant/<int:applicant_id>/trial/<phase_id>/update', 'update_trial_phase', methods=['POST'])
+lazy_rule(admin_bp, 'admin', '/applicants/bulk', 'bulk_update_applicants', methods=['POST'])
+lazy_rule(admin_bp, 'admin', '/reports', 'reports')
+lazy_rule(admin_bp, 'admin', '/reports/export', 'export_report')
+lazy_rule(admin_bp, 'admin', '/manage-admins', 'manage_admins')
+lazy_rule(admin_bp, 'admin', '/admin/create', 'create_admin', methods=['POST'])
+lazy_rule(admin_bp, 'admin', '/db-pool', 'db_pool')
+lazy_rule(admin_bp, 'admin', '/perf', 'perf')
+
+# ==================== MEDIA LIBRARY ROUTES ====================
+
+lazy_rule(media_bp, 'media', '/', 'library')
+lazy_rule(media_bp, 'media', '/upload', 'upload_media', methods=['GET', 'POST'])
+lazy_rule(media_bp, 'media', '/<int:media_id>/download', 'download_media')
+lazy_rule(media_bp, 'media', '/<int:media_id>/delete', 'delete_media', methods=['POST'])
+
+# ==================== DUTY ROSTER ROUTES ====================
+
+lazy_rule(roster_bp, 'roster', '/', 'roster_dashboard')
+lazy_rule(roster_bp, 'roster', '/templates', 'roster_templates')
+lazy_rule(roster_bp, 'roster', '/template/create', 'create_template', methods=['GET', 'POST'])
+lazy_rule(roster_bp, 'roster', '/template/<int:template_id>/edit', 'edit_template', methods=['GET', 'POST'])
+lazy_rule(roster_bp, 'roster', '/template/<int:template_id>/delete', 'delete_template', methods=['POST'])
+lazy_rule(roster_bp, 'roster', '/generate/<int:template_id>', 'generate_roster', methods=['GET', 'POST'])
+lazy_rule(roster_bp, 'roster', '/view', 'view_rosters')
+lazy_rule(roster_bp, 'roster', '/<int:roster_id>/confirm', 'confirm_roster', methods=['POST'])
+lazy_rule(roster_bp, 'roster', '/<int:roster_id>/update', 'update_roster', methods=['POST'])
+lazy_rule(roster_bp, 'roster', '/<int:roster_id>/delete', 'delete_roster', methods=['POST'])
+lazy_rule(roster_bp, 'roster', '/export/<int:template_id>', 'export_roster')
+
+# ==================== JSON API ROUTES ====================
+
+lazy_rule(api_bp, 'api', '/members-count', 'members_count')
+lazy_rule(api_bp, 'api', '/media-count', 'media_count')
+lazy_rule(api_bp, 'api', '/subunits', 'get_subunits')
+lazy_rule(api_bp, 'api', '/applicant-stats', 'applicant_stats')
+lazy_rule(api_bp, 'api', '/changes', 'changes')
+
+# ==================== JSON API v2 ROUTES ====================
+
+lazy_rule(api_v2_bp, 'api_v2', '/applicants', 'applicants')
+lazy_rule(api_v2_bp, 'api_v2', '/media', 'media')
+lazy_rule(api_v2_bp, 'api_v2', '/rosters', 'rosters')
+lazy_rule(api_v2_bp, 'api_v2', '/events', 'events')
+lazy_rule(api_v2_bp, 'api_v2', '/announcements', 'announcements')
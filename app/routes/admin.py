@@ -0,0 +1,413 @@
+"""
+Admin console: applicants, placements, reports and admin accounts
+"""
+from flask import render_template, request, jsonify, abort, Response, stream_with_context, current_app
+from app.models import db, Applicant, User, TrialPhase
+from app.models import APPLICANT_STATUSES, TRIAL_PHASES, PHASE_STATUSES
+from app.utils import admin_required
+from app.search import search_applicants
+from app.stats import applicant_stats
+from app.refdata import get_refdata
+from app.security import hash_password
+from app.query_budget import query_budget, extend_query_budget
+from sqlalchemy import update, literal, or_, func
+from datetime import datetime
+
+
+@query_budget(5)
+@admin_required
+def dashboard():
+    """Admin dashboard"""
+    # Get statistics
+    stats = applicant_stats()
+    
+    # Get recent applicants
+    recent_applicants = Applicant.query.order_by(Applicant.created_at.desc()).limit(10).all()
+    
+    # Get summary by status
+    status_summary = {status: stats[status] for status in APPLICANT_STATUSES}
+    
+    return render_template('admin/dashboard.html',
+                         total_applicants=stats['total'],
+                         pending_applications=stats['pending'],
+                         approved_members=stats['approved'],
+                         recent_applicants=recent_applicants,
+                         status_summary=status_summary)
+
+
+@query_budget(7)
+@admin_required
+def applicants_list():
+    """List all applicants"""
+    page = request.args.get('page', 1, type=int)
+    status_filter = request.args.get('status', '', type=str)
+    search_query = request.args.get('q', '', type=str).strip()
+    
+    query = Applicant.query
+    if status_filter:
+        query = query.filter_by(status=status_filter)
+    
+    if search_query:
+        query = search_applicants(query, search_query)
+    else:
+        query = query.order_by(Applicant.created_at.desc())
+    
+    applicants = query.paginate(page=page, per_page=20)
+    subunits = get_refdata().subunits
+    users = get_refdata().users
+    
+    return render_template('admin/applicants.html',
+                         applicants=applicants,
+                         status_filter=status_filter,
+                         search_query=search_query,
+                         subunits=subunits,
+                         users=users,
+                         trial_phases=TRIAL_PHASES)
+
+
+@query_budget(10)
+@admin_required
+def view_applicant(applicant_id):
+    """View detailed applicant profile"""
+    from app.matching import recommend_subunits
+    
+    applicant = Applicant.query.get_or_404(applicant_id)
+    subunits = get_refdata().subunits
+    users = get_refdata().users
+    recommendations = recommend_subunits(applicant.id)
+    
+    return render_template('admin/applicant_detail.html',
+                         applicant=applicant,
+                         subunits=subunits,
+                         users=users,
+                         recommendations=recommendations)
+
+
+@query_budget(7)
+@admin_required
+def placements():
+    """Suggested subunit placements for unassigned applicants, best matches first"""
+    from app.matching import suggest_placements
+    
+    page = request.args.get('page', 1, type=int)
+    status_filter = request.args.get('status', '', type=str)
+    per_page = 50
+    
+    query = db.session.query(Applicant.id).filter(Applicant.assigned_subunit_id == None)
+    if status_filter:
+        query = query.filter(Applicant.status == status_filter)
+    else:
+        query = query.filter(Applicant.status.in_(['pending', 'approved']))
+    applicant_ids = [row.id for row in query]
+    
+    total, ranked = suggest_placements(applicant_ids, offset=(page - 1) * per_page, limit=per_page)
+    applicants = {a.id: a for a in Applicant.query.filter(Applicant.id.in_([r[0] for r in ranked]))}
+    suggestions = [(applicants[applicant_id], choices) for applicant_id, choices in ranked]
+    
+    return render_template('admin/placements.html',
+                         suggestions=suggestions,
+                         total=total,
+                         page=page,
+                         pages=max(1, -(-total // per_page)),
+                         status_filter=status_filter)
+
+
+@query_budget(5)
+@admin_required
+def update_applicant(applicant_id):
+    """Update applicant information"""
+    applicant = Applicant.query.get_or_404(applicant_id)
+    
+    try:
+        applicant.status = request.form.get('status', applicant.status)
+        applicant.assigned_role = request.form.get('assigned_role', applicant.assigned_role)
+        
+        mentor_id = request.form.get('assigned_mentor_id')
+        if mentor_id:
+            applicant.assigned_mentor_id = int(mentor_id)
+        
+        subunit_id = request.form.get('assigned_subunit_id')
+        if subunit_id:
+            applicant.assigned_subunit_id = int(subunit_id)
+        
+        db.session.commit()
+        return jsonify({'success': True, 'message': 'Applicant updated'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(5)
+@admin_required
+def update_trial_phase(applicant_id, phase_id):
+    """Update trial phase"""
+    trial = TrialPhase.query.get_or_404(phase_id)
+    
+    if trial.applicant_id != applicant_id:
+        abort(403)
+    
+    try:
+        trial.status = request.form.get('status', trial.status)
+        trial.score = request.form.get('score')
+        trial.notes = request.form.get('notes', '')
+        
+        if trial.status in ['pass', 'completed']:
+            trial.completed_date = datetime.utcnow()
+        
+        # Auto-assign minor role if practical test passed
+        if trial.phase_type == 'practical_test' and trial.status == 'pass':
+            applicant = trial.applicant
+            if not applicant.assigned_role:
+                applicant.assigned_role = f"Minor - {applicant.primary_interest}"
+                applicant.status = 'completed'
+        
+        db.session.commit()
+        return jsonify({'success': True, 'message': 'Trial phase updated'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+# Ids per UPDATE statement, well under every driver's bind parameter limit
+BULK_CHUNK_SIZE = 500
+
+
+@query_budget(8)
+@admin_required
+def bulk_update_applicants():
+    """Apply status, assignment and trial phase changes to many applicants at once"""
+    try:
+        # Target either the selected ids or everything matching the list filter
+        if request.form.get('select_all_matching') == '1':
+            target = Applicant.query
+            status_filter = request.form.get('status_filter', '')
+            if status_filter:
+                target = target.filter_by(status=status_filter)
+            search_query = request.form.get('q', '').strip()
+            if search_query:
+                target = search_applicants(target, search_query)
+            # Resolve the filter once so later updates cannot change which rows it matches
+            target_ids = [row.id for row in target.with_entities(Applicant.id).order_by(None)]
+        else:
+            target_ids = [int(i) for i in request.form.getlist('applicant_ids') if i]
+            if not target_ids:
+                return jsonify({'error': 'No applicants selected'}), 400
+        
+        values = {}
+        status = request.form.get('status', '')
+        if status:
+            if status not in APPLICANT_STATUSES:
+                return jsonify({'error': 'Invalid status'}), 400
+            values['status'] = status
+        
+        subunit_id = request.form.get('assigned_subunit_id')
+        if subunit_id:
+            values['assigned_subunit_id'] = int(subunit_id)
+        
+        mentor_id = request.form.get('assigned_mentor_id')
+        if mentor_id:
+            values['assigned_mentor_id'] = int(mentor_id)
+        
+        phase_type = request.form.get('phase_type', '')
+        phase_status = request.form.get('phase_status', '')
+        if bool(phase_type) != bool(phase_status):
+            return jsonify({'error': 'Trial phase and phase status must be given together'}), 400
+        if phase_type and (phase_type not in TRIAL_PHASES or phase_status not in PHASE_STATUSES):
+            return jsonify({'error': 'Invalid trial phase update'}), 400
+        
+        if not values and not phase_type:
+            return jsonify({'error': 'No changes selected'}), 400
+        
+        applicants_updated = 0
+        phases_updated = 0
+        completed = 0
+        phase_values = {'status': phase_status}
+        if phase_status in ['pass', 'completed']:
+            phase_values['completed_date'] = datetime.utcnow()
+        
+        for start in range(0, len(target_ids), BULK_CHUNK_SIZE):
+            chunk = target_ids[start:start + BULK_CHUNK_SIZE]
+            if start:
+                # Up to three UPDATEs per chunk; the view's budget covers the first chunk
+                extend_query_budget(3)
+            
+            if values:
+                result = db.session.execute(
+                    update(Applicant).where(Applicant.id.in_(chunk)).values(**values),
+                    execution_options={'synchronize_session': False}
+                )
+                applicants_updated += result.rowcount
+            
+            if phase_type:
+                result = db.session.execute(
+                    update(TrialPhase)
+                    .where(TrialPhase.applicant_id.in_(chunk), TrialPhase.phase_type == phase_type)
+                    .values(**phase_values),
+                    execution_options={'synchronize_session': False}
+                )
+                phases_updated += result.rowcount
+                
+                # Same rule as update_trial_phase: passing the practical test completes the applicant
+                if phase_type == 'practical_test' and phase_status == 'pass':
+                    result = db.session.execute(
+                        update(Applicant)
+                        .where(Applicant.id.in_(chunk),
+                               or_(Applicant.assigned_role == None, Applicant.assigned_role == ''))
+                        .values(assigned_role=literal('Minor - ') + func.coalesce(Applicant.primary_interest, ''),
+                                status='completed'),
+                        execution_options={'synchronize_session': False}
+                    )
+                    completed += result.rowcount
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'{applicants_updated} applicants and {phases_updated} trial phases updated',
+            'applicants_updated': applicants_updated,
+            'trial_phases_updated': phases_updated,
+            'completed': completed
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(6)
+@admin_required
+def reports():
+    """Generate reports"""
+    from app.reports import REPORT_TYPES, report_page
+    from app.stats import report_stats
+    
+    report_type = request.args.get('type', 'summary')
+    if report_type not in REPORT_TYPES:
+        report_type = 'summary'
+    after = request.args.get('after', type=int)
+    before = request.args.get('before', type=int)
+    # The page number is only shown; the after/before applicant id picks the rows
+    page = request.args.get('page', 1, type=int) if after or before else 1
+    per_page = 50
+    
+    total, by_status = report_stats(report_type)
+    result = report_page(report_type, after=after, before=before, per_page=per_page)
+    pages = max(1, -(-total // per_page))
+    
+    return render_template('admin/reports.html',
+                         applicants=result.rows,
+                         report_type=report_type,
+                         total=total,
+                         by_status=by_status,
+                         page=max(1, min(page, pages)),
+                         pages=pages,
+                         has_newer=bool(result.rows) and result.has_newer,
+                         has_older=bool(result.rows) and result.has_older)
+
+
+@query_budget(6, per_chunk=2)
+@admin_required
+def export_report():
+    """Stream a report as CSV"""
+    import csv
+    from io import StringIO
+    from app.reports import REPORT_TYPES, iter_report_rows
+    
+    report_type = request.args.get('type', 'summary')
+    if report_type not in REPORT_TYPES:
+        report_type = 'summary'
+    
+    def generate():
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Name', 'Email', 'Interest', 'Status', 'Assigned Role', 'Latest Phase', 'Phase Status'])
+        
+        for count, row in enumerate(iter_report_rows(report_type), start=1):
+            writer.writerow([
+                row.full_name,
+                row.email,
+                row.primary_interest,
+                row.status,
+                row.assigned_role or '',
+                row.latest_phase_type or '',
+                row.latest_phase_status or ''
+            ])
+            if count % 500 == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+        
+        yield output.getvalue()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=report_{report_type}.csv'}
+    )
+
+
+@query_budget(4)
+@admin_required
+def manage_admins():
+    """Manage admin users"""
+    admins = User.query.all()
+    return render_template('admin/manage_admins.html', admins=admins)
+
+
+@query_budget(5)
+@admin_required
+def create_admin():
+    """Create new admin user"""
+    try:
+        username = request.form.get('username', '').strip()
+        email = request.form.get('email', '').strip()
+        password = request.form.get('password', '').strip()
+        
+        if not all([username, email, password]):
+            return jsonify({'error': 'Missing required fields'}), 400
+        
+        if User.query.filter_by(username=username).first():
+            return jsonify({'error': 'Username already exists'}), 400
+        
+        user = User(
+            username=username,
+            email=email,
+            password=hash_password(password),
+            role='admin'
+        )
+        
+        db.session.add(user)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Admin created successfully'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(3)
+@admin_required
+def db_pool():
+    """Database connection pool metrics"""
+    from app.pool import pool_status
+    
+    status = pool_status(db.engine)
+    status['profile'] = current_app.config.get('DB_POOL_PROFILE', 'default')
+    if 'reader' in db.engines:
+        status['reader'] = pool_status(db.engines['reader'])
+    return jsonify(status)
+
+
+@query_budget(3)
+@admin_required
+def perf():
+    """Per-endpoint request latency and recent slow requests for this worker"""
+    stats = current_app.extensions.get('perf_stats')
+    return render_template('admin/perf.html',
+                         enabled=stats is not None,
+                         endpoints=stats.summary() if stats else [],
+                         slow_requests=list(stats.slow) if stats else [],
+                         slow_ms=current_app.config.get('PERF_SLOW_REQUEST_MS'))
@@ -0,0 +1,68 @@
+"""
+JSON API endpoints
+"""
+from flask import current_app, jsonify, request
+from app.cache import cached_response
+from app.changes import read_changes, CursorExpired, DEFAULT_PAGE_SIZE
+from app.resources import dump_json
+from app.refdata import get_refdata
+from app.stats import applicant_stats as get_applicant_stats, media_stats
+from app.utils import admin_required
+from app.query_budget import query_budget
+
+
+@query_budget(3)
+@cached_response('applicants', max_age=30, anonymous_only=False)
+def members_count():
+    """Get count of approved members"""
+    return jsonify({'count': get_applicant_stats()['approved']})
+
+
+@query_budget(3)
+def media_count():
+    """Get count of media files by type"""
+    return jsonify(media_stats())
+
+
+@query_budget(3)
+@cached_response('subunits', max_age=60, anonymous_only=False)
+def get_subunits():
+    """Get all subunits as JSON"""
+    subunits = get_refdata().subunits
+    return jsonify([{
+        'id': s.id,
+        'name': s.name,
+        'description': s.description,
+        'skills': list(s.skills)
+    } for s in subunits])
+
+
+@query_budget(3)
+def applicant_stats():
+    """Get applicant statistics"""
+    stats = get_applicant_stats()
+    return jsonify({
+        'total': stats['total'],
+        'pending': stats['pending'],
+        'approved': stats['approved'],
+        'completed': stats['completed'],
+        'rejected': stats['rejected'],
+    })
+
+
+@query_budget(8)
+@admin_required
+def changes():
+    """Rows inserted, updated or deleted since a cursor, oldest first (admin only)"""
+    try:
+        page = read_changes(request.args.get('since'),
+                            request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+                            settle_seconds=current_app.config.get('CHANGE_FEED_SETTLE_SECONDS', 5),
+                            retention_days=current_app.config.get('TOMBSTONE_RETENTION_DAYS', 90))
+    except CursorExpired as e:
+        return jsonify({'error': str(e)}), 410
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    body = dump_json({'changes': page.changes, 'next': page.next_cursor, 'has_more': page.has_more})
+    return current_app.response_class(body, mimetype='application/json')
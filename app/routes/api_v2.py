@@ -0,0 +1,58 @@
+"""
+Versioned read API: paginated collections with sparse fieldsets
+"""
+import hashlib
+from flask import current_app, jsonify, request
+from app.resources import RESOURCES, read_page, dump_json
+from app.utils import admin_required
+from app.query_budget import query_budget
+
+
+def _collection(name, public=True):
+    """JSON page of a resource with an ETag, or a 400 for a bad query string"""
+    try:
+        page = read_page(RESOURCES[name], request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    body = dump_json({'data': page.rows, 'next': page.next_cursor})
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(hashlib.sha1(body).hexdigest())
+    # Clients keep the page and revalidate it with If-None-Match
+    response.cache_control.no_cache = True
+    if public:
+        response.cache_control.public = True
+    else:
+        response.cache_control.private = True
+    return response.make_conditional(request)
+
+
+@query_budget(3)
+@admin_required
+def applicants():
+    """List applicants (admin only)"""
+    return _collection('applicants', public=False)
+
+
+@query_budget(3)
+def media():
+    """List media library items"""
+    return _collection('media')
+
+
+@query_budget(3)
+def rosters():
+    """List duty roster entries"""
+    return _collection('rosters')
+
+
+@query_budget(3)
+def events():
+    """List events"""
+    return _collection('events')
+
+
+@query_budget(3)
+def announcements():
+    """List announcements"""
+    return _collection('announcements')
@@ -0,0 +1,193 @@
+"""
+Application form and applicant self-service
+"""
+from flask import current_app, render_template, request, jsonify, redirect, url_for
+from app.models import db, Applicant, TrialPhase, ApplicantAccount
+from app.models import TRIAL_PHASES
+from app.utils import applicant_required, allowed_file, secure_save_file
+from app.principals import current_applicant
+from app.submissions import parse_skill_ratings, stage_submission_files, discard_staged_files, finalize_submission_files
+from app.skills import upsert_skill_ratings
+from app.tasks import enqueue
+from app.refdata import get_refdata
+from app.security import hash_password
+from app.query_budget import query_budget
+from sqlalchemy import insert
+import os
+from datetime import datetime
+
+
+@query_budget(3)
+def application_form():
+    """Display application form"""
+    subunits = get_refdata().subunits
+    return render_template('applicant/form.html', subunits=subunits)
+
+
+@query_budget(8)
+def submit_application():
+    """Process application submission"""
+    try:
+        # Get form data
+        full_name = request.form.get('full_name', '').strip()
+        email = request.form.get('email', '').strip()
+        phone = request.form.get('phone', '').strip()
+        date_of_birth_str = request.form.get('date_of_birth', '').strip()
+        occupation = request.form.get('occupation', '').strip()
+        facebook = request.form.get('facebook', '').strip()
+        instagram = request.form.get('instagram', '').strip()
+        professional_background = request.form.get('professional_background', '').strip()
+        availability = request.form.get('availability', '').strip()
+        primary_interest = request.form.get('primary_interest', '').strip()
+        password = request.form.get('password', '').strip()
+        
+        # Validate required fields
+        if not all([full_name, email, primary_interest, password]):
+            return jsonify({'error': 'Missing required fields'}), 400
+        
+        # Check if email already exists
+        existing = Applicant.query.filter_by(email=email).first()
+        if existing:
+            return jsonify({'error': 'Email already registered'}), 400
+        
+        # Parse date of birth
+        date_of_birth = None
+        if date_of_birth_str:
+            try:
+                date_of_birth = datetime.strptime(date_of_birth_str, '%Y-%m-%d').date()
+            except ValueError:
+                pass
+        
+        # Hash before opening the transaction so no locks are held during the CPU work
+        password_hash = hash_password(password)
+        
+        # Stream uploads to staging; moving them into place happens after the response
+        staged = stage_submission_files(request.files, request.form)
+        
+        try:
+            # Create applicant
+            applicant = Applicant(
+                full_name=full_name,
+                email=email,
+                phone=phone,
+                date_of_birth=date_of_birth,
+                occupation=occupation,
+                social_media={'facebook': facebook, 'instagram': instagram},
+                professional_background=professional_background,
+                availability=availability,
+                primary_interest=primary_interest,
+                status='pending'
+            )
+            db.session.add(applicant)
+            db.session.flush()  # Get applicant ID
+            applicant_id = applicant.id
+            
+            # Upsert skill ratings and bulk insert the initial trial phases
+            upsert_skill_ratings(applicant_id, parse_skill_ratings(request.form))
+            
+            db.session.execute(insert(TrialPhase), [
+                {'applicant_id': applicant_id, 'phase_type': phase, 'status': 'pending'}
+                for phase in TRIAL_PHASES
+            ])
+            
+            # Create applicant account for login
+            account = ApplicantAccount(
+                applicant_id=applicant_id,
+                password=password_hash,
+                is_active=True
+            )
+            db.session.add(account)
+            
+            db.session.commit()
+        except Exception:
+            discard_staged_files(staged)
+            raise
+        
+        if staged:
+            enqueue(finalize_submission_files, applicant_id, staged)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Application submitted successfully!',
+            'applicant_id': applicant_id
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(3)
+def application_success(applicant_id):
+    """Show success page"""
+    applicant = Applicant.query.get_or_404(applicant_id)
+    return render_template('applicant/success.html', applicant=applicant)
+
+
+@query_budget(7)
+@applicant_required
+def applicant_dashboard():
+    """Applicant personal dashboard"""
+    applicant = current_applicant()
+    
+    # Suggested features based on status
+    suggested_features = []
+    
+    if applicant.status == 'pending':
+        suggested_features = [
+            {'icon': '📋', 'title': 'Update Skills', 'description': 'Add or update your skill assessments', 'link': url_for('applicant.update_profile')},
+            {'icon': '📸', 'title': 'Add Pictures', 'description': 'Upload profile and portfolio pictures', 'link': url_for('applicant.update_profile')},
+            {'icon': '📚', 'title': 'View Guidelines', 'description': 'Learn about our selection process', 'link': '#'},
+        ]
+    elif applicant.status == 'approved':
+        suggested_features = [
+            {'icon': '👥', 'title': 'Meet Your Mentor', 'description': 'Connect with your assigned mentor', 'link': '#'},
+            {'icon': '📅', 'title': 'Schedule Training', 'description': 'Book your orientation and training', 'link': '#'},
+            {'icon': '🎬', 'title': 'View Media Resources', 'description': 'Access team resources and guides', 'link': url_for('media.library')},
+        ]
+    elif applicant.status == 'completed':
+        suggested_features = [
+            {'icon': '📊', 'title': 'View Roster', 'description': 'Check your duty assignments', 'link': url_for('roster.view_rosters')},
+            {'icon': '🎓', 'title': 'Training Materials', 'description': 'Access ongoing training resources', 'link': url_for('media.library')},
+            {'icon': '💬', 'title': 'Contact Your Team', 'description': 'Reach out to team leaders', 'link': '#'},
+        ]
+    
+    refdata = get_refdata()
+    return render_template('applicant/dashboard.html', 
+                         applicant=applicant, 
+                         subunit=refdata.subunit(applicant.assigned_subunit_id),
+                         mentor=refdata.user(applicant.assigned_mentor_id),
+                         suggested_features=suggested_features)
+
+
+@query_budget(5)
+@applicant_required
+def update_profile():
+    """Update applicant profile"""
+    applicant = current_applicant()
+    applicant_id = applicant.id
+    subunits = get_refdata().subunits
+    
+    if request.method == 'POST':
+        # Update basic info
+        applicant.occupation = request.form.get('occupation', applicant.occupation)
+        applicant.availability = request.form.get('availability', applicant.availability)
+        applicant.professional_background = request.form.get('professional_background', applicant.professional_background)
+        
+        # Update skills in a single upsert
+        upsert_skill_ratings(applicant_id, parse_skill_ratings(request.form))
+        
+        # Handle profile picture upload
+        if 'profile_picture' in request.files:
+            file = request.files['profile_picture']
+            if file and allowed_file(file.filename):
+                upload_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'pictures')
+                filepath = secure_save_file(file, upload_folder)
+                
+                if filepath:
+                    applicant.profile_picture = filepath
+        
+        db.session.commit()
+        return redirect(url_for('applicant.applicant_dashboard'))
+    
+    return render_template('applicant/update_profile.html', applicant=applicant, subunits=subunits)
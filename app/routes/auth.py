@@ -0,0 +1,82 @@
+"""
+Admin and applicant sign-in
+"""
+from flask import render_template, request, session, redirect, url_for
+from app.models import db, Applicant, User
+from app.security import verify_password, PasswordHashingBusy
+from app.query_budget import query_budget
+from datetime import datetime
+
+
+@query_budget(5)
+def login():
+    """Admin login"""
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        
+        user = User.query.filter_by(username=username).first()
+        
+        try:
+            valid, new_hash = verify_password(user.password, password) if user else (False, None)
+        except PasswordHashingBusy:
+            return render_template('auth/login.html', error='Too many sign-ins right now, please try again'), 503
+        
+        if valid:
+            if new_hash:
+                user.password = new_hash
+                db.session.commit()
+            session['user_id'] = user.id
+            session['username'] = user.username
+            session['role'] = user.role
+            return redirect(url_for('admin.dashboard'))
+        else:
+            return render_template('auth/login.html', error='Invalid credentials')
+    
+    return render_template('auth/login.html')
+
+
+def logout():
+    """Logout"""
+    session.clear()
+    return redirect(url_for('main.index'))
+
+
+@query_budget(5)
+def applicant_login():
+    """Applicant login to personal dashboard"""
+    if request.method == 'POST':
+        email = request.form.get('email', '').strip()
+        password = request.form.get('password', '').strip()
+        
+        applicant = Applicant.query.filter_by(email=email).first()
+        
+        if applicant and applicant.account:
+            try:
+                valid, new_hash = verify_password(applicant.account.password, password)
+            except PasswordHashingBusy:
+                return render_template('applicant/login.html', error='Too many sign-ins right now, please try again'), 503
+            
+            if valid and applicant.account.is_active:
+                session['applicant_id'] = applicant.id
+                session['applicant_email'] = applicant.email
+                session['applicant_name'] = applicant.full_name
+                if new_hash:
+                    applicant.account.password = new_hash
+                applicant.account.last_login = datetime.utcnow()
+                db.session.commit()
+                return redirect(url_for('applicant.applicant_dashboard'))
+            else:
+                return render_template('applicant/login.html', error='Invalid credentials or account disabled')
+        else:
+            return render_template('applicant/login.html', error='Email not found or no account created yet')
+    
+    return render_template('applicant/login.html')
+
+
+def applicant_logout():
+    """Applicant logout"""
+    session.pop('applicant_id', None)
+    session.pop('applicant_email', None)
+    session.pop('applicant_name', None)
+    return redirect(url_for('main.index'))
@@ -0,0 +1,47 @@
+"""
+Public pages
+"""
+from flask import render_template, jsonify, request, abort, current_app, Response
+from app.models import Announcement
+from app.stats import applicant_stats
+from app.cache import cached_response
+from app.query_budget import query_budget
+from datetime import datetime
+import hmac
+
+
+@query_budget(3)
+@cached_response('announcements')
+def index():
+    """Home page"""
+    announcements = Announcement.query.filter(
+        (Announcement.expires_at == None) | (Announcement.expires_at > datetime.utcnow())
+    ).order_by(Announcement.created_at.desc()).limit(5).all()
+    
+    return render_template('index.html', announcements=announcements)
+
+
+def about():
+    """About page"""
+    return render_template('about.html')
+
+
+@query_budget(3)
+@cached_response('applicants', max_age=30, anonymous_only=False)
+def members_count():
+    """API: Get count of approved members"""
+    return jsonify({'count': applicant_stats()['approved']})
+
+
+def metrics():
+    """Prometheus metrics in text exposition format"""
+    if not current_app.config.get('METRICS_ENABLED'):
+        abort(404)
+    
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        abort(401)
+    
+    from app.metrics import render_metrics
+    body, content_type = render_metrics(current_app)
+    return Response(body, content_type=content_type)
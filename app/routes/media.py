@@ -0,0 +1,128 @@
+"""
+Media library
+"""
+from flask import current_app, render_template, request, jsonify, session, send_file, abort
+from app.models import db, Media
+from app.utils import admin_required, allowed_file, secure_save_file
+from app.refdata import get_refdata
+from app.query_budget import query_budget
+import os
+from datetime import datetime
+
+
+@query_budget(5)
+def library():
+    """Media library view"""
+    media_type = request.args.get('type', '')
+    subunit_id = request.args.get('subunit', '', type=int)
+    page = request.args.get('page', 1, type=int)
+    
+    query = Media.query
+    
+    if media_type:
+        query = query.filter_by(media_type=media_type)
+    
+    if subunit_id:
+        query = query.filter_by(subunit_id=subunit_id)
+    
+    media_items = query.order_by(Media.uploaded_at.desc()).paginate(page=page, per_page=20)
+    # Subunit names come from the snapshot rather than a lazy load per item
+    refdata = get_refdata()
+    
+    return render_template('media/library.html',
+                         media_items=media_items,
+                         subunits=refdata.subunits,
+                         refdata=refdata,
+                         selected_type=media_type,
+                         selected_subunit=subunit_id)
+
+
+@query_budget(5)
+@admin_required
+def upload_media():
+    """Upload media file"""
+    if request.method == 'GET':
+        subunits = get_refdata().subunits
+        return render_template('media/upload.html', subunits=subunits)
+    
+    try:
+        title = request.form.get('title', '').strip()
+        description = request.form.get('description', '').strip()
+        media_type = request.form.get('media_type', '').strip()
+        subunit_id = request.form.get('subunit_id', type=int)
+        event_name = request.form.get('event_name', '').strip()
+        event_date_str = request.form.get('event_date', '')
+        
+        file = request.files.get('media_file')
+        
+        if not all([title, media_type, file]):
+            return jsonify({'error': 'Missing required fields'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'File type not allowed'}), 400
+        
+        upload_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'media')
+        filepath = secure_save_file(file, upload_folder)
+        
+        if not filepath:
+            return jsonify({'error': 'Failed to save file'}), 500
+        
+        event_date = None
+        if event_date_str:
+            try:
+                event_date = datetime.strptime(event_date_str, '%Y-%m-%d').date()
+            except ValueError:
+                pass
+        
+        media = Media(
+            title=title,
+            description=description,
+            media_type=media_type,
+            subunit_id=subunit_id if subunit_id else None,
+            event_name=event_name,
+            event_date=event_date,
+            filename=file.filename,
+            file_path=filepath,
+            file_size=os.path.getsize(filepath),
+            uploaded_by=session.get('username', 'unknown')
+        )
+        
+        db.session.add(media)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Media uploaded successfully'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(3)
+def download_media(media_id):
+    """Download media file"""
+    media = Media.query.get_or_404(media_id)
+    
+    try:
+        return send_file(media.file_path, as_attachment=True, download_name=media.filename)
+    except:
+        abort(404)
+
+
+@query_budget(4)
+@admin_required
+def delete_media(media_id):
+    """Delete media file"""
+    media = Media.query.get_or_404(media_id)
+    
+    try:
+        if os.path.exists(media.file_path):
+            os.remove(media.file_path)
+        
+        db.session.delete(media)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Media deleted'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,363 @@
+"""
+Duty roster templates, generation and views
+"""
+from flask import render_template, request, jsonify, send_file
+from sqlalchemy import insert
+from app.models import db, Applicant, RosterTemplate, DutyRoster
+from app.utils import admin_required
+from app.cache import cached_response
+from app.refdata import get_refdata
+from app.metrics import record_roster_rows
+from app.query_budget import query_budget
+from datetime import datetime, timedelta, date
+
+
+@query_budget(5)
+@admin_required
+def roster_dashboard():
+    """Duty roster dashboard"""
+    templates = RosterTemplate.query.all()
+    rosters = DutyRoster.query.order_by(DutyRoster.duty_date.desc()).limit(20).all()
+    
+    return render_template('roster/dashboard.html',
+                         templates=templates,
+                         rosters=rosters)
+
+
+@query_budget(5)
+@admin_required
+def roster_templates():
+    """List all roster templates"""
+    page = request.args.get('page', 1, type=int)
+    templates = RosterTemplate.query.paginate(page=page, per_page=10)
+    
+    return render_template('roster/templates.html', templates=templates)
+
+
+@query_budget(5)
+@admin_required
+def create_template():
+    """Create new roster template"""
+    if request.method == 'GET':
+        subunits = get_refdata().subunits
+        return render_template('roster/template_form.html', subunits=subunits, template=None)
+    
+    try:
+        name = request.form.get('name', '').strip()
+        description = request.form.get('description', '').strip()
+        days = request.form.getlist('days')  # Array of selected days
+        start_date_str = request.form.get('start_date', '')
+        end_date_str = request.form.get('end_date', '')
+        start_time = request.form.get('start_time', '')
+        end_time = request.form.get('end_time', '')
+        subunit_ids = request.form.getlist('subunits')
+        roles = request.form.get('roles', '').split(',')
+        members_per_slot = int(request.form.get('members_per_slot', 1))
+        
+        if not name or not days:
+            return jsonify({'error': 'Missing required fields'}), 400
+        
+        # Parse dates
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else date.today()
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else None
+        
+        # Convert day strings to integers
+        days_int = [int(d) for d in days]
+        
+        template = RosterTemplate(
+            name=name,
+            description=description,
+            days_of_week=days_int,
+            start_date=start_date,
+            end_date=end_date,
+            start_time=start_time,
+            end_time=end_time,
+            subunits=[int(s) for s in subunit_ids if s],
+            roles=[r.strip() for r in roles if r.strip()],
+            members_per_slot=members_per_slot
+        )
+        
+        db.session.add(template)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'template_id': template.id})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(5)
+@admin_required
+def edit_template(template_id):
+    """Edit roster template"""
+    template = RosterTemplate.query.get_or_404(template_id)
+    
+    if request.method == 'GET':
+        subunits = get_refdata().subunits
+        return render_template('roster/template_form.html', 
+                             subunits=subunits, 
+                             template=template)
+    
+    try:
+        template.name = request.form.get('name', template.name).strip()
+        template.description = request.form.get('description', '').strip()
+        
+        days = request.form.getlist('days')
+        template.days_of_week = [int(d) for d in days]
+        
+        start_date_str = request.form.get('start_date', '')
+        if start_date_str:
+            template.start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+        
+        end_date_str = request.form.get('end_date', '')
+        template.end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else None
+        
+        template.start_time = request.form.get('start_time', '')
+        template.end_time = request.form.get('end_time', '')
+        
+        subunit_ids = request.form.getlist('subunits')
+        template.subunits = [int(s) for s in subunit_ids if s]
+        
+        roles = request.form.get('roles', '').split(',')
+        template.roles = [r.strip() for r in roles if r.strip()]
+        
+        template.members_per_slot = int(request.form.get('members_per_slot', 1))
+        
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Template updated'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(5)
+@admin_required
+def delete_template(template_id):
+    """Delete roster template"""
+    template = RosterTemplate.query.get_or_404(template_id)
+    
+    try:
+        db.session.delete(template)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Template deleted'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(7)
+@admin_required
+def generate_roster(template_id):
+    """Generate duty roster from template"""
+    template = RosterTemplate.query.get_or_404(template_id)
+    
+    if request.method == 'GET':
+        return render_template('roster/generate.html', template=template)
+    
+    try:
+        # Get parameters from form
+        start_date_str = request.form.get('start_date', '')
+        end_date_str = request.form.get('end_date', '')
+        
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else template.start_date
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else template.end_date
+        
+        # Get eligible members from subunits
+        # Convert subunit IDs from JSON (which might be strings) to integers
+        subunit_ids = [int(s) if isinstance(s, str) else s for s in template.subunits] if template.subunits else []
+        
+        eligible_members = Applicant.query.with_entities(Applicant.full_name, Applicant.assigned_subunit_id).filter(
+            Applicant.status.in_(['approved', 'completed']),
+            Applicant.assigned_subunit_id.in_(subunit_ids) if subunit_ids else False
+        ).order_by(Applicant.id).all()
+        
+        if not eligible_members:
+            return jsonify({'error': 'No eligible members found for selected subunits'}), 400
+        
+        refdata = get_refdata()
+        
+        # Generate rosters for each day in range
+        current_date = start_date
+        rows = []
+        member_index = 0
+        
+        while current_date <= (end_date or start_date + timedelta(days=365)):
+            # Check if this day of week should have a roster
+            if current_date.weekday() in template.days_of_week:
+                # Create roster entries for each role
+                for role in template.roles:
+                    for slot in range(template.members_per_slot):
+                        # Round-robin member assignment
+                        member = eligible_members[member_index % len(eligible_members)]
+                        member_index += 1
+                        
+                        subunit = refdata.subunit(member.assigned_subunit_id)
+                        subunit_name = subunit.name if subunit else 'Unknown'
+                        
+                        rows.append({
+                            'template_id': template.id,
+                            'duty_date': current_date,
+                            'start_time': template.start_time,
+                            'end_time': template.end_time,
+                            'assigned_to': member.full_name,
+                            'subunit': subunit_name,
+                            'role': role,
+                            'status': 'assigned'
+                        })
+            
+            current_date += timedelta(days=1)
+            
+            # Prevent infinite loop for ongoing rosters
+            if not end_date and (current_date - start_date).days > 365:
+                break
+        
+        # One batched INSERT for the whole run rather than one per slot
+        if rows:
+            db.session.execute(insert(DutyRoster), rows)
+        db.session.commit()
+        roster_count = len(rows)
+        record_roster_rows(roster_count)
+        
+        return jsonify({
+            'success': True,
+            'message': f'{roster_count} roster entries generated',
+            'count': roster_count
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(5)
+@cached_response('duty_rosters', 'subunits')
+def view_rosters():
+    """View duty rosters (public/member access)"""
+    page = request.args.get('page', 1, type=int)
+    date_filter = request.args.get('date', '')
+    subunit_filter = request.args.get('subunit', '')
+    
+    query = DutyRoster.query
+    
+    if date_filter:
+        filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
+        query = query.filter(DutyRoster.duty_date >= filter_date)
+    else:
+        # Default to upcoming rosters
+        query = query.filter(DutyRoster.duty_date >= date.today())
+    
+    if subunit_filter:
+        query = query.filter_by(subunit=subunit_filter)
+    
+    rosters = query.order_by(DutyRoster.duty_date, DutyRoster.start_time).paginate(page=page, per_page=20)
+    subunits = get_refdata().subunits
+    
+    return render_template('roster/view.html',
+                         rosters=rosters,
+                         subunits=subunits,
+                         date_filter=date_filter,
+                         subunit_filter=subunit_filter)
+
+
+@query_budget(4)
+def confirm_roster(roster_id):
+    """Member confirms their duty"""
+    roster = DutyRoster.query.get_or_404(roster_id)
+    
+    try:
+        roster.status = 'confirmed'
+        roster.confirmed_by = request.form.get('confirmed_by', 'member')
+        roster.confirmed_at = datetime.utcnow()
+        
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Duty confirmed'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(4)
+@admin_required
+def update_roster(roster_id):
+    """Update duty roster status"""
+    roster = DutyRoster.query.get_or_404(roster_id)
+    
+    try:
+        roster.status = request.form.get('status', roster.status)
+        roster.notes = request.form.get('notes', '')
+        
+        if request.form.get('assigned_to'):
+            roster.assigned_to = request.form.get('assigned_to')
+        
+        if request.form.get('role'):
+            roster.role = request.form.get('role')
+        
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Roster updated'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(4)
+@admin_required
+def delete_roster(roster_id):
+    """Delete duty roster entry"""
+    roster = DutyRoster.query.get_or_404(roster_id)
+    
+    try:
+        db.session.delete(roster)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Roster deleted'})
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@query_budget(5)
+@admin_required
+def export_roster(template_id):
+    """Export roster to CSV"""
+    import csv
+    from io import BytesIO, StringIO
+    
+    template = RosterTemplate.query.get_or_404(template_id)
+    rosters = DutyRoster.query.filter_by(template_id=template_id).order_by(
+        DutyRoster.duty_date,
+        DutyRoster.start_time
+    ).all()
+    
+    # Create CSV
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(['Date', 'Time', 'Member', 'Subunit', 'Role', 'Status'])
+    
+    for roster in rosters:
+        time_range = f"{roster.start_time}-{roster.end_time}" if roster.start_time else "TBA"
+        writer.writerow([
+            roster.duty_date.strftime('%Y-%m-%d'),
+            time_range,
+            roster.assigned_to,
+            roster.subunit,
+            roster.role,
+            roster.status
+        ])
+    
+    output.seek(0)
+    return send_file(
+        BytesIO(output.getvalue().encode('utf-8')),
+        mimetype='text/csv',
+        as_attachment=True,
+        download_name=f'roster_{template.name}.csv'
+    )
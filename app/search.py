@@ -0,0 +1,145 @@
+"""
+Applicant search index: FTS5 on SQLite, tsvector + trigram on PostgreSQL
+"""
+import difflib
+import re
+from sqlalchemy import Float, Integer, column, literal_column, or_, select, text
+from app.models import db, Applicant
+
+
+SEARCH_FIELDS = ['full_name', 'email', 'phone', 'occupation', 'professional_background']
+
+# Tokens shorter than this are only prefix matched, never fuzzy matched
+FUZZY_MIN_LENGTH = 4
+FUZZY_CUTOFF = 0.75
+FUZZY_MAX_EXPANSIONS = 3
+
+_columns = ', '.join(SEARCH_FIELDS)
+_new_values = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+_old_values = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS applicants_fts USING fts5(
+        {_columns}, content='applicants', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS applicants_fts_vocab USING fts5vocab(applicants_fts, 'row')",
+    f"""CREATE TRIGGER IF NOT EXISTS applicants_fts_ai AFTER INSERT ON applicants BEGIN
+        INSERT INTO applicants_fts(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS applicants_fts_ad AFTER DELETE ON applicants BEGIN
+        INSERT INTO applicants_fts(applicants_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS applicants_fts_au AFTER UPDATE OF {_columns} ON applicants BEGIN
+        INSERT INTO applicants_fts(applicants_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO applicants_fts(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+]
+
+# Must match the indexed expressions exactly for PostgreSQL to use the indexes
+PG_DOCUMENT = "lower(" + " || ' ' || ".join(f"coalesce({field}, '')" for field in SEARCH_FIELDS) + ")"
+PG_TSVECTOR = f"to_tsvector('simple', {PG_DOCUMENT})"
+
+POSTGRESQL_DDL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    f'CREATE INDEX IF NOT EXISTS ix_applicants_search_tsv ON applicants USING gin ({PG_TSVECTOR})',
+    f'CREATE INDEX IF NOT EXISTS ix_applicants_search_trgm ON applicants USING gin (({PG_DOCUMENT}) gin_trgm_ops)',
+]
+
+
+def install_search_index(connection):
+    """Create the search index and its sync triggers if they are missing"""
+    dialect = connection.dialect.name
+
+    if dialect == 'sqlite':
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'applicants_fts'"
+        )).first()
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text("INSERT INTO applicants_fts(applicants_fts) VALUES ('rebuild')"))
+
+    elif dialect == 'postgresql':
+        for statement in POSTGRESQL_DDL:
+            connection.execute(text(statement))
+
+
+def tokenize(q):
+    """Split a search string into lowercase word tokens"""
+    return re.findall(r'\w+', (q or '').lower())
+
+
+def _fuzzy_terms(token):
+    """Find indexed terms within a small edit distance of token"""
+    if len(token) < FUZZY_MIN_LENGTH:
+        return []
+
+    # Only compare against terms sharing the first two characters; fts5vocab serves this as a range scan
+    start = token[:2]
+    end = start[:-1] + chr(ord(start[-1]) + 1)
+    candidates = db.session.execute(
+        text('SELECT term FROM applicants_fts_vocab WHERE term >= :start AND term < :end'),
+        {'start': start, 'end': end}
+    ).scalars()
+    candidates = [term for term in candidates if abs(len(term) - len(token)) <= 2 and term != token]
+
+    return difflib.get_close_matches(token, candidates, n=FUZZY_MAX_EXPANSIONS, cutoff=FUZZY_CUTOFF)
+
+
+def _sqlite_match_expression(tokens, fuzzy):
+    """Build an FTS5 MATCH expression: every token as a prefix, OR'd with its fuzzy neighbours"""
+    groups = []
+    for token in tokens:
+        alternatives = [f'"{token}"*']
+        if fuzzy:
+            alternatives += [f'"{term}"' for term in _fuzzy_terms(token)]
+        groups.append(alternatives[0] if len(alternatives) == 1 else '(' + ' OR '.join(alternatives) + ')')
+    return ' AND '.join(groups)
+
+
+def _sqlite_matches(tokens, fuzzy):
+    match = _sqlite_match_expression(tokens, fuzzy)
+    return (
+        text('SELECT rowid AS id, bm25(applicants_fts) AS rank FROM applicants_fts WHERE applicants_fts MATCH :match')
+        .bindparams(match=match)
+        .columns(column('id', Integer), column('rank', Float))
+        .subquery('search_matches')
+    )
+
+
+def _postgresql_matches(q, tokens, fuzzy):
+    document = literal_column(PG_DOCUMENT)
+    tsvector = literal_column(PG_TSVECTOR)
+    tsquery = db.func.to_tsquery('simple', ' & '.join(f'{token}:*' for token in tokens))
+
+    conditions = [tsvector.op('@@')(tsquery)]
+    if fuzzy:
+        conditions.append(db.literal(q.lower()).op('<%')(document))
+
+    rank = -(db.func.ts_rank(tsvector, tsquery) + db.func.word_similarity(q.lower(), document))
+    return (
+        select(Applicant.id.label('id'), rank.label('rank'))
+        .where(or_(*conditions))
+        .subquery('search_matches')
+    )
+
+
+def search_applicants(query, q, fuzzy=True):
+    """Restrict an Applicant query to matches for q, best matches first"""
+    tokens = tokenize(q)
+    if not tokens:
+        return query
+
+    dialect = db.session.get_bind(Applicant).dialect.name
+
+    if dialect == 'sqlite':
+        matches = _sqlite_matches(tokens, fuzzy)
+    elif dialect == 'postgresql':
+        matches = _postgresql_matches(q, tokens, fuzzy)
+    else:
+        for token in tokens:
+            pattern = f'%{token}%'
+            query = query.filter(or_(*[getattr(Applicant, field).ilike(pattern) for field in SEARCH_FIELDS]))
+        return query.order_by(Applicant.created_at.desc())
+
+    return query.join(matches, Applicant.id == matches.c.id).order_by(matches.c.rank, Applicant.id.desc())
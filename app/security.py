@@ -0,0 +1,92 @@
+"""
+Password hashing service: configurable cost, bounded executor, rehash-on-login
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+# Werkzeug shorthands and the parameters they expand to
+METHOD_DEFAULTS = {
+    'pbkdf2': 'pbkdf2:sha256:600000',
+    'scrypt': 'scrypt:32768:8:1',
+}
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+# Configured method -> the method prefix Werkzeug writes into hashes made with it
+_stored_prefixes = {}
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing executor has no free slot within the timeout"""
+
+
+def _hash_method():
+    """Return the fully specified hashing method from configuration"""
+    method = current_app.config.get('PASSWORD_HASH_METHOD', 'pbkdf2')
+    return METHOD_DEFAULTS.get(method, method)
+
+
+def _run_bounded(func, *args, **kwargs):
+    """Run CPU-bound hashing on the bounded executor and wait for the result"""
+    global _executor, _slots
+    config = current_app.config
+    workers = config.get('PASSWORD_HASH_WORKERS', 0)
+
+    if workers <= 0:
+        return func(*args, **kwargs)
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            _slots = threading.BoundedSemaphore(workers + config.get('PASSWORD_HASH_QUEUE', 0))
+
+    timeout = config.get('PASSWORD_HASH_TIMEOUT', 10)
+    if not _slots.acquire(timeout=timeout):
+        raise PasswordHashingBusy('Password hashing queue is full')
+
+    try:
+        future = _executor.submit(func, *args, **kwargs)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future.result()
+
+
+def hash_password(password):
+    """Hash a password with the configured algorithm and cost"""
+    return _run_bounded(generate_password_hash, password, method=_hash_method())
+
+
+def _stored_prefix(method):
+    """Method prefix of hashes made with method, with every parameter Werkzeug fills in (e.g. 'scrypt:16384:8:1')"""
+    prefix = _stored_prefixes.get(method)
+    if prefix is None:
+        # Werkzeug owns the defaults, so read them off one hash instead of duplicating them
+        prefix = _run_bounded(generate_password_hash, '', method=method).split('$', 1)[0]
+        _stored_prefixes[method] = prefix
+    return prefix
+
+
+def needs_rehash(password_hash):
+    """Check whether a stored hash was made with different parameters"""
+    return password_hash.split('$', 1)[0] != _stored_prefix(_hash_method())
+
+
+def verify_password(password_hash, password):
+    """Check a password; returns (valid, new_hash) where new_hash is set if an upgrade is due"""
+    if not password_hash or not password:
+        return False, None
+
+    if not _run_bounded(check_password_hash, password_hash, password):
+        return False, None
+
+    if needs_rehash(password_hash):
+        return True, hash_password(password)
+
+    return True, None
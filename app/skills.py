@@ -0,0 +1,74 @@
+"""
+Skill assessment persistence: single-statement bulk upserts
+"""
+from sqlalchemy import inspect, select, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models import db, SkillAssessment
+
+
+SKILL_UNIQUE_INDEX = 'uq_skill_assessment_applicant_skill'
+
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def upsert_skill_ratings(applicant_id, ratings, self_assessed=True):
+    """Insert or update an applicant's {skill_name: rating} in one round trip"""
+    if not ratings:
+        return 0
+
+    rows = [
+        {'applicant_id': applicant_id, 'skill_name': skill_name, 'rating': rating, 'self_assessed': self_assessed}
+        for skill_name, rating in ratings.items()
+    ]
+
+    dialect = db.session.get_bind(SkillAssessment).dialect.name
+    insert_fn = _UPSERT_INSERTS.get(dialect)
+
+    if insert_fn is None:
+        _upsert_generic(rows)
+        return len(rows)
+
+    stmt = insert_fn(SkillAssessment.__table__).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['applicant_id', 'skill_name'],
+        set_={'rating': stmt.excluded.rating}
+    )
+    db.session.execute(stmt)
+    return len(rows)
+
+
+def _upsert_generic(rows):
+    """Fallback for dialects without ON CONFLICT: one lookup, then bulk insert/update"""
+    keys = [(row['applicant_id'], row['skill_name']) for row in rows]
+    existing = dict(db.session.execute(
+        select(tuple_(SkillAssessment.applicant_id, SkillAssessment.skill_name), SkillAssessment.id)
+        .where(tuple_(SkillAssessment.applicant_id, SkillAssessment.skill_name).in_(keys))
+    ).all())
+
+    updates = [{'id': existing[key], 'rating': row['rating']} for key, row in zip(keys, rows) if key in existing]
+    inserts = [row for key, row in zip(keys, rows) if key not in existing]
+
+    if updates:
+        db.session.bulk_update_mappings(SkillAssessment, updates)
+    if inserts:
+        db.session.bulk_insert_mappings(SkillAssessment, inserts)
+
+
+def ensure_skill_unique_index(connection):
+    """Add the (applicant_id, skill_name) unique index to databases created before it existed"""
+    indexes = inspect(connection).get_indexes(SkillAssessment.__tablename__)
+    if any(index['name'] == SKILL_UNIQUE_INDEX for index in indexes):
+        return False
+
+    # Keep the newest rating where duplicates accumulated
+    connection.execute(text(
+        'DELETE FROM skill_assessments WHERE id NOT IN '
+        '(SELECT MAX(id) FROM skill_assessments GROUP BY applicant_id, skill_name)'
+    ))
+    connection.execute(text(
+        f'CREATE UNIQUE INDEX {SKILL_UNIQUE_INDEX} ON skill_assessments (applicant_id, skill_name)'
+    ))
+    return True
@@ -0,0 +1,96 @@
+"""
+High-concurrency SQLite: WAL pragmas and read/write connection routing
+
+Under the ``sqlite`` pool profile the default engine is the writer: every
+transaction on it starts with BEGIN IMMEDIATE, so concurrent writers queue on
+busy_timeout instead of failing with "database is locked" when a read
+transaction tries to upgrade. A second, query-only engine (the ``reader``
+bind) serves plain SELECTs, which in WAL mode never block on the writer.
+"""
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+READER_BIND = 'reader'
+
+
+def wal_enabled(config):
+    """True when the sqlite profile is selected for a file-backed database"""
+    if config.get('DB_POOL_PROFILE') != 'sqlite':
+        return False
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def _pragmas(config):
+    return [
+        'PRAGMA journal_mode=WAL',
+        f"PRAGMA busy_timeout={int(config.get('SQLITE_BUSY_TIMEOUT', 5000))}",
+        'PRAGMA synchronous=NORMAL',
+        f"PRAGMA mmap_size={int(config.get('SQLITE_MMAP_SIZE', 268435456))}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size=-{int(config.get('SQLITE_CACHE_SIZE', 16384))}",
+    ]
+
+
+def reader_bind(config):
+    """SQLALCHEMY_BINDS entry for the query-only reader engine"""
+    # Binds don't inherit SQLALCHEMY_ENGINE_OPTIONS; only the pool size differs from the writer
+    return {**config['SQLALCHEMY_ENGINE_OPTIONS'],
+            'url': config['SQLALCHEMY_DATABASE_URI'],
+            'pool_size': config.get('DB_POOL_SIZE', 5)}
+
+
+def install_pragmas(app, db):
+    """Tune connections of the writer and reader engines as they are opened"""
+    pragmas = _pragmas(app.config)
+    writer = db.engines[None]
+    reader = db.engines.get(READER_BIND)
+
+    @event.listens_for(writer, 'connect')
+    def _configure_writer(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself (below) instead of pysqlite's deferred BEGIN
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(writer, 'begin')
+    def _begin_immediate(connection):
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    if reader is not None:
+        @event.listens_for(reader, 'connect')
+        def _configure_reader(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.execute('PRAGMA query_only=ON')
+            cursor.close()
+
+
+class RoutingSession(Session):
+    """Session that sends SELECTs to the reader bind until the transaction writes"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self.info.get('writer_bound'):
+            if clause is not None and clause.is_dml:
+                # Later reads in this transaction must see the write
+                self.info['writer_bound'] = True
+            else:
+                reader = self._db.engines.get(READER_BIND)
+                if reader is not None:
+                    return reader
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _bind_writer_for_flush(session, flush_context, instances):
+    session.info['writer_bound'] = True
+
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('writer_bound', None)
@@ -0,0 +1,82 @@
+"""
+Cached applicant, media and report counts shared by the dashboards and count APIs
+"""
+import threading
+import time
+from flask import current_app
+from sqlalchemy import select, func
+from app.events import on_commit
+from app.models import db, Applicant, Media, APPLICANT_STATUSES
+
+
+MEDIA_TYPES = ['photo', 'audio', 'graphics', 'video']
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _cached(key, compute):
+    """Return compute() from the cache, refreshing it once STATS_CACHE_TTL has passed"""
+    ttl = current_app.config.get('STATS_CACHE_TTL', 30)
+
+    entry = _cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None or time.monotonic() - entry[0] >= ttl:
+            entry = (time.monotonic(), compute())
+            _cache[key] = entry
+        return entry[1]
+
+
+def _count_applicants():
+    rows = db.session.execute(
+        select(Applicant.status, func.count(Applicant.id)).group_by(Applicant.status)
+    ).all()
+    stats = dict.fromkeys(APPLICANT_STATUSES, 0)
+    stats['total'] = 0
+    for status, count in rows:
+        if status in stats:
+            stats[status] = count
+        stats['total'] += count
+    return stats
+
+
+def _count_media():
+    rows = db.session.execute(
+        select(Media.media_type, func.count(Media.id)).group_by(Media.media_type)
+    ).all()
+    counts = dict.fromkeys(MEDIA_TYPES, 0)
+    for media_type, count in rows:
+        if media_type in counts:
+            counts[media_type] = count
+    return counts
+
+
+def applicant_stats():
+    """Applicant counts as {'total', 'pending', 'approved', 'rejected', 'completed'}"""
+    return dict(_cached('applicants', _count_applicants))
+
+
+def media_stats():
+    """Media counts per type"""
+    return dict(_cached('media', _count_media))
+
+
+def report_stats(report_type):
+    """Total and per-status counts of an admin report, as (total, {status: count})"""
+    from app.reports import report_summary
+    total, by_status = _cached(f'report:{report_type}', lambda: report_summary(report_type))
+    return total, dict(by_status)
+
+
+@on_commit('applicants', 'media', 'trial_phases')
+def invalidate_stats(changed_tables):
+    """Forget counts for the tables a commit wrote to"""
+    for table in changed_tables:
+        _cache.pop(table, None)
+    if changed_tables & {'applicants', 'trial_phases'}:
+        for key in [key for key in _cache if key.startswith('report:')]:
+            _cache.pop(key, None)
@@ -0,0 +1,186 @@
+"""
+Application submission helpers: upload staging and deferred file finalization
+"""
+import glob
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from flask import current_app
+from sqlalchemy import insert, update
+from werkzeug.utils import secure_filename
+from app.models import db, Applicant, Portfolio, ApplicantPicture
+from app.utils import allowed_file, get_file_type
+
+logger = logging.getLogger(__name__)
+
+
+def _staging_folder():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'staging')
+
+
+def parse_skill_ratings(form):
+    """Collect valid skill_* ratings (1-5) from a submitted form"""
+    ratings = {}
+    for key, value in form.items():
+        if key.startswith('skill_'):
+            try:
+                rating = int(value)
+            except (ValueError, TypeError):
+                continue
+            if 1 <= rating <= 5:
+                ratings[key.replace('skill_', '')] = rating
+    return ratings
+
+
+def stage_upload(file, kind, description=''):
+    """Stream an uploaded file into the staging folder and describe it"""
+    if not file or not file.filename or not allowed_file(file.filename):
+        return None
+
+    staging_folder = _staging_folder()
+    os.makedirs(staging_folder, exist_ok=True)
+
+    staged_path = os.path.join(staging_folder, f"{uuid.uuid4().hex}_{secure_filename(file.filename)}")
+    file.save(staged_path)
+
+    return {
+        'kind': kind,
+        'filename': file.filename,
+        'staged_path': staged_path,
+        'description': description,
+    }
+
+
+def stage_submission_files(files, form):
+    """Stage the profile picture, portfolio pictures and portfolio files of an application"""
+    staged = []
+
+    if 'profile_picture' in files:
+        staged.append(stage_upload(files['profile_picture'], 'profile', 'Profile picture'))
+
+    for file in files.getlist('portfolio_pictures'):
+        staged.append(stage_upload(file, 'portfolio_picture', 'Portfolio work sample'))
+
+    for file_key in files:
+        if file_key.startswith('portfolio_') and file_key != 'portfolio_pictures':
+            staged.append(stage_upload(files[file_key], 'portfolio', form.get(f'portfolio_desc_{file_key}', '')))
+
+    return [entry for entry in staged if entry]
+
+
+def discard_staged_files(staged):
+    """Remove staged uploads that will never be finalized"""
+    for entry in staged:
+        try:
+            os.remove(entry['staged_path'])
+        except OSError:
+            pass
+
+
+def finalize_submission_files(applicant_id, staged):
+    """Move staged uploads into place and record their picture/portfolio rows.
+
+    If that fails, the files go back to staging with a retry manifest, and
+    `flask --app app retry-uploads` finalizes (or discards) them later.
+    """
+    try:
+        return _finalize_or_restore(applicant_id, staged)
+    except Exception as e:
+        manifest = _write_retry_manifest(applicant_id, staged)
+        logger.error('Finalizing %d upload(s) for applicant %s failed (%s); kept for retry in %s',
+                     len(staged), applicant_id, e, manifest)
+        raise
+
+
+def _write_retry_manifest(applicant_id, staged):
+    path = os.path.join(_staging_folder(), f'retry-{applicant_id}-{uuid.uuid4().hex}.json')
+    with open(path, 'w') as handle:
+        json.dump({'applicant_id': applicant_id, 'staged': staged}, handle)
+    return path
+
+
+def retry_failed_uploads(discard=False):
+    """Finalize (or with discard, delete) the uploads of failed finalizations; returns (done, failed)"""
+    done = failed = 0
+    for path in sorted(glob.glob(os.path.join(_staging_folder(), 'retry-*.json'))):
+        with open(path) as handle:
+            manifest = json.load(handle)
+        staged = [entry for entry in manifest['staged'] if os.path.exists(entry['staged_path'])]
+        try:
+            if discard:
+                discard_staged_files(staged)
+            elif staged:
+                _finalize_or_restore(manifest['applicant_id'], staged)
+        except Exception as e:
+            logger.error('Retrying uploads for applicant %s failed: %s', manifest['applicant_id'], e)
+            failed += 1
+            continue
+        os.remove(path)
+        done += 1
+    return done, failed
+
+
+def _finalize_or_restore(applicant_id, staged):
+    """Finalize, or put every file back in staging if any step fails"""
+    moved = []
+    try:
+        return _finalize(applicant_id, staged, moved)
+    except Exception:
+        db.session.rollback()
+        for entry, filepath in moved:
+            if os.path.exists(filepath):
+                shutil.move(filepath, entry['staged_path'])
+        raise
+
+
+def _finalize(applicant_id, staged, moved):
+    upload_root = current_app.config['UPLOAD_FOLDER']
+    pictures = []
+    portfolios = []
+    profile_path = None
+
+    for entry in staged:
+        folder = 'portfolio' if entry['kind'] == 'portfolio' else 'pictures'
+        target_folder = os.path.join(upload_root, folder)
+        os.makedirs(target_folder, exist_ok=True)
+
+        filepath = os.path.join(target_folder, f"{int(time.time())}_{os.path.basename(entry['staged_path'])}")
+        shutil.move(entry['staged_path'], filepath)
+        moved.append((entry, filepath))
+        file_size = os.path.getsize(filepath)
+
+        if entry['kind'] == 'portfolio':
+            portfolios.append({
+                'applicant_id': applicant_id,
+                'filename': entry['filename'],
+                'file_type': get_file_type(entry['filename']),
+                'file_path': filepath,
+                'file_size': file_size,
+                'description': entry['description'],
+            })
+        else:
+            pictures.append({
+                'applicant_id': applicant_id,
+                'filename': entry['filename'],
+                'file_path': filepath,
+                'file_size': file_size,
+                'picture_type': 'profile' if entry['kind'] == 'profile' else 'portfolio',
+                'description': entry['description'],
+            })
+            if entry['kind'] == 'profile':
+                profile_path = filepath
+
+    if pictures:
+        db.session.execute(insert(ApplicantPicture), pictures)
+    if portfolios:
+        db.session.execute(insert(Portfolio), portfolios)
+    if profile_path:
+        db.session.execute(
+            update(Applicant).where(Applicant.id == applicant_id).values(profile_picture=profile_path)
+        )
+
+    db.session.commit()
+    return len(pictures) + len(portfolios)
@@ -0,0 +1,400 @@
+"""
+Seeded synthetic dataset for capacity testing, appended with batched Core inserts
+"""
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, insert, select
+from app.events import notify_changed
+from app.models import (db, User, Subunit, Applicant, ApplicantAccount, SkillAssessment, TrialPhase,
+                        Media, Event, Announcement, RosterTemplate, DutyRoster, TRIAL_PHASES)
+from app.security import hash_password
+
+# The unit's standing subunits (as in init_db.py); created when missing
+SUBUNITS = [
+    ('Display Team', 'Manage live displays and visual presentations',
+     ['PowerPoint', 'ProPresenter', 'Video', 'Graphics', 'Leadership', 'Team Management']),
+    ('Photography & Post-Processing', 'Capture and edit photos from events',
+     ['Photography', 'Photoshop', 'Lightroom', 'Composition', 'Leadership', 'Team Management']),
+    ('Audio - Live Mix & Stage', 'Manage live audio mixing',
+     ['Mixing Console', 'Audio Equipment', 'Sound Design', 'Leadership', 'Team Management']),
+    ('Audio Recording & Archiving', 'Record and archive audio files',
+     ['Recording Equipment', 'Audio Editing', 'File Management', 'Leadership', 'Team Management']),
+    ('Graphics Design', 'Create graphics and designs',
+     ['Design Litatracy', 'Design Software', 'Illustration', 'Leadership', 'Team Management']),
+    ('Content & Publicity', 'Develop content strategy, social media, and publicity',
+     ['Social Media', 'Content Writing', 'Marketing', 'Photography', 'Content Creation', 'Leadership',
+      'Team Management']),
+]
+
+# Roster templates created when there are none: (name, days_of_week, start, end, roles)
+TEMPLATES = [
+    ('Sunday Service', [6], '08:00', '12:30', ['Operator', 'Assistant', 'Lead']),
+    ('Midweek Service', [2], '18:00', '20:30', ['Operator', 'Assistant']),
+    ('Saturday Rehearsal', [5], '15:00', '18:00', ['Operator']),
+]
+# Share of duties per template, in TEMPLATES order
+TEMPLATE_WEIGHTS = [60, 25, 15]
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Grace', 'David', 'Sarah', 'Michael', 'Esther', 'Daniel', 'Ruth',
+               'Samuel', 'Deborah', 'Joseph', 'Hannah', 'Peter', 'Rachel', 'Paul', 'Joy', 'Emmanuel', 'Faith',
+               'Victor', 'Blessing', 'Andrew', 'Emily', 'Chinedu', 'Ngozi', 'Tunde', 'Amaka', 'Kwame', 'Ama']
+LAST_NAMES = ['Smith', 'Johnson', 'Okafor', 'Adeyemi', 'Mensah', 'Williams', 'Brown', 'Davis', 'Chen',
+              'Martinez', 'Wilson', 'Eze', 'Balogun', 'Owusu', 'Taylor', 'Thomas', 'Moore', 'Nwosu',
+              'Anderson', 'Jackson', 'White', 'Harris', 'Clark', 'Lewis', 'Okoro', 'Boateng']
+OCCUPATIONS = ['Student', 'Software Developer', 'Teacher', 'Photographer', 'Accountant', 'Nurse',
+               'Sound Engineer', 'Graphic Designer', 'Civil Engineer', 'Marketing Executive', 'Self-employed']
+AVAILABILITY = ['Sundays', 'Weekends', 'Sundays and Wednesday evenings', 'Flexible', 'Saturdays and Sundays',
+                'Alternate Sundays']
+ROLES = ['Camera Operator', 'Projection', 'Social Media Assistant', 'Archivist', 'Stage Hand']
+EVENT_NAMES = ['Sunday Service', 'Midweek Service', 'Youth Conference', 'Easter Service', 'Christmas Carol',
+               'Harvest Thanksgiving', 'Worship Night', 'Baptism Service', 'Outreach']
+EVENT_TYPES = {'service': 60, 'rehearsal': 25, 'training': 15}
+
+# Weights for categorical columns; recent applications are mostly still pending
+STATUS_WEIGHTS = {'pending': 40, 'approved': 35, 'rejected': 15, 'completed': 10}
+RECENT_STATUS_WEIGHTS = {'pending': 80, 'approved': 10, 'rejected': 5, 'completed': 5}
+RECENT_DAYS = 30
+RATING_WEIGHTS = {1: 5, 2: 15, 3: 35, 4: 30, 5: 15}
+MEDIA_TYPES = {'photo': 55, 'audio': 20, 'video': 15, 'graphics': 10}
+MEDIA_EXTENSIONS = {'photo': 'jpg', 'audio': 'mp3', 'video': 'mp4', 'graphics': 'png'}
+# Subunit names (substring match) most media of a type comes from
+MEDIA_SUBUNITS = {'photo': 'Photography', 'audio': 'Audio', 'video': 'Display', 'graphics': 'Graphics'}
+PRIORITY_WEIGHTS = {'normal': 70, 'high': 15, 'low': 15}
+
+# Duty dates span this many days either side of the as-of date
+ROSTER_PAST_DAYS = 365
+ROSTER_FUTURE_DAYS = 90
+
+
+class GenerateStats:
+    """Rows written per table for a generation run"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = {}
+
+    def add(self, table, count):
+        self.rows[table] = self.rows.get(table, 0) + count
+
+    @property
+    def total(self):
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.perf_counter() - self.started
+        return self.total / elapsed if elapsed else 0.0
+
+
+def _pick(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _name(rng):
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+
+def _batches(rows, size):
+    """Group a row iterator into lists of at most size"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _ensure_reference(as_of):
+    """Subunits and roster templates the generated rows point at, created through the session if missing"""
+    existing = {subunit.name for subunit in Subunit.query.all()}
+    db.session.add_all([Subunit(name=name, description=description, skills=skills)
+                        for name, description, skills in SUBUNITS if name not in existing])
+    db.session.flush()
+
+    subunits = Subunit.query.order_by(Subunit.id).all()
+    if not RosterTemplate.query.first():
+        ids = [subunit.id for subunit in subunits]
+        db.session.add_all([
+            RosterTemplate(name=name, days_of_week=days, start_date=as_of - timedelta(days=ROSTER_PAST_DAYS),
+                           start_time=start, end_time=end, subunits=ids, roles=roles)
+            for name, days, start, end, roles in TEMPLATES
+        ])
+    db.session.commit()
+
+    templates = RosterTemplate.query.order_by(RosterTemplate.id).all()
+    mentors = list(db.session.execute(select(User.id)).scalars())
+    return subunits, templates, mentors
+
+
+def _phase_rows(rng, applicant_id, status, created_at):
+    """Trial phases consistent with the applicant's status"""
+    if status == 'completed':
+        statuses = ['completed'] * len(TRIAL_PHASES)
+    elif status == 'approved':
+        statuses = [rng.choices(['pass', 'completed'], [85, 15])[0] for _ in TRIAL_PHASES]
+    elif status == 'rejected':
+        failed = rng.randrange(len(TRIAL_PHASES))
+        statuses = ['pass'] * failed + ['fail'] + ['pending'] * (len(TRIAL_PHASES) - failed - 1)
+    else:
+        reached = rng.choices(range(len(TRIAL_PHASES)), [60, 30, 10])[0]
+        statuses = ['pass'] * reached + ['pending'] * (len(TRIAL_PHASES) - reached)
+
+    rows = []
+    for step, (phase, phase_status) in enumerate(zip(TRIAL_PHASES, statuses), start=1):
+        done = phase_status != 'pending'
+        score = None
+        if done:
+            score = max(0, min(100, int(rng.gauss(45 if phase_status == 'fail' else 78, 10))))
+        completed = created_at + timedelta(days=step * rng.randint(3, 14)) if done else None
+        rows.append({'applicant_id': applicant_id, 'phase_type': phase, 'status': phase_status, 'score': score,
+                     'completed_date': completed, 'created_at': created_at, 'updated_at': completed or created_at})
+    return rows
+
+
+def generate_applicants(count, skill_assessments, rng, now, subunits, mentors, password_hash,
+                        history_days, batch_size, stats, names, on_progress=None):
+    """Applicants with accounts, trial phases and skill_assessments skill ratings spread across them"""
+    table = Applicant.__table__
+    skill_pool = list(dict.fromkeys(skill for subunit in subunits for skill in subunit.skills or []))
+    skill_budget = skill_assessments
+
+    with db.engine.connect() as connection:
+        offset = connection.execute(select(func.coalesce(func.max(Applicant.id), 0))).scalar()
+
+    def applicant_rows():
+        for n in range(offset + 1, offset + count + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            days_ago = history_days * rng.random() ** 2
+            created_at = now - timedelta(days=days_ago, seconds=rng.randrange(86400))
+            status = _pick(rng, RECENT_STATUS_WEIGHTS if days_ago < RECENT_DAYS else STATUS_WEIGHTS)
+            interest = rng.choice(subunits)
+            placed = status in ('approved', 'completed')
+            if placed:
+                subunit = interest if rng.random() < 0.8 else rng.choice(subunits)
+            yield {
+                'full_name': f'{first} {last}',
+                'email': f'{first}.{last}.{n}@synthetic.example'.lower(),
+                'phone': f'555-{rng.randrange(10000000):07d}',
+                'date_of_birth': date(now.year - rng.randint(16, 55), rng.randint(1, 12), rng.randint(1, 28)),
+                'occupation': rng.choice(OCCUPATIONS),
+                'social_media': {'facebook': '', 'instagram': f'@{first.lower()}{n}'},
+                'professional_background': f'{rng.randint(0, 15)} years as {rng.choice(OCCUPATIONS).lower()}',
+                'availability': rng.choice(AVAILABILITY),
+                'primary_interest': interest.name,
+                'status': status,
+                'assigned_subunit_id': subunit.id if placed else None,
+                'assigned_role': rng.choice(ROLES) if placed and rng.random() < 0.2 else None,
+                'assigned_mentor_id': rng.choice(mentors) if placed and mentors else None,
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+
+    written = 0
+    for batch in _batches(applicant_rows(), batch_size):
+        with db.engine.begin() as connection:
+            ids = connection.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                                     batch).scalars().all()
+
+            skill_rows, phase_rows, account_rows = [], [], []
+            for applicant_id, row in zip(ids, batch):
+                remaining = count - written
+                written += 1
+                # Draw around the mean still owed, so the run lands on the requested total
+                wanted = skill_budget if remaining == 1 else round(rng.gauss(skill_budget / remaining, 1.5))
+                wanted = max(0, min(wanted, skill_budget, len(skill_pool)))
+                skill_budget -= wanted
+                interest = next(subunit for subunit in subunits if subunit.name == row['primary_interest'])
+                own = [skill for skill in interest.skills or [] if skill in skill_pool]
+                others = [skill for skill in skill_pool if skill not in own]
+                rng.shuffle(own)
+                rng.shuffle(others)
+                skill_rows += [{'applicant_id': applicant_id, 'skill_name': skill, 'self_assessed': True,
+                                'rating': _pick(rng, RATING_WEIGHTS)} for skill in (own + others)[:wanted]]
+
+                phase_rows += _phase_rows(rng, applicant_id, row['status'], row['created_at'])
+                account_rows.append({'applicant_id': applicant_id, 'password': password_hash, 'is_active': True,
+                                     'created_at': row['created_at'], 'updated_at': row['created_at']})
+                if row['status'] in ('approved', 'completed') and len(names) < 5000:
+                    names.append(row['full_name'])
+
+            if skill_rows:
+                connection.execute(insert(SkillAssessment.__table__), skill_rows)
+            connection.execute(insert(TrialPhase.__table__), phase_rows)
+            connection.execute(insert(ApplicantAccount.__table__), account_rows)
+
+        stats.add('applicants', len(batch))
+        stats.add('skill_assessments', len(skill_rows))
+        stats.add('trial_phases', len(phase_rows))
+        stats.add('applicant_accounts', len(account_rows))
+        if on_progress:
+            on_progress(stats)
+
+
+def write_media_files(rng, folder, pool, file_size):
+    """pool dummy files per media type, sizes scattered around file_size; {type: [(path, size)]}"""
+    os.makedirs(folder, exist_ok=True)
+    files = {}
+    for media_type, extension in MEDIA_EXTENSIONS.items():
+        files[media_type] = []
+        for n in range(pool):
+            path = os.path.join(folder, f'{media_type}-{n:04d}.{extension}')
+            size = max(1024, int(rng.lognormvariate(0, 0.5) * file_size))
+            if not os.path.exists(path) or os.path.getsize(path) != size:
+                with open(path, 'wb') as f:
+                    f.write(random.Random(f'{media_type}-{n}').randbytes(size))
+            files[media_type].append((path, size))
+    return files
+
+
+def generate_media(count, rng, now, subunits, files, history_days, batch_size, stats, on_progress=None):
+    """Media rows pointing at the dummy files, mostly photos from the matching subunit"""
+    home = {media_type: [subunit for subunit in subunits if keyword in subunit.name] or subunits
+            for media_type, keyword in MEDIA_SUBUNITS.items()}
+
+    def media_rows():
+        for n in range(count):
+            media_type = _pick(rng, MEDIA_TYPES)
+            subunit = rng.choice(home[media_type] if rng.random() < 0.85 else subunits)
+            uploaded_at = now - timedelta(days=history_days * rng.random() ** 2, seconds=rng.randrange(86400))
+            path, size = rng.choice(files[media_type])
+            event_name = rng.choice(EVENT_NAMES)
+            yield {
+                'title': f'{event_name} {media_type} {n + 1}',
+                'description': None,
+                'media_type': media_type,
+                'subunit_id': subunit.id,
+                'event_name': event_name,
+                'event_date': (uploaded_at - timedelta(days=rng.randint(0, 6))).date(),
+                'filename': os.path.basename(path),
+                'file_path': path,
+                'file_size': size,
+                'uploaded_by': rng.choice(['admin', 'moderator', _name(rng)]),
+                'uploaded_at': uploaded_at,
+            }
+
+    for batch in _batches(media_rows(), batch_size):
+        with db.engine.begin() as connection:
+            connection.execute(insert(Media.__table__), batch)
+        stats.add('media', len(batch))
+        if on_progress:
+            on_progress(stats)
+
+
+def generate_rosters(count, rng, as_of, subunits, templates, names, batch_size, stats, on_progress=None):
+    """Duties on each template's weekdays (weekends dominate); past duties are mostly completed"""
+    subunit_names = {subunit.id: subunit.name for subunit in subunits}
+    weights = [TEMPLATE_WEIGHTS[n] if n < len(TEMPLATE_WEIGHTS) else 10 for n in range(len(templates))]
+    span = ROSTER_PAST_DAYS + ROSTER_FUTURE_DAYS
+    first_day = as_of - timedelta(days=ROSTER_PAST_DAYS)
+
+    def roster_rows():
+        for _ in range(count):
+            template = rng.choices(templates, weights)[0]
+            day = first_day + timedelta(days=rng.randrange(span))
+            weekdays = template.days_of_week or [6]
+            # Move forward to the template's next service day
+            day += timedelta(days=min((weekday - day.weekday()) % 7 for weekday in weekdays))
+            past = day < as_of
+            status = rng.choices(['completed', 'confirmed', 'assigned', 'cancelled'],
+                                 [70, 15, 10, 5] if past else [0, 25, 70, 5])[0]
+            member = rng.choice(names) if names else _name(rng)
+            confirmed = status in ('confirmed', 'completed')
+            created_at = datetime.combine(day - timedelta(days=rng.randint(7, 28)), datetime.min.time())
+            yield {
+                'template_id': template.id,
+                'duty_date': day,
+                'start_time': template.start_time,
+                'end_time': template.end_time,
+                'assigned_to': member,
+                'subunit': subunit_names.get(rng.choice(template.subunits or [None])) or rng.choice(subunits).name,
+                'role': rng.choice(template.roles or ['Operator']),
+                'status': status,
+                'confirmed_by': member if confirmed else None,
+                'confirmed_at': created_at + timedelta(days=rng.randint(1, 6)) if confirmed else None,
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+
+    for batch in _batches(roster_rows(), batch_size):
+        with db.engine.begin() as connection:
+            connection.execute(insert(DutyRoster.__table__), batch)
+        stats.add('duty_rosters', len(batch))
+        if on_progress:
+            on_progress(stats)
+
+
+def generate_notices(announcements, events, rng, now, history_days, stats):
+    """Announcements (a few still live) and events around the as-of date"""
+    announcement_rows = []
+    for n in range(announcements):
+        created_at = now - timedelta(days=history_days * rng.random() ** 2)
+        expires = rng.random() < 0.7
+        announcement_rows.append({
+            'title': f'{rng.choice(EVENT_NAMES)} notice {n + 1}',
+            'content': f'Media unit members on duty for {rng.choice(EVENT_NAMES).lower()} should arrive early.',
+            'author': 'admin',
+            'priority': _pick(rng, PRIORITY_WEIGHTS),
+            'created_at': created_at,
+            'expires_at': created_at + timedelta(days=rng.randint(3, 60)) if expires else None,
+        })
+
+    event_rows = []
+    for n in range(events):
+        start = now + timedelta(days=rng.randint(-history_days, 90), hours=rng.randint(-4, 8))
+        event_rows.append({
+            'title': rng.choice(EVENT_NAMES),
+            'description': None,
+            'event_type': _pick(rng, EVENT_TYPES),
+            'start_date': start,
+            'end_date': start + timedelta(hours=rng.randint(1, 4)),
+            'location': rng.choice(['Main Sanctuary', 'Media Room', 'Youth Hall', 'Annex']),
+            'created_at': start - timedelta(days=rng.randint(7, 30)),
+        })
+
+    with db.engine.begin() as connection:
+        if announcement_rows:
+            connection.execute(insert(Announcement.__table__), announcement_rows)
+        if event_rows:
+            connection.execute(insert(Event.__table__), event_rows)
+    stats.add('announcements', len(announcement_rows))
+    stats.add('events', len(event_rows))
+
+
+def generate_dataset(applicants=0, skill_assessments=0, media=0, rosters=0, announcements=0, events=0,
+                     seed=42, batch_size=5000, as_of=None, history_days=730, password='member123',
+                     media_folder=None, file_pool=50, file_size=64 * 1024, on_progress=None):
+    """Append a synthetic dataset that the same seed reproduces on the same starting database; returns GenerateStats"""
+    stats = GenerateStats()
+    as_of = as_of or date.today()
+    now = datetime.combine(as_of, datetime.min.time()) + timedelta(hours=12)
+    media_folder = media_folder or os.path.join(current_app.config['UPLOAD_FOLDER'], 'media', 'synthetic')
+
+    # One random stream per table, so changing one volume leaves the other tables' rows as they were
+    def rng(stage):
+        return random.Random(f'{seed}:{stage}')
+
+    subunits, templates, mentors = _ensure_reference(as_of)
+    names = []
+
+    if applicants:
+        generate_applicants(applicants, skill_assessments, rng('applicants'), now, subunits, mentors,
+                            hash_password(password), history_days, batch_size, stats, names, on_progress)
+    if media:
+        files = write_media_files(rng('files'), media_folder, file_pool, file_size)
+        generate_media(media, rng('media'), now, subunits, files, history_days, batch_size, stats, on_progress)
+    if rosters:
+        # Duties go to placed members; without new applicants, use the ones already there
+        names = names or list(db.session.execute(
+            select(Applicant.full_name).where(Applicant.status.in_(['approved', 'completed'])).limit(5000)
+        ).scalars())
+        generate_rosters(rosters, rng('rosters'), as_of, subunits, templates, names, batch_size, stats, on_progress)
+    if announcements or events:
+        generate_notices(announcements, events, rng('notices'), now, history_days, stats)
+
+    notify_changed(*stats.rows)
+    return stats
@@ -0,0 +1,51 @@
+"""
+Background task execution for work deferred out of the request cycle
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from flask import current_app
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app):
+    """Create the shared task executor on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get('TASK_WORKERS', 2),
+                thread_name_prefix='media-unit-task'
+            )
+    return _executor
+
+
+def _run_task(app, func, args, kwargs):
+    """Run a task inside its own application context"""
+    with app.app_context():
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            db.session.rollback()
+            logger.exception('Background task %s failed', func.__name__)
+            raise
+
+
+def enqueue(func, *args, **kwargs):
+    """Schedule func to run after the current request; returns a Future"""
+    app = current_app._get_current_object()
+
+    if app.config.get('TASKS_EAGER'):
+        future = Future()
+        try:
+            future.set_result(_run_task(app, func, args, kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    return _get_executor(app).submit(_run_task, app, func, args, kwargs)
@@ -5,7 +5,7 @@ import os
 from werkzeug.utils import secure_filename
 from functools import wraps
 from flask import session, redirect, url_for, abort
-from app.models import User
+from app.principals import current_admin, current_applicant
 
 
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png', 'gif', 'mp3', 'wav', 'm4a', 'zip'}
@@ -53,14 +53,29 @@ def admin_required(f):
         if 'user_id' not in session:
             return redirect(url_for('auth.login'))
         
-        user = User.query.get(session['user_id'])
-        if not user or user.role != 'admin':
+        admin = current_admin()
+        if not admin or admin.role != 'admin':
             abort(403)
         
         return f(*args, **kwargs)
     return decorated_function
 
 
+def applicant_required(f):
+    """Decorator to require applicant login"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'applicant_id' not in session:
+            return redirect(url_for('auth.applicant_login'))
+        
+        if current_applicant() is None:
+            session.pop('applicant_id', None)
+            return redirect(url_for('auth.applicant_login'))
+        
+        return f(*args, **kwargs)
+    return decorated_function
+
+
 def get_file_type(filename):
     """Determine file type from extension"""
     ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
@@ -0,0 +1,13 @@
+"""
+Run the Flask application under an ASGI server, for deployments with many slow uploads or downloads
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 4
+"""
+import os
+from app import create_app
+from app.asgi import AsgiAdapter
+
+# Get environment
+env = os.environ.get('FLASK_ENV', 'development')
+
+app = AsgiAdapter(create_app(env))
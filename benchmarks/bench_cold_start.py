@@ -0,0 +1,81 @@
+"""
+Cold-start benchmark for the app.py entrypoint
+
+Starts a fresh interpreter per run, as a serverless cold start does, and
+times how long it takes until app.py has built the WSGI app:
+
+    python benchmarks/bench_cold_start.py --runs 20
+    python benchmarks/bench_cold_start.py --unversioned
+
+The database is migrated once up front, so the runs measure the boot path
+where the schema version already matches. With --unversioned the version
+row is removed before every run, which replays the migrations on each boot
+the way create_all-on-start used to do.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs inside the child interpreter; reports seconds spent importing and building app.py
+CHILD = '''
+import runpy, sys, time, json
+started = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name='app_entrypoint')
+print(json.dumps({'boot': time.perf_counter() - started}))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10, help='cold starts to time')
+    parser.add_argument('--env', default='production', help='FLASK_ENV for the timed runs')
+    parser.add_argument('--unversioned', action='store_true',
+                        help='drop the schema version before each run so every boot migrates')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='media-unit-bench-')
+    database = os.path.join(workdir, 'bench.db')
+    env = dict(os.environ,
+               DATABASE_URL=f'sqlite:///{database}',
+               UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+               FLASK_ENV=args.env,
+               SCHEMA_AUTO_UPGRADE='1' if args.unversioned else '0',
+               PYTHONPATH=str(ROOT))
+
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'db', 'upgrade'],
+                   cwd=ROOT, env=env, check=True, capture_output=True)
+
+    walls = []
+    boots = []
+    for _ in range(args.runs):
+        if args.unversioned:
+            import sqlite3
+            with sqlite3.connect(database) as connection:
+                connection.execute('DELETE FROM schema_version')
+
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', CHILD, str(ROOT / 'app.py')],
+                                cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+        walls.append(time.perf_counter() - started)
+        boots.append(json.loads(result.stdout.strip().splitlines()[-1])['boot'])
+
+    def describe(samples):
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return f'median {statistics.median(samples) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms'
+
+    print(f'{args.runs} cold starts ({"migrating every boot" if args.unversioned else "schema current"})')
+    print(f'  process start to app ready: {describe(walls)}')
+    print(f'  app.py import and create_app: {describe(boots)}')
+
+
+if __name__ == '__main__':
+    main()
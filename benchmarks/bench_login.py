@@ -0,0 +1,89 @@
+"""
+Login throughput benchmark (logins per second, per core)
+
+Seeds applicant accounts in a throwaway SQLite database and drives
+/applicant-login through the Flask test client from several threads:
+
+    python benchmarks/bench_login.py --threads 4 --count 50
+    python benchmarks/bench_login.py --method scrypt:16384:8:1 --stored-method pbkdf2:sha256:600000
+
+With --stored-method the seeded hashes use different parameters, so the
+first login of each account also exercises rehash-on-login.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--accounts', type=int, default=20, help='seeded applicant accounts')
+    parser.add_argument('--count', type=int, default=25, help='logins per thread')
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 1, help='concurrent login threads')
+    parser.add_argument('--workers', type=int, default=None, help='PASSWORD_HASH_WORKERS (0 = request thread)')
+    parser.add_argument('--method', default=None, help='PASSWORD_HASH_METHOD used by the app')
+    parser.add_argument('--stored-method', default=None, help='hash method for the seeded accounts')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='media-unit-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    if args.method:
+        os.environ['PASSWORD_HASH_METHOD'] = args.method
+    if args.workers is not None:
+        os.environ['PASSWORD_HASH_WORKERS'] = str(args.workers)
+
+    from werkzeug.security import generate_password_hash
+    from app import create_app
+    from app.models import db, Applicant, ApplicantAccount
+
+    app = create_app('development')
+    app.config['DEBUG'] = False
+    stored_method = args.stored_method or app.config['PASSWORD_HASH_METHOD']
+
+    with app.app_context():
+        password_hash = generate_password_hash('bench-password', method=stored_method)
+        for i in range(args.accounts):
+            applicant = Applicant(full_name=f'Bench {i}', email=f'login{i}@example.com',
+                                  primary_interest='Display Team')
+            db.session.add(applicant)
+            db.session.flush()
+            db.session.add(ApplicantAccount(applicant_id=applicant.id, password=password_hash))
+        db.session.commit()
+
+    failures = []
+
+    def worker(offset):
+        client = app.test_client()
+        for i in range(args.count):
+            email = f'login{(offset + i) % args.accounts}@example.com'
+            response = client.post('/applicant-login', data={'email': email, 'password': 'bench-password'})
+            if response.status_code != 302:
+                failures.append(response.status_code)
+
+    threads = [threading.Thread(target=worker, args=(t * args.count,)) for t in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = args.count * args.threads
+    workers = app.config['PASSWORD_HASH_WORKERS']
+    cores = max(1, min(args.threads, workers or 1, os.cpu_count() or 1))
+    print(f"{total} logins ({app.config['PASSWORD_HASH_METHOD']}, {workers} hash workers, "
+          f"{args.threads} threads) in {elapsed:.2f}s -> {total / elapsed:.1f} logins/s, "
+          f"{total / elapsed / cores:.1f} logins/s/core")
+    if failures:
+        print(f"{len(failures)} failed logins (status {failures[0]})")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
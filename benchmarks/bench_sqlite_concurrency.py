@@ -0,0 +1,131 @@
+"""
+SQLite write/read concurrency benchmark
+
+Starts several threaded worker processes against one SQLite file, the way
+gunicorn workers share media_unit.db, and has each thread confirm duties
+(POST /roster/<id>/confirm) and list rosters (GET /roster/view) for a fixed
+time. Reports writes/s, reads/s and "database is locked" failures per pool
+profile:
+
+    python benchmarks/bench_sqlite_concurrency.py
+    python benchmarks/bench_sqlite_concurrency.py --profile sqlite --workers 8 --seconds 20
+
+Each profile gets a fresh database, since WAL mode persists in the file.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def seed(database, rosters):
+    with sqlite3.connect(database) as connection:
+        connection.execute(
+            "INSERT INTO roster_templates (name, start_date, is_active) VALUES ('Bench', ?, 1)",
+            (date.today().isoformat(),))
+        template_id = connection.execute('SELECT max(id) FROM roster_templates').fetchone()[0]
+        connection.executemany(
+            'INSERT INTO duty_rosters (template_id, duty_date, start_time, end_time, assigned_to, subunit, role, status)'
+            " VALUES (?, ?, '09:00', '12:00', ?, 'Audio', 'Operator', 'assigned')",
+            [(template_id, (date.today() + timedelta(days=i % 60)).isoformat(), f'member{i}') for i in range(rosters)])
+
+
+def client_loop(app, seed_value, args, deadline, counts):
+    client = app.test_client()
+    rng = random.Random(seed_value)
+    while time.time() < deadline:
+        if rng.random() < args.write_ratio:
+            response = client.post(f'/roster/{rng.randint(1, args.rosters)}/confirm',
+                                   data={'confirmed_by': f'client{seed_value}'})
+            key = 'writes'
+        else:
+            response = client.get(f'/roster/view?page={rng.randint(1, 3)}')
+            key = 'reads'
+        if response.status_code == 200:
+            counts[key] += 1
+        elif b'locked' in response.data:
+            counts['locked'] += 1
+        else:
+            counts['errors'] += 1
+
+
+def worker(index, args, start, results):
+    from app import create_app
+    app = create_app('production')
+    per_thread = [{'writes': 0, 'reads': 0, 'locked': 0, 'errors': 0} for _ in range(args.threads)]
+
+    # Boot outside the measured window, then all workers start together
+    time.sleep(max(0.0, start - time.time()))
+    threads = [threading.Thread(target=client_loop,
+                                args=(app, index * args.threads + n, args, start + args.seconds, counts))
+               for n, counts in enumerate(per_thread)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results.put({key: sum(counts[key] for counts in per_thread) for key in per_thread[0]})
+
+
+def run_profile(profile, args):
+    workdir = tempfile.mkdtemp(prefix='media-unit-bench-')
+    database = os.path.join(workdir, 'bench.db')
+    os.environ.update(DATABASE_URL=f'sqlite:///{database}',
+                      UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+                      DB_POOL_PROFILE=profile,
+                      RESPONSE_CACHE_BACKEND='none',
+                      SCHEMA_AUTO_UPGRADE='0',
+                      FLASK_ENV='production')
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'db', 'upgrade'],
+                   cwd=ROOT, env=dict(os.environ, PYTHONPATH=str(ROOT)), check=True, capture_output=True)
+    seed(database, args.rosters)
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    start = time.time() + args.warmup
+    processes = [context.Process(target=worker, args=(i, args, start, results)) for i in range(args.workers)]
+    for process in processes:
+        process.start()
+    totals = {'writes': 0, 'reads': 0, 'locked': 0, 'errors': 0}
+    for _ in processes:
+        for key, value in results.get().items():
+            totals[key] += value
+    for process in processes:
+        process.join()
+
+    with sqlite3.connect(database) as connection:
+        journal = connection.execute('PRAGMA journal_mode').fetchone()[0]
+    print(f'{profile:8} journal={journal:7} writes/s {totals["writes"] / args.seconds:8.1f}  '
+          f'reads/s {totals["reads"] / args.seconds:8.1f}  locked {totals["locked"]:5}  other errors {totals["errors"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--profile', action='append', choices=['default', 'sqlite'],
+                        help='pool profile to run (repeatable; default: both)')
+    parser.add_argument('--workers', type=int, default=4, help='worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='request threads per worker')
+    parser.add_argument('--seconds', type=float, default=10, help='measured seconds per profile')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds allowed for workers to boot')
+    parser.add_argument('--write-ratio', type=float, default=0.3, help='share of requests that confirm a duty')
+    parser.add_argument('--rosters', type=int, default=500, help='duty roster rows to seed')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    print(f'{args.workers} workers x {args.threads} threads, {args.seconds:.0f}s, {args.write_ratio:.0%} writes')
+    for profile in args.profile or ['default', 'sqlite']:
+        run_profile(profile, args)
+
+
+if __name__ == '__main__':
+    main()
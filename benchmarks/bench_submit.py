@@ -0,0 +1,92 @@
+"""
+Load benchmark for application submissions (submissions per second)
+
+Drives the real WSGI app through the Flask test client against a throwaway
+SQLite database and upload folder. Compare the deferred file stage with the
+inline (eager) one:
+
+    python benchmarks/bench_submit.py --count 200 --files 3
+    python benchmarks/bench_submit.py --count 200 --files 3 --eager
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def build_form(index, files, file_size):
+    """Build one multipart application payload"""
+    form = {
+        'full_name': f'Bench Applicant {index}',
+        'email': f'bench{index}@example.com',
+        'phone': '555-0100',
+        'occupation': 'Engineer',
+        'professional_background': 'Benchmark submission',
+        'availability': 'Sundays',
+        'primary_interest': 'Display Team',
+        'password': 'bench-password',
+    }
+    for skill in ['PowerPoint', 'ProPresenter', 'Video', 'Graphics', 'Leadership']:
+        form[f'skill_{skill}'] = '4'
+
+    payload = b'x' * file_size
+    if files:
+        form['profile_picture'] = (io.BytesIO(payload), 'profile.jpg')
+    for n in range(1, files):
+        form[f'portfolio_{n}'] = (io.BytesIO(payload), f'sample{n}.pdf')
+    return form
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=100, help='submissions per thread')
+    parser.add_argument('--threads', type=int, default=1, help='concurrent submitting threads')
+    parser.add_argument('--files', type=int, default=3, help='files attached to each submission')
+    parser.add_argument('--file-size', type=int, default=256 * 1024, help='bytes per attached file')
+    parser.add_argument('--eager', action='store_true', help='finalize files inside the request')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='media-unit-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    os.environ['TASKS_EAGER'] = '1' if args.eager else '0'
+
+    from app import create_app
+    app = create_app('development')
+    app.config['DEBUG'] = False
+
+    errors = []
+
+    def worker(offset):
+        client = app.test_client()
+        for i in range(args.count):
+            response = client.post('/apply/submit', data=build_form(offset + i, args.files, args.file_size),
+                                   content_type='multipart/form-data')
+            if response.status_code != 200:
+                errors.append(response.get_json())
+
+    threads = [threading.Thread(target=worker, args=(t * args.count,)) for t in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = args.count * args.threads
+    mode = 'eager' if args.eager else 'deferred'
+    print(f"{total} submissions ({args.files} files x {args.file_size // 1024} KB, {mode}) "
+          f"in {elapsed:.2f}s -> {total / elapsed:.1f} submissions/s")
+    if errors:
+        print(f"{len(errors)} failed, first error: {errors[0]}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Import-time report and budget check (python -X importtime)
+
+Boots the app in a fresh interpreter, then serves one request per path in
+its own interpreter, and reports what each phase imported and how long it
+took:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --path /roster/view --top 30
+    python benchmarks/import_time.py --check
+
+With --check the phases are compared against benchmarks/import_budget.json
+(time limits and modules that must not load) and the exit status is 1 when
+any budget is exceeded, so CI can run it as is.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / 'import_budget.json'
+MARKER = '--- request ---'
+
+# Runs inside the child interpreter under -X importtime (which reports on stderr)
+CHILD = f'''
+import os, sys
+from app import create_app
+app = create_app(os.environ['FLASK_ENV'])
+client = app.test_client()
+print({MARKER!r}, file=sys.stderr, flush=True)
+if len(sys.argv) > 1:
+    client.get(sys.argv[1])
+'''
+
+
+def parse_importtime(text):
+    """[(module, self_us, cumulative_us)] in import order"""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_phase(env, path=None):
+    """Import rows for the boot phase and, when path is given, for its first request"""
+    command = [sys.executable, '-X', 'importtime', '-c', CHILD] + ([path] if path else [])
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode:
+        sys.exit(result.stderr)
+    boot, _, request = result.stderr.partition(MARKER)
+    return parse_importtime(boot), parse_importtime(request)
+
+
+def summarize(name, rows, top):
+    total_ms = sum(row[1] for row in rows) / 1000
+    print(f'{name}: {len(rows)} modules, {total_ms:.1f} ms')
+    for module, _, cumulative in sorted(rows, key=lambda row: -row[2])[:top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {module}')
+    return total_ms
+
+
+def violations(name, rows, total_ms, budget):
+    problems = []
+    if budget.get('max_ms') is not None and total_ms > budget['max_ms']:
+        problems.append(f'{name}: {total_ms:.1f} ms exceeds budget of {budget["max_ms"]} ms')
+    loaded = {row[0] for row in rows}
+    for forbidden in budget.get('forbid', []):
+        hits = sorted(module for module in loaded if module == forbidden or module.startswith(forbidden + '.'))
+        if hits:
+            problems.append(f'{name}: imports {", ".join(hits)}')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--path', action='append', help='request path to profile (repeatable)')
+    parser.add_argument('--top', type=int, default=15, help='slowest modules listed per phase')
+    parser.add_argument('--env', default='production', help='FLASK_ENV for the app')
+    parser.add_argument('--check', action='store_true', help='fail when a budget is exceeded')
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_FILE.read_text())
+    paths = args.path or list(budget['paths'])
+
+    workdir = tempfile.mkdtemp(prefix='media-unit-bench-')
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+               UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+               FLASK_ENV=args.env,
+               PYTHONPATH=str(ROOT))
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'db', 'upgrade'],
+                   cwd=ROOT, env=env, check=True, capture_output=True)
+
+    problems = []
+    boot_rows, _ = run_phase(env)
+    boot_ms = summarize('boot', boot_rows, args.top)
+    problems += violations('boot', boot_rows, boot_ms, budget['boot'])
+
+    for path in paths:
+        _, request_rows = run_phase(env, path)
+        print()
+        request_ms = summarize(f'first request to {path}', request_rows, args.top)
+        if path in budget['paths']:
+            problems += violations(path, request_rows, request_ms, budget['paths'][path])
+
+    if args.check:
+        print()
+        for problem in problems:
+            print(f'OVER BUDGET {problem}')
+        print('import budget ok' if not problems else f'{len(problems)} budget violation(s)')
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,458 @@
+"""
+Load test for the main pages and APIs against a synthetic dataset
+
+Generates a dataset with `app.synthetic` (or uses --database), then runs each
+scenario for a fixed time from several threads, either through the WSGI app
+in-process or over HTTP against a local gunicorn, and reports requests/s and
+p50/p95/p99 latency:
+
+    python benchmarks/load_test.py run
+    python benchmarks/load_test.py run --target gunicorn --workers 4 --applicants 50000
+    python benchmarks/load_test.py run --scenario media.library --scenario api --baseline benchmarks/results/old.json
+    python benchmarks/load_test.py compare benchmarks/results/old.json benchmarks/results/new.json
+
+Each run writes a JSON result (commit, settings, dataset and per-scenario
+numbers) to benchmarks/results/. `compare`, or `run --baseline`, exits with
+status 1 when a scenario's p95 or throughput is worse than the baseline by
+more than --threshold percent.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+ADMIN_USERNAME = 'loadtest'
+ADMIN_PASSWORD = 'loadtest-password'
+MEMBER_PASSWORD = 'member123'
+REPORT_TYPES = ['ready_for_team', 'needs_training', 'assigned_roles']
+MEDIA_TYPES = ['', 'photo', 'audio', 'video', 'graphics']
+
+
+# Scenarios: name -> (needs the admin session, request builder). A builder
+# returns (method, url, form or None) from the thread's rng and the run context.
+
+def _submit_application(rng, ctx):
+    n = next(ctx['sequence'])
+    form = {
+        'full_name': f'Load Test {n}',
+        'email': f'load-{ctx["token"]}-{n}@example.com',
+        'phone': '555-0100',
+        'occupation': 'Engineer',
+        'professional_background': 'Load test submission',
+        'availability': 'Sundays',
+        'primary_interest': rng.choice(ctx['subunits']),
+        'password': MEMBER_PASSWORD,
+    }
+    for skill in rng.sample(ctx['skills'], min(5, len(ctx['skills']))):
+        form[f'skill_{skill}'] = str(rng.randint(1, 5))
+    return 'POST', '/apply/submit', form
+
+
+def _applicant_login(rng, ctx):
+    return 'POST', '/applicant-login', {'email': rng.choice(ctx['members']), 'password': MEMBER_PASSWORD}
+
+
+def _media_library(rng, ctx):
+    media_type = rng.choice(MEDIA_TYPES)
+    return 'GET', f'/media/?page={rng.randint(1, 5)}' + (f'&type={media_type}' if media_type else ''), None
+
+
+def _download_media(rng, ctx):
+    return 'GET', f'/media/{rng.randint(*ctx["media_ids"])}/download', None
+
+
+def _view_rosters(rng, ctx):
+    return 'GET', f'/roster/view?page={rng.randint(1, 5)}', None
+
+
+def _generate_roster(rng, ctx):
+    start = date.today() + timedelta(days=rng.randint(0, 180))
+    form = {'start_date': start.isoformat(), 'end_date': (start + timedelta(days=28)).isoformat()}
+    return 'POST', f'/roster/generate/{rng.choice(ctx["templates"])}', form
+
+
+def _export_roster(rng, ctx):
+    return 'GET', f'/roster/export/{rng.choice(ctx["templates"])}', None
+
+
+def _admin_reports(rng, ctx):
+    return 'GET', f'/admin/reports?type={rng.choice(REPORT_TYPES)}&page={rng.randint(1, 3)}', None
+
+
+def _api(rng, ctx):
+    return 'GET', rng.choice(['/api/members-count', '/api/media-count', '/api/subunits', '/api/applicant-stats']), None
+
+
+def _api_v2(rng, ctx):
+    url = rng.choice([
+        f'/api/v2/media?type={rng.choice(MEDIA_TYPES[1:])}',
+        '/api/v2/media?fields=title,media_type&limit=200',
+        f'/api/v2/rosters?since={date.today().isoformat()}',
+        '/api/v2/rosters?fields=duty_date,assigned_to,role',
+        '/api/v2/announcements?active=true',
+        '/api/v2/events',
+    ])
+    return 'GET', url, None
+
+
+# Read scenarios first, so the writes don't change the data they page through
+SCENARIOS = {
+    'api': (False, _api),
+    'api.v2': (False, _api_v2),
+    'media.library': (True, _media_library),
+    'media.download_media': (True, _download_media),
+    'roster.view_rosters': (True, _view_rosters),
+    'roster.export_roster': (True, _export_roster),
+    'admin.reports': (True, _admin_reports),
+    'auth.applicant_login': (False, _applicant_login),
+    'applicant.submit_application': (False, _submit_application),
+    'roster.generate_roster': (True, _generate_roster),
+}
+
+
+def encode_form(form):
+    """(body, content type) for a form, multipart when it carries files"""
+    from werkzeug.test import EnvironBuilder
+
+    environ = EnvironBuilder(method='POST', data=form).get_environ()
+    return environ['wsgi.input'].read(), environ['CONTENT_TYPE']
+
+
+class InProcessClient:
+    """Requests through the Flask test client"""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, url, form=None):
+        body, content_type = encode_form(form) if form is not None else (None, None)
+        response = self._client.open(url, method=method, data=body, content_type=content_type)
+        size = len(response.get_data())
+        response.close()
+        return response.status_code, size
+
+
+class HttpClient:
+    """Requests over one HTTP connection; cookies are kept by hand since production sets them Secure"""
+
+    def __init__(self, host, port):
+        self._connection = http.client.HTTPConnection(host, port, timeout=60)
+        self._cookies = {}
+
+    def request(self, method, url, form=None):
+        headers = {}
+        body = None
+        if form is not None:
+            body, headers['Content-Type'] = encode_form(form)
+        if self._cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self._cookies.items())
+
+        try:
+            self._connection.request(method, url, body=body, headers=headers)
+            response = self._connection.getresponse()
+        except (http.client.HTTPException, ConnectionError):
+            # The server closed an idle keep-alive connection; retry once on a new one
+            self._connection.close()
+            self._connection.request(method, url, body=body, headers=headers)
+            response = self._connection.getresponse()
+
+        size = len(response.read())
+        for header in response.headers.get_all('Set-Cookie') or []:
+            name, _, value = header.split(';', 1)[0].partition('=')
+            self._cookies[name.strip()] = value
+        return response.status, size
+
+
+def percentile(ordered, percent):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+def run_scenario(name, make_client, ctx, args):
+    """Drive one scenario from args.concurrency threads for args.duration seconds"""
+    needs_admin, build = SCENARIOS[name]
+    per_thread = [{'latencies': [], 'errors': 0, 'bytes': 0, 'statuses': {}} for _ in range(args.concurrency)]
+    window = {}
+
+    def open_window():
+        window['started'] = time.perf_counter()
+        window['end'] = window['started'] + args.duration
+
+    # Every thread has logged in and warmed up before the clock starts
+    barrier = threading.Barrier(args.concurrency, action=open_window)
+
+    def worker(index, result):
+        rng = random.Random(f'{args.seed}:{name}:{index}')
+        client = make_client()
+        if needs_admin:
+            client.request('POST', '/login', {'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD})
+        for _ in range(args.warmup):
+            client.request(*build(rng, ctx))
+
+        barrier.wait()
+        while time.perf_counter() < window['end']:
+            request = build(rng, ctx)
+            started = time.perf_counter()
+            status, size = client.request(*request)
+            elapsed = (time.perf_counter() - started) * 1000
+            result['latencies'].append(elapsed)
+            result['bytes'] += size
+            result['statuses'][status] = result['statuses'].get(status, 0) + 1
+            if status >= 400:
+                result['errors'] += 1
+
+    threads = [threading.Thread(target=worker, args=(index, result)) for index, result in enumerate(per_thread)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - window['started']
+
+    latencies = sorted(latency for result in per_thread for latency in result['latencies'])
+    statuses = {}
+    for result in per_thread:
+        for status, count in result['statuses'].items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+    return {
+        'requests': len(latencies),
+        'errors': sum(result['errors'] for result in per_thread),
+        'statuses': statuses,
+        'throughput': round(len(latencies) / elapsed, 2),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': round(latencies[-1], 3) if latencies else 0.0,
+        'avg_bytes': round(sum(result['bytes'] for result in per_thread) / len(latencies)) if latencies else 0,
+    }
+
+
+def prepare(app, args):
+    """Generate the dataset unless --database was given; returns (dataset row counts, run context)"""
+    from sqlalchemy import func, select
+    from app.models import db, User, Subunit, Applicant, ApplicantAccount, Media, RosterTemplate, DutyRoster
+    from app.security import hash_password
+    from app.synthetic import generate_dataset
+
+    with app.app_context():
+        if not args.database:
+            generate_dataset(applicants=args.applicants, skill_assessments=args.applicants * 5,
+                             media=args.applicants, rosters=args.applicants * 4, announcements=100, events=100,
+                             seed=args.seed, password=MEMBER_PASSWORD)
+        if not User.query.filter_by(username=ADMIN_USERNAME).first():
+            db.session.add(User(username=ADMIN_USERNAME, email='loadtest@example.com',
+                                password=hash_password(ADMIN_PASSWORD), role='admin'))
+            db.session.commit()
+
+        members = list(db.session.execute(
+            select(Applicant.email).join(ApplicantAccount, ApplicantAccount.applicant_id == Applicant.id)
+            .where(Applicant.email.like('%@synthetic.example')).order_by(Applicant.id).limit(1000)
+        ).scalars())
+        subunits = Subunit.query.order_by(Subunit.id).all()
+        media_ids = db.session.execute(select(func.min(Media.id), func.max(Media.id))).one()
+        dataset = {model.__tablename__: db.session.execute(select(func.count()).select_from(model)).scalar()
+                   for model in (Applicant, Media, DutyRoster)}
+        ctx = {
+            'token': f'{int(time.time())}',
+            'sequence': itertools.count(1),
+            'members': members,
+            'subunits': [subunit.name for subunit in subunits],
+            'skills': sorted({skill for subunit in subunits for skill in subunit.skills or []}),
+            'media_ids': media_ids if media_ids[0] is not None else (1, 1),
+            'templates': list(db.session.execute(select(RosterTemplate.id)).scalars()) or [1],
+        }
+    return dataset, ctx
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(args, port):
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--workers', str(args.workers),
+               '--threads', str(args.threads), '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'run:app']
+    server = subprocess.Popen(command, cwd=ROOT, env=dict(os.environ, FLASK_ENV='production'))
+    deadline = time.time() + 60
+    while time.time() < deadline and server.poll() is None:
+        try:
+            status, _ = HttpClient('127.0.0.1', port).request('GET', '/api/members-count')
+            if status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit('gunicorn did not start')
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(baseline, current, threshold, min_delta_ms):
+    """Print per-scenario changes; returns the regressions"""
+    regressions = []
+    for key in ('target', 'settings', 'dataset'):
+        if baseline.get(key) != current.get(key):
+            print(f'warning: runs differ in {key}, so the numbers are not directly comparable')
+    print(f'{"scenario":30} {"req/s before/after":>28} {"p95 ms before/after":>32}')
+    for name, now in current['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if not before:
+            print(f'{name:30} {"(new)":>18}')
+            continue
+        rate = (now['throughput'] - before['throughput']) / before['throughput'] * 100 if before['throughput'] else 0.0
+        p95 = (now['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0.0
+        print(f'{name:30} {before["throughput"]:8.1f} {now["throughput"]:8.1f} {rate:+8.1f}%  '
+              f'{before["p95_ms"]:10.2f} {now["p95_ms"]:10.2f} {p95:+8.1f}%')
+
+        # Small absolute moves on fast endpoints are noise, whatever the percentage
+        if p95 > threshold and now['p95_ms'] - before['p95_ms'] >= min_delta_ms:
+            regressions.append(f'{name}: p95 {before["p95_ms"]:.2f} -> {now["p95_ms"]:.2f} ms ({p95:+.1f}%)')
+        if rate < -threshold:
+            regressions.append(f'{name}: throughput {before["throughput"]:.1f} -> {now["throughput"]:.1f} req/s '
+                               f'({rate:+.1f}%)')
+        if now['errors'] and not before['errors']:
+            regressions.append(f'{name}: {now["errors"]} errors (baseline had none)')
+
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return regressions
+
+
+def run(args):
+    os.environ['FLASK_ENV'] = 'production'
+    if args.database:
+        os.environ['DATABASE_URL'] = args.database
+    else:
+        workdir = tempfile.mkdtemp(prefix='media-unit-load-')
+        os.environ.update(DATABASE_URL=f'sqlite:///{os.path.join(workdir, "load.db")}',
+                          UPLOAD_FOLDER=os.path.join(workdir, 'uploads'), SCHEMA_AUTO_UPGRADE='1')
+    for setting in args.env:
+        key, _, value = setting.partition('=')
+        os.environ[key] = value
+    sys.path.insert(0, str(ROOT))
+
+    from app import create_app
+    app = create_app('production')
+    dataset, ctx = prepare(app, args)
+    print(f'dataset: {dataset}')
+
+    server = None
+    if args.target == 'gunicorn':
+        port = free_port()
+        server = start_gunicorn(args, port)
+
+        def make_client():
+            return HttpClient('127.0.0.1', port)
+    else:
+        def make_client():
+            return InProcessClient(app)
+
+    names = [name for name in SCENARIOS
+             if not args.scenario or any(name == wanted or name.startswith(wanted + '.') or
+                                         name.endswith('.' + wanted) for wanted in args.scenario)]
+    scenarios = {}
+    try:
+        print(f'{"scenario":30} {"req/s":>8} {"p50":>8} {"p95":>8} {"p99":>8} {"errors":>7}')
+        for name in names:
+            result = run_scenario(name, make_client, ctx, args)
+            scenarios[name] = result
+            print(f'{name:30} {result["throughput"]:8.1f} {result["p50_ms"]:8.2f} {result["p95_ms"]:8.2f} '
+                  f'{result["p99_ms"]:8.2f} {result["errors"]:7}')
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    commit = git_commit()
+    result = {
+        'commit': commit,
+        'at': datetime.now().isoformat(timespec='seconds'),
+        'target': args.target,
+        'settings': {'concurrency': args.concurrency, 'duration': args.duration, 'warmup': args.warmup,
+                     'workers': args.workers if server else None, 'threads': args.threads if server else None,
+                     'seed': args.seed, 'env': args.env},
+        'dataset': dataset,
+        'machine': {'python': platform.python_version(), 'cpus': os.cpu_count(), 'platform': platform.platform()},
+        'scenarios': scenarios,
+    }
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f'{args.target}-{commit}-{datetime.now():%Y%m%d-%H%M%S}.json')
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + '\n')
+    print(f'results written to {output}')
+
+    if args.baseline:
+        print()
+        baseline = json.loads(Path(args.baseline).read_text())
+        if compare(baseline, result, args.threshold, args.min_delta_ms):
+            sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the scenarios and store the results')
+    run_parser.add_argument('--target', choices=['inprocess', 'gunicorn'], default='inprocess',
+                            help='call the WSGI app directly or over HTTP through gunicorn')
+    run_parser.add_argument('--scenario', action='append', default=[],
+                            help='scenario or blueprint to run (repeatable; default: all)')
+    run_parser.add_argument('--concurrency', type=int, default=4, help='client threads per scenario')
+    run_parser.add_argument('--duration', type=float, default=5, help='measured seconds per scenario')
+    run_parser.add_argument('--warmup', type=int, default=3, help='unmeasured requests per thread first')
+    run_parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+    run_parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker')
+    run_parser.add_argument('--applicants', type=int, default=5000,
+                            help='applicants to generate (media x1, rosters x4, skill ratings x5)')
+    run_parser.add_argument('--seed', type=int, default=42, help='dataset and request mix seed')
+    run_parser.add_argument('--database', default=None,
+                            help='run against this DATABASE_URL instead of generating one (adds a loadtest admin)')
+    run_parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                            help='extra app setting for the run (repeatable)')
+    run_parser.add_argument('--output', default=None, help='result file (default: benchmarks/results/...)')
+    run_parser.add_argument('--baseline', default=None, help='result file to compare against')
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument('--threshold', type=float, default=10, help='allowed regression in percent')
+        sub.add_argument('--min-delta-ms', type=float, default=1.0,
+                         help='ignore p95 increases smaller than this many ms')
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        baseline = json.loads(Path(args.baseline).read_text())
+        current = json.loads(Path(args.current).read_text())
+        sys.exit(1 if compare(baseline, current, args.threshold, args.min_delta_ms) else 0)
+    run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+"""
+Query plan check for every GET route
+
+Builds a SQLite database with a synthetic dataset, requests every GET route
+(plus the filter variants in EXTRA_URLS) as a signed-in admin and applicant,
+captures each SELECT the app runs and prints its EXPLAIN QUERY PLAN:
+
+    python benchmarks/plan_check.py
+    python benchmarks/plan_check.py --applicants 50000 --verbose
+
+A query that scans a whole table (a plan step of "SCAN <table>" without an
+index) or sorts its rows in a temporary B-tree (a "USE TEMP B-TREE" step,
+which reads every matching row before the first one is returned) is a
+violation unless the table, endpoint or statement is listed in
+benchmarks/plan_allowlist.json. Scans in output order that stop at a LIMIT
+(keyset and offset pages with no sort step) are not counted. The exit status
+is 1 when there are violations, so CI can run it as is.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ALLOWLIST_FILE = Path(__file__).resolve().parent / 'plan_allowlist.json'
+
+# Filter and sort variants the bare route list doesn't reach
+EXTRA_URLS = [
+    '/admin/applicants?status=approved',
+    '/admin/applicants?status=pending&page=3',
+    '/admin/applicants?q=member',
+    '/admin/placements?status=approved',
+    '/admin/reports?type=ready_for_team',
+    '/admin/reports?type=needs_training&after=10000&page=2',
+    '/admin/reports?type=summary&before=5000&page=3',
+    '/admin/reports?type=assigned_roles',
+    '/media/?type=photo',
+    '/media/?subunit=2',
+    '/media/?type=audio&subunit=1',
+    '/roster/view?subunit=Audio',
+    f'/roster/view?date={date.today().isoformat()}',
+    '/api/v2/applicants?status=approved',
+    '/api/v2/applicants?subunit=2&fields=full_name,email',
+    '/api/v2/applicants?role=Operator',
+    '/api/v2/applicants?status=approved&cursor=WyIyMDI0LTA2LTAxVDAwOjAwOjAwIiw1MDBd',
+    '/api/v2/media?type=photo&subunit=1',
+    '/api/v2/media?type=video',
+    '/api/v2/media?since=2024-01-01',
+    '/api/v2/rosters?template=2',
+    '/api/v2/rosters?template=2&cursor=WyIyMDI0LTA2LTAxIiwiMTA6MDAiLDUwMF0',
+    f'/api/v2/rosters?subunit=Audio&since={date.today().isoformat()}',
+    f'/api/v2/events?since={date.today().isoformat()}',
+    '/api/v2/announcements?active=true',
+]
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+TABLE_STEP = re.compile(r'^(?:SCAN|SEARCH) (\w+)')
+SUBUNITS = ['Photo', 'Audio', 'Video', 'Graphics']
+
+
+def seed(db, models, args):
+    """Insert the synthetic dataset with Core batches"""
+    from app.security import hash_password
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    rows = defaultdict(list)
+
+    for i, name in enumerate(SUBUNITS, start=1):
+        rows[models.Subunit].append({'id': i, 'name': name, 'description': name, 'skills': [name.lower()]})
+    rows[models.User].append({'id': 1, 'username': 'admin', 'email': 'admin@example.com',
+                              'password': hash_password('admin'), 'role': 'admin'})
+
+    for i in range(1, args.applicants + 1):
+        status = rng.choice(['pending', 'approved', 'rejected', 'completed'])
+        rows[models.Applicant].append({
+            'id': i, 'full_name': f'Member {i}', 'email': f'member{i}@example.com',
+            'primary_interest': rng.choice(SUBUNITS), 'status': status,
+            'assigned_subunit_id': rng.randint(1, len(SUBUNITS)) if status != 'pending' else None,
+            'created_at': now - timedelta(minutes=i), 'updated_at': now,
+        })
+        for phase in models.TRIAL_PHASES:
+            rows[models.TrialPhase].append({'applicant_id': i, 'phase_type': phase,
+                                            'status': rng.choice(models.PHASE_STATUSES)})
+        for skill in rng.sample(SUBUNITS, 2):
+            rows[models.SkillAssessment].append({'applicant_id': i, 'skill_name': skill.lower(),
+                                                 'rating': rng.randint(1, 5)})
+        if i % 5 == 0:
+            rows[models.Portfolio].append({'applicant_id': i, 'filename': 'p.pdf', 'file_path': 'p.pdf'})
+            rows[models.ApplicantPicture].append({'applicant_id': i, 'filename': 'p.jpg', 'file_path': 'p.jpg'})
+    # Every tenth applicant has an account, so the planner sees a realistically sized table
+    member_password = hash_password('member')
+    for i in range(1, args.applicants + 1, 10):
+        rows[models.ApplicantAccount].append({'applicant_id': i, 'password': member_password, 'is_active': True,
+                                              'created_at': now - timedelta(minutes=i), 'updated_at': now})
+
+    for i in range(args.applicants // 2):
+        rows[models.Media].append({
+            'title': f'Media {i}', 'media_type': rng.choice(['photo', 'audio', 'graphics', 'video']),
+            'subunit_id': rng.randint(1, len(SUBUNITS)), 'filename': 'm.jpg', 'file_path': 'm.jpg',
+            'uploaded_at': now - timedelta(minutes=i),
+        })
+    for i in range(args.applicants // 10):
+        rows[models.Announcement].append({
+            'title': f'Notice {i}', 'content': 'Text', 'created_at': now - timedelta(hours=i),
+            'expires_at': now + timedelta(days=rng.randint(-30, 30)) if i % 3 else None,
+        })
+
+    for i in range(1, 6):
+        rows[models.RosterTemplate].append({'id': i, 'name': f'Service {i}', 'start_date': date.today(),
+                                            'days_of_week': [6], 'subunits': [1, 2], 'roles': ['Operator']})
+    for i in range(args.applicants):
+        rows[models.DutyRoster].append({
+            'template_id': rng.randint(1, 5), 'duty_date': date.today() + timedelta(days=rng.randint(-180, 180)),
+            'start_time': rng.choice(['08:00', '10:00', '18:00']), 'assigned_to': f'Member {i}',
+            'subunit': rng.choice(SUBUNITS), 'role': 'Operator', 'status': 'assigned',
+        })
+
+    with db.engine.begin() as connection:
+        # Parents before children
+        for table in db.metadata.sorted_tables:
+            model = next((model for model in rows if model.__table__ is table), None)
+            batch = rows.get(model, [])
+            for start in range(0, len(batch), 5000):
+                connection.execute(table.insert(), batch[start:start + 5000])
+        connection.exec_driver_sql('ANALYZE')
+
+
+def route_urls(app):
+    """One URL per GET rule (integer arguments filled with 1), then EXTRA_URLS"""
+    urls = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if 'GET' not in rule.methods or rule.endpoint == 'static' or rule.endpoint.endswith('logout'):
+            continue
+        if any(type(converter).__name__ != 'IntegerConverter' for converter in rule._converters.values()):
+            continue
+        urls.append((rule.endpoint, rule.build({argument: 1 for argument in rule.arguments})[1]))
+    for url in EXTRA_URLS:
+        endpoint = app.url_map.bind('localhost').match(url.split('?')[0])[0]
+        urls.append((endpoint, url))
+    return urls
+
+
+def capture(app, db, urls):
+    """{endpoint: {url: [(statement, parameters)]}} for the SELECTs each request ran"""
+    from sqlalchemy import event
+
+    current = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        if current and not executemany and statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            current[-1].append((statement, parameters))
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', record)
+
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin'})
+    client.post('/applicant-login', data={'email': 'member1@example.com', 'password': 'member'})
+
+    captured = defaultdict(dict)
+    for endpoint, url in urls:
+        current.append([])
+        response = client.get(url)
+        response.close()
+        captured[endpoint][url] = (response.status_code, current.pop())
+    return captured
+
+
+def full_scans(statement, plan, tables):
+    """Tables the plan reads in full"""
+    # A scan in output order that stops at LIMIT (no sort step) is a page walk, not a full read
+    bounded = re.search(r'\bLIMIT\b', statement) and not any('FOR ORDER BY' in step for step in plan)
+    if bounded:
+        return []
+    return [match.group(1) for match in map(FULL_SCAN.match, plan) if match and match.group(1) in tables]
+
+
+def temp_sorts(plan, tables, small_tables):
+    """Sort steps of a plan, unless it only reads small (allowlisted) tables"""
+    read = {match.group(1) for match in map(TABLE_STEP.match, plan) if match and match.group(1) in tables}
+    if read and read <= small_tables:
+        return []
+    return [step for step in plan if 'USE TEMP B-TREE' in step]
+
+
+def explain(connection, statement, parameters):
+    rows = connection.execute('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+    return [row[3] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--applicants', type=int, default=20000, help='applicants to generate (other tables scale with it)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed for the dataset')
+    parser.add_argument('--verbose', action='store_true', help='print every statement and its plan')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='media-unit-plan-')
+    database = os.path.join(workdir, 'plan.db')
+    os.environ.update(DATABASE_URL=f'sqlite:///{database}',
+                      UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+                      RESPONSE_CACHE_BACKEND='none',
+                      SCHEMA_AUTO_UPGRADE='1',
+                      PASSWORD_HASH_METHOD='pbkdf2:sha256:1000')
+    sys.path.insert(0, str(ROOT))
+
+    from app import create_app, models
+    from app.models import db
+
+    app = create_app('development')
+    # A failing view still ran its queries; report its 500 rather than stopping
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    with app.app_context():
+        seed(db, models, args)
+    captured = capture(app, db, route_urls(app))
+
+    allowlist = json.loads(ALLOWLIST_FILE.read_text())
+    tables = set(db.metadata.tables)
+    connection = sqlite3.connect(database)
+    violations = []
+    statements = 0
+
+    for endpoint, requests in captured.items():
+        for url, (status, queries) in requests.items():
+            print(f'{status} {url}: {len(queries)} queries')
+            for statement, parameters in queries:
+                statements += 1
+                plan = explain(connection, statement, parameters)
+                text = ' '.join(statement.split())
+                allowed = (endpoint in allowlist['endpoints']
+                           or any(fragment in text for fragment in allowlist['queries']))
+                flagged = [] if allowed else [
+                    f'FULL SCAN {url}: full scan of {table}'
+                    for table in full_scans(text, plan, tables) if table not in allowlist['tables']
+                ] + [
+                    f'SORT {url}: {step}' for step in temp_sorts(plan, tables, set(allowlist['tables']))
+                ]
+                if args.verbose or flagged:
+                    print('    ' + text[:160])
+                    for step in plan:
+                        print(f'      {step}')
+                violations.extend(flagged)
+
+    print()
+    for violation in violations:
+        print(violation)
+    print(f'{statements} statements checked, {len(violations)} full table scan(s) or sort(s)')
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == '__main__':
+    main()
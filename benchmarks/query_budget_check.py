@@ -0,0 +1,195 @@
+"""
+Query budget check for every route
+
+Seeds a small synthetic dataset, requests every GET route (with plan_check's
+filter variants) and the POST_REQUESTS below as a signed-in admin and
+applicant and counts the statements each one runs. Then it appends more data
+and counts again:
+
+    python benchmarks/query_budget_check.py
+    python benchmarks/query_budget_check.py --small 200 --large 5000 --verbose
+
+A route fails when the app reports it over its @query_budget (counting
+statements run while a streamed body is sent, and any per-batch allowance),
+or when it needs more queries on the larger dataset (a lazy load per row).
+Routes without a budget are listed. The exit status is 1 when anything fails.
+"""
+import argparse
+import itertools
+import logging
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+from plan_check import route_urls
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_emails = itertools.count(1)
+
+
+def _submission():
+    return {'full_name': 'Budget Check', 'email': f'budget{next(_emails)}@example.com',
+            'primary_interest': 'Display Team', 'password': 'member123',
+            'skill_PowerPoint': '4', 'skill_Leadership': '3', 'skill_Video': '5'}
+
+
+def _roster_window():
+    start = date.today() + timedelta(days=30)
+    return {'start_date': start.isoformat(), 'end_date': (start + timedelta(days=27)).isoformat()}
+
+
+# Write routes worth budgeting: (endpoint, url, form builder)
+POST_REQUESTS = [
+    ('applicant.submit_application', '/apply/submit', _submission),
+    ('roster.generate_roster', '/roster/generate/1', _roster_window),
+    ('roster.confirm_roster', '/roster/1/confirm', lambda: {'confirmed_by': 'Budget Check'}),
+    ('applicant.update_profile', '/apply/update-profile',
+     lambda: {'occupation': 'Engineer', 'skill_PowerPoint': '5', 'skill_Photography': '3'}),
+    ('admin.update_applicant', '/admin/applicant/2/update',
+     lambda: {'status': 'approved', 'assigned_subunit_id': '1', 'assigned_role': 'Projection'}),
+    ('admin.bulk_update_applicants', '/admin/applicants/bulk',
+     lambda: {'applicant_ids': ['3', '4', '5', '6'], 'status': 'approved', 'phase_type': 'practical_test',
+              'phase_status': 'pass'}),
+    # The query string only keeps this apart from the request above
+    ('admin.bulk_update_applicants', '/admin/applicants/bulk?all=1',
+     lambda: {'select_all_matching': '1', 'phase_type': 'practical_test', 'phase_status': 'pending'}),
+]
+
+# Routes (or single requests) whose query count rightly follows the data
+GROWTH_EXPECTED = {
+    'admin.export_report': 'streams every matching applicant in keyset batches',
+    'POST /admin/applicants/bulk?all=1': 'updates every applicant in fixed-size chunks',
+}
+
+
+class BudgetWarnings(logging.Handler):
+    """Collects the over-budget warnings the app logs"""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def measure(app, urls, warnings, verbose):
+    """{(endpoint, url): (status, QueryLog, over budget)} for one pass, each request warmed up once first"""
+    from app.query_budget import count_queries
+
+    client = app.test_client()
+    client.post('/login', data={'username': 'budget', 'password': 'budget'})
+    with app.app_context():
+        from sqlalchemy import select
+        from app.models import db, Applicant
+        email = db.session.execute(
+            select(Applicant.email).where(Applicant.email.like('%@synthetic.example')).order_by(Applicant.id)
+        ).scalar()
+    client.post('/applicant-login', data={'email': email, 'password': 'member123'})
+
+    counts = {}
+    for endpoint, url, form in urls:
+        for _ in range(2):
+            warnings.messages.clear()
+            with app.app_context(), count_queries() as log:
+                response = client.post(url, data=form()) if form else client.get(url)
+                response.get_data()
+                response.close()
+        label = f'POST {url}' if form else url
+        counts[(endpoint, label)] = (response.status_code, log, bool(warnings.messages))
+        if verbose:
+            print(log.describe(f'{response.status_code} {label}', '-'))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--small', type=int, default=100, help='applicants in the first pass')
+    parser.add_argument('--large', type=int, default=1000, help='applicants in the second pass')
+    parser.add_argument('--seed', type=int, default=42, help='random seed for the dataset')
+    parser.add_argument('--verbose', action='store_true', help='print the statements of every request')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='media-unit-budget-')
+    os.environ.update(DATABASE_URL=f'sqlite:///{os.path.join(workdir, "budget.db")}',
+                      UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+                      RESPONSE_CACHE_BACKEND='none',
+                      SCHEMA_AUTO_UPGRADE='1',
+                      SQL_PROFILING='0',
+                      QUERY_BUDGET_MODE='warn',
+                      # Expire every process cache so each request pays its cold-cache queries
+                      AUTH_CACHE_TTL='0',
+                      STATS_CACHE_TTL='0',
+                      MATCHING_CACHE_TTL='0',
+                      REFDATA_CHECK_INTERVAL='0',
+                      TASKS_EAGER='1',
+                      PASSWORD_HASH_METHOD='pbkdf2:sha256:1000')
+    sys.path.insert(0, str(ROOT))
+
+    from app import create_app
+    from app.models import db, User
+    from app.query_budget import view_budget
+    from app.security import hash_password
+    from app.synthetic import generate_dataset
+
+    app = create_app('development')
+    app.config.update(DEBUG=False, PROPAGATE_EXCEPTIONS=False)
+    warnings = BudgetWarnings()
+    budget_logger = logging.getLogger('app.query_budget')
+    budget_logger.addHandler(warnings)
+    budget_logger.propagate = False
+
+    def grow(applicants, seed):
+        with app.app_context():
+            generate_dataset(applicants=applicants, skill_assessments=applicants * 5, media=applicants,
+                             rosters=applicants * 4, announcements=applicants // 10, events=applicants // 10,
+                             seed=seed, file_pool=2, file_size=1)
+
+    grow(args.small, args.seed)
+    with app.app_context():
+        db.session.add(User(username='budget', email='budget@example.com', password=hash_password('budget'),
+                            role='admin'))
+        db.session.commit()
+
+    urls = [(endpoint, url, None) for endpoint, url in route_urls(app)] + POST_REQUESTS
+    small = measure(app, urls, warnings, args.verbose)
+    grow(args.large - args.small, args.seed + 1)
+    large = measure(app, urls, warnings, args.verbose)
+
+    failures = []
+    unbudgeted = set()
+    print(f'{"endpoint":34} {"budget":>6} {"small":>6} {"large":>6}  url')
+    for (endpoint, url), (status, log, over_budget) in large.items():
+        budget = view_budget(app.view_functions[endpoint])
+        before = small[(endpoint, url)][1].count
+        growth = GROWTH_EXPECTED.get(url) or GROWTH_EXPECTED.get(endpoint)
+        flags = []
+        if status >= 500:
+            flags.append(f'HTTP {status}')
+        if over_budget:
+            flags.append('OVER BUDGET')
+            failures.append(log.describe(url, budget))
+        if log.count > before and growth:
+            flags.append(f'grows: {growth}')
+        elif log.count > before:
+            flags.append('GROWS WITH DATA')
+            failures.append(log.describe(f'{url} ({before} queries on the small dataset)', budget))
+        if budget is None:
+            unbudgeted.add(endpoint)
+        print(f'{endpoint:34} {budget if budget is not None else "-":>6} {before:6} {log.count:6}  {url}'
+              + (f'  {", ".join(flags)}' if flags else ''))
+
+    print()
+    for failure in failures:
+        print(failure)
+    if unbudgeted:
+        print(f'No budget: {", ".join(sorted(unbudgeted))}')
+    print(f'{len(large)} requests checked, {len(failures)} failure(s)')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
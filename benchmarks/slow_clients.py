@@ -0,0 +1,256 @@
+"""
+Slow-client benchmark: concurrent transfers under gunicorn sync workers vs the ASGI mode
+
+Starts the app under each server mode in turn and opens --downloads clients that
+read a large media file and --uploads clients that send an application with a
+portfolio file, all throttled to --rate KiB/s like slow mobile connections. A
+probe requests /api/members-count throughout to show whether other users are
+starved:
+
+    python benchmarks/slow_clients.py
+    python benchmarks/slow_clients.py --mode asgi --downloads 200 --uploads 50 --rate 32
+    python benchmarks/slow_clients.py --workers 4 --threads 8 --mode sync --mode gthread --mode asgi
+
+A transfer counts as served when the server answered it (first response byte for
+a download, the response for an upload) within the run.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODES = ['sync', 'gthread', 'asgi']
+PROBE_INTERVAL = 0.2
+PROBE_TIMEOUT = 5.0
+
+
+def seed(file_size):
+    """One media row pointing at a file of file_size MiB; returns its id"""
+    from app import create_app
+    from app.models import db, Media
+
+    app = create_app('development')
+    path = os.path.join(os.environ['UPLOAD_FOLDER'], 'large.bin')
+    with open(path, 'wb') as handle:
+        block = os.urandom(1024 * 1024)
+        for _ in range(file_size):
+            handle.write(block)
+    with app.app_context():
+        media = Media(title='Large video', media_type='video', filename='large.bin', file_path=path,
+                      file_size=os.path.getsize(path))
+        db.session.add(media)
+        db.session.commit()
+        return media.id
+
+
+def start_server(mode, args, port):
+    bind = f'127.0.0.1:{port}'
+    if mode == 'asgi':
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', '127.0.0.1', '--port', str(port),
+                   '--workers', str(args.workers), '--log-level', 'warning']
+    else:
+        threads = args.threads if mode == 'gthread' else 1
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--workers', str(args.workers),
+                   '--threads', str(threads), '--worker-class', mode, '--bind', bind, '--timeout', '300',
+                   '--log-level', 'warning', 'run:app']
+    server = subprocess.Popen(command, cwd=ROOT, env=dict(os.environ, FLASK_ENV='production'))
+    deadline = time.time() + 60
+    while time.time() < deadline and server.poll() is None:
+        try:
+            if http_get(port, '/api/members-count', PROBE_TIMEOUT)[0] == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit(f'{mode} server did not start')
+
+
+def http_get(port, path, timeout):
+    """(status, seconds) of a small GET over a fresh connection"""
+    started = time.perf_counter()
+    with socket.create_connection(('127.0.0.1', port), timeout=timeout) as sock:
+        sock.sendall(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+        response = b''
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            response += chunk
+    return int(response.split(b' ', 2)[1]), time.perf_counter() - started
+
+
+def _throttle(started, sent, rate):
+    """Sleep until sent bytes fit within rate bytes/s since started"""
+    ahead = sent / rate - (time.perf_counter() - started)
+    if ahead > 0:
+        time.sleep(ahead)
+
+
+def slow_download(port, media_id, rate, deadline, result):
+    sock = socket.socket()
+    # A small receive window, so the server feels the slow reader instead of filling a big kernel buffer
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 32 * 1024)
+    sock.settimeout(0.5)
+    started = time.perf_counter()
+    try:
+        sock.connect(('127.0.0.1', port))
+        sock.sendall(f'GET /media/{media_id}/download HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'
+                     .encode())
+        while time.perf_counter() < deadline:
+            try:
+                chunk = sock.recv(16 * 1024)
+            except socket.timeout:
+                continue
+            if not chunk:
+                break
+            if result['first_byte'] is None:
+                result['first_byte'] = time.perf_counter() - started
+                started = time.perf_counter()
+            result['bytes'] += len(chunk)
+            _throttle(started, result['bytes'], rate)
+    except OSError as e:
+        result['error'] = str(e)
+    finally:
+        sock.close()
+
+
+def slow_upload(port, payload, rate, deadline, result):
+    boundary = uuid.uuid4().hex
+    fields = {'full_name': 'Slow Client', 'email': f'slow-{boundary}@example.com',
+              'primary_interest': 'Display Team', 'password': 'member123'}
+    body = b''.join(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+                    for name, value in fields.items())
+    body += (f'--{boundary}\r\nContent-Disposition: form-data; name="portfolio_1"; filename="sample.pdf"\r\n'
+             'Content-Type: application/pdf\r\n\r\n').encode() + payload + f'\r\n--{boundary}--\r\n'.encode()
+    head = (f'POST /apply/submit HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n'
+            f'Content-Type: multipart/form-data; boundary={boundary}\r\nContent-Length: {len(body)}\r\n\r\n')
+
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 32 * 1024)
+    sock.settimeout(0.5)
+    try:
+        sock.connect(('127.0.0.1', port))
+        sock.sendall(head.encode())
+        started = time.perf_counter()
+        while result['bytes'] < len(body) and time.perf_counter() < deadline:
+            try:
+                result['bytes'] += sock.send(body[result['bytes']:result['bytes'] + 8192])
+            except socket.timeout:
+                continue
+            _throttle(started, result['bytes'], rate)
+        finished = time.perf_counter()
+        while time.perf_counter() < deadline:
+            try:
+                response = sock.recv(1024)
+            except socket.timeout:
+                continue
+            if response:
+                result['status'] = int(response.split(b' ', 2)[1])
+                result['response_wait'] = time.perf_counter() - finished
+            break
+    except OSError as e:
+        result['error'] = str(e)
+    finally:
+        sock.close()
+
+
+def probe(port, deadline, latencies, failures):
+    while time.perf_counter() < deadline:
+        try:
+            status, seconds = http_get(port, '/api/members-count', PROBE_TIMEOUT)
+            if status == 200:
+                latencies.append(seconds * 1000)
+            else:
+                failures.append(status)
+        except OSError:
+            failures.append('timeout')
+        time.sleep(PROBE_INTERVAL)
+
+
+def run_mode(mode, args, port, media_id):
+    server = start_server(mode, args, port)
+    try:
+        deadline = time.perf_counter() + args.duration
+        rate = args.rate * 1024
+        payload = os.urandom(args.upload_size * 1024)
+        downloads = [{'first_byte': None, 'bytes': 0, 'error': None} for _ in range(args.downloads)]
+        uploads = [{'bytes': 0, 'status': None, 'response_wait': None, 'error': None} for _ in range(args.uploads)]
+        latencies, failures = [], []
+
+        threads = [threading.Thread(target=slow_download, args=(port, media_id, rate, deadline, result))
+                   for result in downloads]
+        threads += [threading.Thread(target=slow_upload, args=(port, payload, rate, deadline, result))
+                    for result in uploads]
+        threads.append(threading.Thread(target=probe, args=(port, deadline, latencies, failures)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    served = [result for result in downloads if result['first_byte'] is not None]
+    answered = [result for result in uploads if result['status'] is not None]
+    latencies.sort()
+    return {
+        'downloads served': f'{len(served)}/{len(downloads)}',
+        'download MiB': f'{sum(result["bytes"] for result in downloads) / 2 ** 20:.1f}',
+        'uploads answered': f'{len(answered)}/{len(uploads)}',
+        'upload p50 wait ms': (f'{statistics.median(r["response_wait"] for r in answered) * 1000:.0f}'
+                               if answered else '-'),
+        'probe p50 ms': f'{latencies[len(latencies) // 2]:.0f}' if latencies else '-',
+        'probe p95 ms': f'{latencies[int(len(latencies) * 0.95)]:.0f}' if latencies else '-',
+        'probe failures': f'{len(failures)}/{len(latencies) + len(failures)}',
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--mode', action='append', choices=MODES, default=[],
+                        help='server mode to run (repeatable; default: sync and asgi)')
+    parser.add_argument('--workers', type=int, default=2, help='server worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='threads per worker in gthread mode')
+    parser.add_argument('--downloads', type=int, default=50, help='concurrent slow downloads')
+    parser.add_argument('--uploads', type=int, default=20, help='concurrent slow uploads')
+    parser.add_argument('--rate', type=int, default=64, help='KiB/s per client')
+    parser.add_argument('--file-size', type=int, default=50, help='MiB in the downloaded file')
+    parser.add_argument('--upload-size', type=int, default=512, help='KiB in each uploaded file')
+    parser.add_argument('--duration', type=float, default=15, help='seconds per mode')
+    parser.add_argument('--port', type=int, default=8790, help='port for the server under test')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='media-unit-slow-')
+    os.environ.update(DATABASE_URL=f'sqlite:///{os.path.join(workdir, "slow.db")}',
+                      UPLOAD_FOLDER=os.path.join(workdir, 'uploads'),
+                      SCHEMA_AUTO_UPGRADE='1',
+                      METRICS_ENABLED='0',
+                      QUERY_BUDGET_MODE='off',
+                      PASSWORD_HASH_METHOD='pbkdf2:sha256:1000')
+    os.makedirs(os.environ['UPLOAD_FOLDER'], exist_ok=True)
+    sys.path.insert(0, str(ROOT))
+    media_id = seed(args.file_size)
+
+    results = {}
+    for mode in args.mode or ['sync', 'asgi']:
+        print(f'{mode}: {args.downloads} downloads and {args.uploads} uploads at {args.rate} KiB/s '
+              f'for {args.duration:.0f}s ({args.workers} workers)', flush=True)
+        results[mode] = run_mode(mode, args, args.port, media_id)
+
+    columns = list(next(iter(results.values())))
+    print()
+    print(f'{"":20}' + ''.join(f'{mode:>12}' for mode in results))
+    for column in columns:
+        print(f'{column:20}' + ''.join(f'{result[column]:>12}' for result in results.values()))
+
+
+if __name__ == '__main__':
+    main()
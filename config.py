@@ -11,19 +11,93 @@ class Config:
     
     # Upload settings
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB max file size
-    UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(os.path.dirname(__file__), 'uploads')
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png', 'gif', 'mp3', 'wav', 'm4a', 'zip'}
     
     # Session settings
     SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
     SESSION_COOKIE_HTTPONLY = True
     PERMANENT_SESSION_LIFETIME = 3600  # 1 hour
+    
+    # Password hashing (Werkzeug method string, e.g. 'scrypt:32768:8:1')
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 32))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+    
+    # Seconds a worker may serve a cached skill matrix written by another process
+    MATCHING_CACHE_TTL = int(os.environ.get('MATCHING_CACHE_TTL', 300))
+    
+    # Seconds dashboard and count API figures may be served from cache
+    STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', 30))
+    
+    # Admin role lookups are cached per process; trusting the signed session role skips them entirely
+    AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL', 60))
+    AUTH_TRUST_SESSION_ROLE = os.environ.get('AUTH_TRUST_SESSION_ROLE', '0') == '1'
+    
+    # Response cache for public pages and read APIs: memory (per worker), sqlite (shared file) or none
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 512))
+    
+    # Seconds between checks of the shared subunit/user version stamps
+    REFDATA_CHECK_INTERVAL = float(os.environ.get('REFDATA_CHECK_INTERVAL', 2))
+    
+    # Apply pending schema migrations at startup (production expects `flask --app app db upgrade`)
+    SCHEMA_AUTO_UPGRADE = os.environ.get('SCHEMA_AUTO_UPGRADE', '1') == '1'
+    
+    # Connection pool profile: default, gunicorn (long-lived workers), serverless (no pooling),
+    # pgbouncer (transaction pooling in front of PostgreSQL) or sqlite (WAL, separate reader/writer)
+    DB_POOL_PROFILE = os.environ.get('DB_POOL_PROFILE', 'default')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    
+    # Pragmas applied by the sqlite profile: busy timeout in ms, mmap in bytes, page cache in KiB per connection
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', 16384))
+    
+    # Per-request SQL profiling: Server-Timing headers, sampled slow-request log and /admin/perf
+    SQL_PROFILING = os.environ.get('SQL_PROFILING', '0') == '1'
+    PERF_SLOW_REQUEST_MS = float(os.environ.get('PERF_SLOW_REQUEST_MS', 500))
+    PERF_SLOW_SAMPLE_RATE = float(os.environ.get('PERF_SLOW_SAMPLE_RATE', 1.0))
+    PERF_SLOW_LOG = os.environ.get('PERF_SLOW_LOG')
+    PERF_WINDOW = int(os.environ.get('PERF_WINDOW', 500))
+    
+    # Per-view query budgets (@query_budget): 'warn' logs the statements, 'raise' fails the request, 'off'
+    QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'warn')
+    
+    # ASGI mode (uvicorn asgi:app): view threads per worker, request bodies kept in memory up to
+    # ASGI_SPOOL_SIZE bytes before spilling to a temp file, file download block size, and the largest
+    # other response buffered so a slow client doesn't hold a view thread
+    ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 8))
+    ASGI_SPOOL_SIZE = int(os.environ.get('ASGI_SPOOL_SIZE', 1024 * 1024))
+    ASGI_CHUNK_SIZE = int(os.environ.get('ASGI_CHUNK_SIZE', 256 * 1024))
+    ASGI_RESPONSE_BUFFER = int(os.environ.get('ASGI_RESPONSE_BUFFER', 1024 * 1024))
+    
+    # /api/changes holds back the newest seconds of writes until their transactions have committed,
+    # and keeps tombstones of deleted rows this many days (older cursors must sync from the start)
+    CHANGE_FEED_SETTLE_SECONDS = float(os.environ.get('CHANGE_FEED_SETTLE_SECONDS', 5))
+    TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', 90))
+    
+    # Prometheus /metrics endpoint; set METRICS_TOKEN to require `Authorization: Bearer <token>`
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    
+    # Background task settings
+    TASK_WORKERS = int(os.environ.get('TASK_WORKERS', 2))
+    # Serverless functions are frozen after the response, so run deferred work inline there
+    TASKS_EAGER = os.environ.get('TASKS_EAGER', '1' if os.environ.get('VERCEL') else '0') == '1'
 
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     TESTING = False
+    SQL_PROFILING = os.environ.get('SQL_PROFILING', '1') == '1'
 
 
 class ProductionConfig(Config):
@@ -31,11 +105,18 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     SESSION_COOKIE_SECURE = True
+    SCHEMA_AUTO_UPGRADE = os.environ.get('SCHEMA_AUTO_UPGRADE', '0') == '1'
     # Use PostgreSQL in production for Vercel compatibility
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or os.environ.get('POSTGRES_URL') or 'sqlite:///media_unit.db'
     # Handle PostgreSQL connection string format
     if SQLALCHEMY_DATABASE_URI and SQLALCHEMY_DATABASE_URI.startswith('postgres://'):
         SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace('postgres://', 'postgresql://', 1)
+    DB_POOL_PROFILE = os.environ.get('DB_POOL_PROFILE') or (
+        'serverless' if os.environ.get('VERCEL')
+        else 'sqlite' if SQLALCHEMY_DATABASE_URI.startswith('sqlite:')
+        else 'gunicorn')
+    # Don't expose /metrics unauthenticated in production: on by default only when a token is set
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1' if Config.METRICS_TOKEN else '0') == '1'
 
 
 class TestingConfig(Config):
@@ -44,6 +125,11 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    TASKS_EAGER = True
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    PASSWORD_HASH_WORKERS = 0
+    RESPONSE_CACHE_BACKEND = 'none'
+    QUERY_BUDGET_MODE = 'raise'
 
 
 config = {
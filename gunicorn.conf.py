@@ -0,0 +1,21 @@
+"""
+Gunicorn server hooks (bind address and worker count stay on the command line)
+"""
+import glob
+import os
+
+
+def on_starting(server):
+    """Clear metric files left in PROMETHEUS_MULTIPROC_DIR by a previous run"""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for leftover in glob.glob(os.path.join(path, '*.db')):
+            os.remove(leftover)
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's live gauges from /metrics"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -3,7 +3,8 @@ Initialize database with sample dummy data for testing
 """
 from app import create_app
 from app.models import db, User, Subunit, Applicant, SkillAssessment, TrialPhase, Event, Announcement
-from werkzeug.security import generate_password_hash
+from app.security import hash_password
+from app.migrations import upgrade_schema
 from datetime import datetime, timedelta
 
 app = create_app('development')
@@ -16,20 +17,20 @@ def initialize_database():
         db.drop_all()
         
         print("Creating all tables...")
-        db.create_all()
+        upgrade_schema(db.engine)
         
         # Create admin users
         print("Creating admin users...")
         admin = User(
             username='admin',
             email='admin@church.com',
-            password=generate_password_hash('admin123'),
+            password=hash_password('admin123'),
             role='admin'
         )
         mod = User(
             username='moderator',
             email='moderator@church.com',
-            password=generate_password_hash('mod123'),
+            password=hash_password('mod123'),
             role='moderator'
         )
         db.session.add_all([admin, mod])